@@ -0,0 +1,167 @@
+"""Baseline schema
+
+Schema as created by init.sql plus the hand-run scripts in migrations/.
+Databases that already have the dogs table (init.sql, or create_all in
+older releases) but were never stamped are adopted instead: the
+idempotent parts of those scripts fill in whatever is missing, so
+`alembic upgrade head` is safe on every deploy.
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = '0001_baseline'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if 'dogs' in sa.inspect(op.get_bind()).get_table_names():
+        adopt_existing_schema()
+        return
+
+    op.create_table(
+        'users',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('email', sa.String(255), nullable=False),
+        sa.Column('name', sa.String(255), nullable=False),
+        sa.Column('phone', sa.String(20), nullable=True),
+        sa.Column('province', sa.String(100), nullable=True),
+        sa.Column('canton', sa.String(100), nullable=True),
+        sa.Column('latitude', sa.Float, nullable=True),
+        sa.Column('longitude', sa.Float, nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+    op.create_table(
+        'dogs',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('name', sa.String(100), nullable=False),
+        sa.Column('age_years', sa.Integer, nullable=False),
+        sa.Column('age_months', sa.Integer, nullable=True),
+        sa.Column('breed', sa.String(100), nullable=False),
+        sa.Column('size', sa.String(20), nullable=False),
+        sa.Column('gender', sa.String(10), nullable=False),
+        sa.Column('description', sa.Text, nullable=True),
+        sa.Column('vaccinated', sa.Boolean, nullable=True),
+        sa.Column('sterilized', sa.Boolean, nullable=True),
+        sa.Column('dewormed', sa.Boolean, nullable=True),
+        sa.Column('special_needs', sa.Text, nullable=True),
+        sa.Column('latitude', sa.Float, nullable=False),
+        sa.Column('longitude', sa.Float, nullable=False),
+        sa.Column('province', sa.String(50), nullable=True),
+        sa.Column('canton', sa.String(50), nullable=True),
+        sa.Column('contact_phone', sa.String(20), nullable=True),
+        sa.Column('contact_email', sa.String(255), nullable=True),
+        sa.Column('has_whatsapp', sa.Boolean, nullable=True),
+        sa.Column('photos', postgresql.ARRAY(sa.Text), nullable=False),
+        sa.Column('photo_variants', postgresql.JSONB, nullable=True),
+        sa.Column('status', sa.String(20), nullable=True),
+        sa.Column('publisher_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column('adopted_at', sa.DateTime(timezone=True), nullable=True),
+        sa.CheckConstraint("status IN ('disponible', 'reservado', 'adoptado')", name='valid_status'),
+    )
+    op.create_index('idx_dogs_status', 'dogs', ['status'])
+    op.create_index('idx_dogs_publisher', 'dogs', ['publisher_id'])
+    op.create_index('idx_dogs_province', 'dogs', ['province'])
+    op.create_index('idx_dogs_status_lat_lng', 'dogs', ['status', 'latitude', 'longitude'])
+    op.create_index('idx_dogs_created_at_id', 'dogs', [sa.text('created_at DESC'), sa.text('id DESC')])
+    op.create_index(
+        'idx_dogs_publisher_created_at_id', 'dogs', ['publisher_id', sa.text('created_at DESC'), sa.text('id DESC')]
+    )
+
+    op.create_table(
+        'dog_status_history',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('dog_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('dogs.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('old_status', sa.String(20), nullable=True),
+        sa.Column('new_status', sa.String(20), nullable=False),
+        sa.Column('changed_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+    # Full-text / fuzzy search (migrations/add_dogs_search.sql)
+    create_search()
+
+
+def create_search():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    op.execute("""
+        CREATE OR REPLACE FUNCTION immutable_unaccent(text) RETURNS text AS $$
+          SELECT public.unaccent('public.unaccent', $1)
+        $$ LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    """)
+    op.execute("""
+        ALTER TABLE dogs ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+          setweight(to_tsvector('spanish', immutable_unaccent(lower(coalesce(name, '')))), 'A') ||
+          setweight(to_tsvector('spanish', immutable_unaccent(lower(coalesce(breed, '')))), 'A') ||
+          setweight(to_tsvector('spanish', immutable_unaccent(lower(coalesce(description, '')))), 'B')
+        ) STORED
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS idx_dogs_search_vector ON dogs USING GIN (search_vector)")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_dogs_breed_trgm ON dogs USING GIN (immutable_unaccent(lower(breed)) gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_dogs_name_trgm ON dogs USING GIN (immutable_unaccent(lower(name)) gin_trgm_ops)"
+    )
+
+
+def adopt_existing_schema():
+    """
+    Bring a database built by init.sql plus any of the hand-run scripts up to
+    this baseline; columns those scripts dropped or never used are left alone
+    """
+    # migrations/add_user_location_fields.sql, update_user_phone_nullable.sql
+    op.execute("""
+        ALTER TABLE users
+        ADD COLUMN IF NOT EXISTS province VARCHAR(100),
+        ADD COLUMN IF NOT EXISTS canton VARCHAR(100),
+        ADD COLUMN IF NOT EXISTS latitude FLOAT,
+        ADD COLUMN IF NOT EXISTS longitude FLOAT,
+        ALTER COLUMN phone DROP NOT NULL
+    """)
+    # migrations/add_has_whatsapp_to_dogs.sql, add_photo_variants_to_dogs.sql
+    op.execute("""
+        ALTER TABLE dogs
+        ADD COLUMN IF NOT EXISTS has_whatsapp BOOLEAN DEFAULT FALSE,
+        ADD COLUMN IF NOT EXISTS photo_variants JSONB
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS dog_status_history (
+          id UUID PRIMARY KEY,
+          dog_id UUID NOT NULL REFERENCES dogs(id) ON DELETE CASCADE,
+          old_status VARCHAR(20),
+          new_status VARCHAR(20) NOT NULL,
+          changed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+        )
+    """)
+    # init.sql and migrations/add_dogs_location_index.sql, add_dogs_keyset_indexes.sql
+    op.create_index('idx_dogs_status', 'dogs', ['status'], if_not_exists=True)
+    op.create_index('idx_dogs_publisher', 'dogs', ['publisher_id'], if_not_exists=True)
+    op.create_index('idx_dogs_province', 'dogs', ['province'], if_not_exists=True)
+    op.create_index('idx_dogs_status_lat_lng', 'dogs', ['status', 'latitude', 'longitude'], if_not_exists=True)
+    op.create_index(
+        'idx_dogs_created_at_id', 'dogs', [sa.text('created_at DESC'), sa.text('id DESC')], if_not_exists=True
+    )
+    op.create_index(
+        'idx_dogs_publisher_created_at_id', 'dogs', ['publisher_id', sa.text('created_at DESC'), sa.text('id DESC')],
+        if_not_exists=True,
+    )
+    # migrations/add_dogs_search.sql
+    create_search()
+
+
+def downgrade():
+    op.drop_table('dog_status_history')
+    op.drop_table('dogs')
+    op.drop_table('users')
+    op.execute("DROP FUNCTION IF EXISTS immutable_unaccent(text)")
@@ -0,0 +1,59 @@
+"""Composite and partial indexes for the GET /dogs filter combinations
+
+The feed is always status = 'disponible', newest first, plus any mix of
+size/gender/province/vaccinated/sterilized. Partial (created_at, id)
+indexes serve the ordered scan directly; province and size get their
+own because they are the selective filters. The single-column status,
+publisher and province indexes from init.sql are covered by these and
+by idx_dogs_publisher_created_at_id, so they are dropped.
+
+Plans and timings per filter combination: benchmarks/explain_filters.py
+
+Revision ID: 0002_filter_indexes
+Revises: 0001_baseline
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0002_filter_indexes'
+down_revision = '0001_baseline'
+branch_labels = None
+depends_on = None
+
+AVAILABLE = sa.text("status = 'disponible'")
+NEWEST_FIRST = [sa.text('created_at DESC'), sa.text('id DESC')]
+
+
+def upgrade():
+    op.create_index(
+        'idx_dogs_available_created_at', 'dogs', NEWEST_FIRST,
+        postgresql_where=AVAILABLE, if_not_exists=True,
+    )
+    op.create_index(
+        'idx_dogs_available_province_created_at', 'dogs', ['province', *NEWEST_FIRST],
+        postgresql_where=AVAILABLE, if_not_exists=True,
+    )
+    op.create_index(
+        'idx_dogs_available_size_created_at', 'dogs', ['size', *NEWEST_FIRST],
+        postgresql_where=AVAILABLE, if_not_exists=True,
+    )
+    op.create_index(
+        'idx_dog_status_history_dog_changed_at', 'dog_status_history', ['dog_id', sa.text('changed_at DESC')],
+        if_not_exists=True,
+    )
+
+    op.drop_index('idx_dogs_status', table_name='dogs', if_exists=True)
+    op.drop_index('idx_dogs_publisher', table_name='dogs', if_exists=True)
+    op.drop_index('idx_dogs_province', table_name='dogs', if_exists=True)
+
+
+def downgrade():
+    op.create_index('idx_dogs_status', 'dogs', ['status'], if_not_exists=True)
+    op.create_index('idx_dogs_publisher', 'dogs', ['publisher_id'], if_not_exists=True)
+    op.create_index('idx_dogs_province', 'dogs', ['province'], if_not_exists=True)
+
+    op.drop_index('idx_dog_status_history_dog_changed_at', table_name='dog_status_history')
+    op.drop_index('idx_dogs_available_size_created_at', table_name='dogs')
+    op.drop_index('idx_dogs_available_province_created_at', table_name='dogs')
+    op.drop_index('idx_dogs_available_created_at', table_name='dogs')
@@ -0,0 +1,37 @@
+"""Precomputed geohash cell on dogs for map clustering
+
+Revision ID: 0003_dog_geohash
+Revises: 0002_filter_indexes
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.geo import geohash_encode
+
+revision = '0003_dog_geohash'
+down_revision = '0002_filter_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('dogs', sa.Column('geohash', sa.String(12), nullable=True))
+
+    conn = op.get_bind()
+    rows = conn.execute(sa.text("SELECT id, latitude, longitude FROM dogs")).all()
+    if rows:
+        conn.execute(
+            sa.text("UPDATE dogs SET geohash = :geohash WHERE id = :id"),
+            [{"id": row.id, "geohash": geohash_encode(row.latitude, row.longitude)} for row in rows],
+        )
+
+    op.create_index(
+        'idx_dogs_available_geohash', 'dogs', ['geohash', 'latitude', 'longitude'],
+        postgresql_where=sa.text("status = 'disponible'"),
+    )
+
+
+def downgrade():
+    op.drop_index('idx_dogs_available_geohash', table_name='dogs')
+    op.drop_column('dogs', 'geohash')
@@ -0,0 +1,34 @@
+"""Change feed: (updated_at, id) index on dogs and tombstones for deletes
+
+GET /dogs/changes?since= reads dogs whose updated_at moved past the token
+and tombstones of deleted dogs, both in (timestamp, id) order.
+
+Revision ID: 0004_dog_change_feed
+Revises: 0003_dog_geohash
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = '0004_dog_change_feed'
+down_revision = '0003_dog_geohash'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('idx_dogs_updated_at_id', 'dogs', ['updated_at', 'id'])
+
+    op.create_table(
+        'dog_tombstones',
+        sa.Column('dog_id', UUID(as_uuid=True), primary_key=True),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index('idx_dog_tombstones_deleted_at', 'dog_tombstones', ['deleted_at', 'dog_id'])
+
+
+def downgrade():
+    op.drop_index('idx_dog_tombstones_deleted_at', table_name='dog_tombstones')
+    op.drop_table('dog_tombstones')
+    op.drop_index('idx_dogs_updated_at_id', table_name='dogs')
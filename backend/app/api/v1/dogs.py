@@ -1,282 +1,947 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
-from typing import List, Optional
+from fastapi import APIRouter, Depends, File, HTTPException, status, Query, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import and_, delete, func, insert, literal, select, tuple_, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+from typing import List, Literal, Optional, Union
 from uuid import UUID
-from datetime import datetime
-import math
-
-from app.core.database import get_db
-from app.core.security import get_current_user_id
+from datetime import datetime, timedelta, timezone
+import asyncio
+import uuid
+
+from app.core.bulk import (
+    BULK_CHUNK_SIZE, BULK_MAX_ROWS, EXPORT_CHUNK_SIZE, RowParseError, dogs_to_csv, dogs_to_ndjson, error_details,
+    iter_csv, iter_json_array, iter_ndjson,
+)
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.database import get_db, open_session
+from app.core.events import (
+    DOG_CREATED, DOG_DELETED, DOG_STATUS_CHANGED, DOG_UPDATED, DogEvent, emit_dog_change, on_dog_change
+)
+from app.core.facets import count_facets
+from app.core.geo import geohash_encode, geohash_precision_for_zoom
+from app.core.geo_index import geo_index
+from app.core.images import InvalidImageError, render_photo_variants
+from app.core.live import live_hub
+from app.core.pagination import as_utc, decode_cursor, encode_cursor, paginate
+from app.core.read_model import available_dogs
+from app.core.recommend import Profile, profile_namespace, recommend
+from app.core.replicas import get_read_db
+from app.core.responses import (
+    dumps, fragments_response, join_fragments, list_response, page_response, schema_fields, to_dicts
+)
+from app.core.search import search_condition, search_dogs
+from app.core.security import get_current_user_id, get_current_user_id_verified
+from app.core.storage import storage
 from app.models.dog import Dog
 from app.models.status_history import DogStatusHistory
-from app.schemas.dog import DogCreate, DogUpdate, DogResponse, DogStatusUpdate, StatusHistoryResponse
+from app.models.tombstone import DogTombstone
+from app.models.user import User
+from app.schemas.dog import (
+    DogCreate, DogUpdate, DogResponse, DogPage, DogNearbyResponse, DogStatusUpdate, StatusHistoryResponse,
+    DogSummaryResponse, DogSummaryPage, DogMapResponse, DogMapPage, DogFacets, DogMapTile, BulkImportResult,
+    DogChangeFeed,
+)
 
 router = APIRouter()
 
+# Response cache namespaces for the public endpoints
+DOG_LIST_CACHE = "dogs:list"
+DOG_FACETS_CACHE = "dogs:facets"
+DOG_MAP_CACHE = "dogs:map"
+DOG_RECOMMENDED_CACHE = "dogs:recommended"
+
+# GET /dogs/map returns individual dogs from this zoom level up, clusters below it
+MAP_POINTS_ZOOM = 15
+MAP_MAX_POINTS = 500
+# GET /dogs/changes never advances next_since into the last few seconds, so rows from
+# transactions that started earlier but commit late are not skipped
+CHANGE_FEED_SETTLE_SECONDS = 5
+history_adapter = TypeAdapter(List[StatusHistoryResponse])
+
+# List projections: view=summary for cards, view=map for markers, view=full for everything
+DogView = Literal["summary", "map", "full"]
+VIEW_COLUMNS = {
+    "summary": [
+        Dog.name, Dog.age_years, Dog.age_months, Dog.breed, Dog.size, Dog.gender,
+        Dog.vaccinated, Dog.sterilized, Dog.dewormed, Dog.latitude, Dog.longitude,
+        Dog.province, Dog.canton, Dog.status, Dog.photos, Dog.photo_variants, Dog.created_at,
+    ],
+    "map": [
+        Dog.name, Dog.breed, Dog.size, Dog.gender, Dog.latitude, Dog.longitude, Dog.status, Dog.created_at,
+    ],
+    "full": None,
+}
+VIEW_PAGES = {"summary": DogSummaryPage, "map": DogMapPage, "full": DogPage}
+# Lists are encoded straight from ORM rows with orjson (see app.core.responses)
+NEARBY_FIELDS = {
+    "summary": schema_fields(DogSummaryResponse),
+    "map": schema_fields(DogMapResponse),
+    "full": schema_fields(DogNearbyResponse),
+}
+# distance_km is left out, rather than sent as null, wherever none was computed
+VIEW_FIELDS = {
+    view: tuple(field for field in fields if field != "distance_km") for view, fields in NEARBY_FIELDS.items()
+}
+
+
+def select_dogs(view: DogView):
+    """
+    select(Dog) loading only the columns the view serializes
+    """
+    query = select(Dog)
+    if VIEW_COLUMNS[view] is not None:
+        query = query.options(load_only(*VIEW_COLUMNS[view]))
+    return query
+
+
+def filter_dogs(
+    query,
+    status: Optional[str] = None,
+    size: Optional[str] = None,
+    gender: Optional[str] = None,
+    province: Optional[str] = None,
+    vaccinated: Optional[bool] = None,
+    sterilized: Optional[bool] = None,
+    dewormed: Optional[bool] = None,
+):
+    """
+    Apply the GET /dogs filters to a select(Dog); size may list several
+    sizes separated by commas
+    """
+    if status:
+        # Inlined rather than bound so prepared statements can still match the
+        # status = 'disponible' partial indexes
+        query = query.where(Dog.status == literal(status, literal_execute=True))
+    if size:
+        sizes = size.split(",")
+        query = query.where(Dog.size == sizes[0] if len(sizes) == 1 else Dog.size.in_(sizes))
+    if gender:
+        query = query.where(Dog.gender == gender)
+    if province:
+        query = query.where(Dog.province == province)
+    if vaccinated is not None:
+        query = query.where(Dog.vaccinated == vaccinated)
+    if sterilized is not None:
+        query = query.where(Dog.sterilized == sterilized)
+    if dewormed is not None:
+        query = query.where(Dog.dewormed == dewormed)
+    return query
+
 
-def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+async def raise_missing_or_forbidden(db, dog_id, detail: str):
     """
-    Calculate distance between two points in kilometers using Haversine formula
+    A write guarded by publisher_id matched nothing: 404 if the dog does not
+    exist, 403 otherwise. Only runs on the failure path.
     """
-    R = 6371  # Earth's radius in km
+    if await db.scalar(select(Dog.id).where(Dog.id == dog_id)) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dog not found"
+        )
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail=detail
+    )
+
+
+def dog_cache_namespaces(dog_id) -> List[str]:
+    return [f"dogs:detail:{dog_id}", f"dogs:history:{dog_id}"]
 
-    lat1_rad = math.radians(lat1)
-    lat2_rad = math.radians(lat2)
-    delta_lat = math.radians(lat2 - lat1)
-    delta_lon = math.radians(lon2 - lon1)
 
-    a = math.sin(delta_lat / 2) ** 2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon / 2) ** 2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+@on_dog_change
+async def _invalidate_cached_dog(event: DogEvent):
+    # A shared backend (Redis) was already bumped by the process that wrote
+    if event.remote and response_cache.backend.shared:
+        return
+    # Any write can change list pages and facet counts; detail/history only for this dog.
+    # After a resync, detail entries age out with CACHE_TTL_SECONDS.
+    namespaces = [DOG_LIST_CACHE, DOG_FACETS_CACHE, DOG_MAP_CACHE, DOG_RECOMMENDED_CACHE]
+    if event.dog_id is not None:
+        namespaces += dog_cache_namespaces(event.dog_id)
+    for namespace in namespaces:
+        await response_cache.bump(namespace)
 
-    return R * c
 
+async def load_hits(db, view: DogView, hits) -> List[Dog]:
+    """
+    Available dogs for (dog_id, distance_km) hits, in hit order with distance_km set
+    """
+    result = await db.scalars(select_dogs(view).where(Dog.id.in_([dog_id for dog_id, _ in hits])))
+    dogs = {dog.id: dog for dog in result.all()}
+
+    found = []
+    for dog_id, distance in hits:
+        dog = dogs.get(dog_id)
+        if dog is not None and dog.status == 'disponible':
+            dog.distance_km = None if distance is None else round(distance, 2)
+            found.append(dog)
+    return found
 
-@router.get("", response_model=List[DogResponse])
-def get_dogs(
-    skip: int = 0,
-    limit: int = 100,
+
+async def ensure_loaded_from_primary(*models):
+    """
+    (Re)load in-memory models from the primary: loaded from a lagging replica
+    they would drop writes whose events they already applied. The session
+    only takes a connection when a model is actually stale.
+    """
+    async with open_session() as db:
+        for model in models:
+            await model.ensure_loaded(db)
+
+
+@router.get("", response_model=Union[DogPage, DogSummaryPage, DogMapPage])
+async def get_dogs(
+    request: Request,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(20, ge=1, le=100),
+    view: DogView = Query("full"),
+    q: Optional[str] = Query(None, min_length=2, max_length=100, description="Search name, breed and description"),
     status: Optional[str] = Query(None),
-    size: Optional[str] = Query(None),
+    size: Optional[str] = Query(None, description="One size, or several separated by commas"),
     gender: Optional[str] = Query(None),
     province: Optional[str] = Query(None),
     vaccinated: Optional[bool] = Query(None),
     sterilized: Optional[bool] = Query(None),
-    db: Session = Depends(get_db),
+    dewormed: Optional[bool] = Query(None),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
-    Get all dogs with optional filters
+    Get all dogs with optional filters. With q, results are ranked by
+    relevance and returned as a single page (no next_cursor).
     """
-    query = db.query(Dog)
+    async def build() -> bytes:
+        # Available dogs without a text search are served from memory
+        if settings.READ_MODEL_ENABLED and status == 'disponible' and not q:
+            await ensure_loaded_from_primary(available_dogs)
+            fragments, next_cursor = available_dogs.page(
+                view, cursor, limit, size=size.split(",") if size else None, gender=gender, province=province,
+                vaccinated=vaccinated, sterilized=sterilized, dewormed=dewormed,
+            )
+            return b'{"items":' + join_fragments(fragments) + b',"next_cursor":' + dumps(next_cursor) + b"}"
+
+        query = filter_dogs(
+            select_dogs(view), status=status, size=size, gender=gender, province=province,
+            vaccinated=vaccinated, sterilized=sterilized, dewormed=dewormed,
+        )
+
+        if q:
+            dogs, next_cursor = await search_dogs(db, query, q, limit), None
+        else:
+            dogs, next_cursor = await paginate(db, query, Dog.created_at, Dog.id, cursor, limit)
+        return dumps({"items": to_dicts(dogs, VIEW_FIELDS[view]), "next_cursor": next_cursor})
+
+    key = await response_cache.versioned_key(DOG_LIST_CACHE, request.query_params.multi_items())
+    return await response_cache.respond(request, key, build)
 
-    if status:
-        query = query.filter(Dog.status == status)
-    if size:
-        query = query.filter(Dog.size == size)
-    if gender:
-        query = query.filter(Dog.gender == gender)
-    if province:
-        query = query.filter(Dog.province == province)
-    if vaccinated is not None:
-        query = query.filter(Dog.vaccinated == vaccinated)
-    if sterilized is not None:
-        query = query.filter(Dog.sterilized == sterilized)
 
-    dogs = query.order_by(Dog.created_at.desc()).offset(skip).limit(limit).all()
-    return dogs
+@router.get("/me", response_model=DogPage)
+async def get_my_dogs(
+    request: Request,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=100),
+    stream: bool = Query(False, description="Stream the page body as it is encoded"),
+    current_user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get current user's dogs. Send Accept: application/x-ndjson for one dog per line.
+    """
+    query = select(Dog).where(Dog.publisher_id == current_user_id)
+    dogs, next_cursor = await paginate(db, query, Dog.created_at, Dog.id, cursor, limit)
+    return page_response(request, dogs, VIEW_FIELDS["full"], next_cursor, stream=stream)
 
 
-@router.get("/me", response_model=List[DogResponse])
-def get_my_dogs(
+@router.get("/me/export")
+async def export_my_dogs(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
     current_user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
 ):
     """
-    Get current user's dogs
+    Stream the current user's dogs as NDJSON or CSV (importable by POST /dogs/bulk)
     """
-    dogs = db.query(Dog).filter(Dog.publisher_id == current_user_id).order_by(Dog.created_at.desc()).all()
-    return dogs
+    async def body():
+        # Own session: the get_db one is closed before a streaming body runs
+        async with open_session() as db:
+            query = select(Dog).where(Dog.publisher_id == current_user_id)
+            cursor, first = None, True
+            while first or cursor:
+                dogs, cursor = await paginate(db, query, Dog.created_at, Dog.id, cursor, EXPORT_CHUNK_SIZE)
+                if export_format == "csv":
+                    yield dogs_to_csv(dogs, header=first)
+                else:
+                    yield dogs_to_ndjson(dogs)
+                first = False
+
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="dogs.{export_format}"'},
+    )
 
 
-@router.get("/nearby", response_model=List[DogResponse])
-def get_nearby_dogs(
+@router.get(
+    "/nearby",
+    response_model=Union[List[DogNearbyResponse], List[DogSummaryResponse], List[DogMapResponse]],
+)
+async def get_nearby_dogs(
+    request: Request,
     latitude: float = Query(...),
     longitude: float = Query(...),
     radius: int = Query(50, description="Radius in kilometers"),
-    db: Session = Depends(get_db),
+    limit: int = Query(100, ge=1, le=500),
+    view: DogView = Query("full"),
+    stream: bool = Query(False, description="Stream the array as it is encoded"),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
-    Get dogs within a certain radius of a location
+    Get dogs within a certain radius of a location, nearest first.
+    Send Accept: application/x-ndjson for one dog per line.
     """
-    dogs = db.query(Dog).filter(Dog.status == 'disponible').all()
+    await ensure_loaded_from_primary(geo_index)
+    hits = geo_index.nearest(latitude, longitude, radius, limit)
+    if not hits:
+        return list_response(request, [], NEARBY_FIELDS[view])
+
+    if settings.READ_MODEL_ENABLED:
+        await ensure_loaded_from_primary(available_dogs)
+        fragments = available_dogs.nearby(view, hits)
+        if fragments is not None:
+            return fragments_response(request, fragments, stream=stream)
+
+    return list_response(request, await load_hits(db, view, hits), NEARBY_FIELDS[view], stream=stream)
+
+
+@router.get(
+    "/recommended",
+    response_model=Union[List[DogNearbyResponse], List[DogSummaryResponse], List[DogMapResponse]],
+)
+async def get_recommended_dogs(
+    request: Request,
+    limit: int = Query(20, ge=1, le=100),
+    view: DogView = Query("full"),
+    current_user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Available dogs ranked for the current user by distance from their
+    profile location, recency and matching province/canton, best first.
+    distance_km is omitted when the profile has no location.
+    """
+    async def build() -> bytes:
+        # Only read on a cache miss: the key carries the profile's version instead
+        row = (await db.execute(
+            select(User.latitude, User.longitude, User.province, User.canton).where(User.id == current_user_id)
+        )).first()
+        profile = Profile(*row) if row is not None else Profile(None, None, None, None)
+
+        await ensure_loaded_from_primary(geo_index)
+        hits = recommend(geo_index, profile, limit, user_id=UUID(current_user_id))
+        if settings.READ_MODEL_ENABLED and hits:
+            await ensure_loaded_from_primary(available_dogs)
+            fragments = available_dogs.nearby(view, hits)
+            if fragments is not None:
+                return join_fragments(fragments)
+        fields = NEARBY_FIELDS[view] if profile.latitude is not None else VIEW_FIELDS[view]
+        return dumps(to_dicts(await load_hits(db, view, hits), fields))
+
+    # Profile updates bump the user's version, so they never get a ranking for the old profile
+    profile_version = await response_cache.backend.get_counter(f"{profile_namespace(current_user_id)}:version")
+    params = [("user", current_user_id), ("profile", str(profile_version))]
+    key = await response_cache.versioned_key(DOG_RECOMMENDED_CACHE, params + request.query_params.multi_items())
+    return await response_cache.respond(request, key, build)
+
+
+@router.get("/facets", response_model=DogFacets)
+async def get_dog_facets(
+    request: Request,
+    q: Optional[str] = Query(None, min_length=2, max_length=100, description="Count only dogs matching this search"),
+    status: Optional[str] = Query(None),
+    size: Optional[str] = Query(None, description="One size, or several separated by commas"),
+    gender: Optional[str] = Query(None),
+    province: Optional[str] = Query(None),
+    vaccinated: Optional[bool] = Query(None),
+    sterilized: Optional[bool] = Query(None),
+    dewormed: Optional[bool] = Query(None),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Count dogs per size, gender, province and health flag for the GET /dogs filters
+    """
+    async def build() -> bytes:
+        query = filter_dogs(
+            select(Dog), status=status, size=size, gender=gender, province=province,
+            vaccinated=vaccinated, sterilized=sterilized, dewormed=dewormed,
+        )
+        if q:
+            query = query.where(await search_condition(db, query, q))
+        facets = await count_facets(db, query.whereclause)
+        return DogFacets.model_validate(facets).model_dump_json().encode()
+
+    key = await response_cache.versioned_key(DOG_FACETS_CACHE, request.query_params.multi_items())
+    return await response_cache.respond(request, key, build)
+
+
+@router.get("/map", response_model=DogMapTile)
+async def get_dog_map(
+    request: Request,
+    min_lat: float = Query(..., ge=-90, le=90),
+    max_lat: float = Query(..., ge=-90, le=90),
+    min_lon: float = Query(..., ge=-180, le=180),
+    max_lon: float = Query(..., ge=-180, le=180),
+    zoom: int = Query(..., ge=0, le=22),
+    size: Optional[str] = Query(None, description="One size, or several separated by commas"),
+    gender: Optional[str] = Query(None),
+    province: Optional[str] = Query(None),
+    vaccinated: Optional[bool] = Query(None),
+    sterilized: Optional[bool] = Query(None),
+    dewormed: Optional[bool] = Query(None),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Available dogs inside a bounding box, clustered by geohash cell below
+    MAP_POINTS_ZOOM so the payload stays bounded
+    """
+    if min_lat > max_lat or min_lon > max_lon:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid bounding box"
+        )
 
-    # Filter by distance
-    nearby_dogs = [
-        dog for dog in dogs
-        if calculate_distance(latitude, longitude, dog.latitude, dog.longitude) <= radius
-    ]
+    filters = dict(
+        status='disponible', size=size, gender=gender, province=province,
+        vaccinated=vaccinated, sterilized=sterilized, dewormed=dewormed,
+    )
+    in_box = and_(Dog.latitude.between(min_lat, max_lat), Dog.longitude.between(min_lon, max_lon))
+
+    async def build() -> bytes:
+        if zoom >= MAP_POINTS_ZOOM:
+            query = filter_dogs(select_dogs("map"), **filters).where(in_box)
+            result = await db.scalars(query.order_by(Dog.created_at.desc()).limit(MAP_MAX_POINTS))
+            tile = DogMapTile.model_validate({"zoom": zoom, "points": result.all()}, from_attributes=True)
+            return tile.model_dump_json(exclude={"points": {"__all__": {"distance_km"}}}).encode()
+
+        precision = geohash_precision_for_zoom(zoom)
+        cell = func.substr(Dog.geohash, 1, precision).label("cell")
+        query = filter_dogs(
+            select(cell, func.count().label("count"), func.avg(Dog.latitude), func.avg(Dog.longitude)),
+            **filters,
+        ).where(in_box).group_by(cell)
+        result = await db.execute(query)
+        clusters = [
+            {"geohash": geohash, "count": count, "latitude": latitude, "longitude": longitude}
+            for geohash, count, latitude, longitude in result.all()
+        ]
+        tile = DogMapTile.model_validate({"zoom": zoom, "precision": precision, "clusters": clusters})
+        return tile.model_dump_json().encode()
+
+    key = await response_cache.versioned_key(DOG_MAP_CACHE, request.query_params.multi_items())
+    return await response_cache.respond(request, key, build)
+
+
+@router.get("/changes", response_model=DogChangeFeed)
+async def get_dog_changes(
+    since: Optional[str] = Query(None, description="next_since from the previous call; omit for a full sync"),
+    limit: int = Query(500, ge=1, le=1000),
+    view: Literal["ids", "summary", "map", "full"] = Query("full"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Dogs created, updated, status-changed or deleted after since, oldest
+    first. Keep calling with next_since while has_more. A dog may be repeated
+    in the next call, so apply changes as upserts. 410 means since is older
+    than the tombstone retention and a full sync is needed.
+    """
+    # Timestamps compared in Python are all UTC-aware, like decoded tokens
+    db_now = as_utc(await db.scalar(select(func.now())))
+    after = decode_cursor(since) if since else None
+    if after and after[0] < db_now - timedelta(days=settings.CHANGE_FEED_RETENTION_DAYS):
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="since is older than the change feed retention; sync from scratch"
+        )
+
+    columns = [Dog.id, Dog.status, Dog.created_at, Dog.updated_at]
+    if view != "ids" and VIEW_COLUMNS[view] is not None:
+        columns += VIEW_COLUMNS[view]
+    dog_query = select(Dog).order_by(Dog.updated_at, Dog.id).limit(limit + 1)
+    if view != "full":
+        dog_query = dog_query.options(load_only(*columns))
+    tombstone_query = select(DogTombstone).order_by(DogTombstone.deleted_at, DogTombstone.dog_id).limit(limit + 1)
+    if after:
+        dog_query = dog_query.where(tuple_(Dog.updated_at, Dog.id) > tuple_(*after))
+        tombstone_query = tombstone_query.where(tuple_(DogTombstone.deleted_at, DogTombstone.dog_id) > tuple_(*after))
+
+    dogs = (await db.scalars(dog_query)).all()
+    tombstones = (await db.scalars(tombstone_query)).all()
+    merged = sorted(
+        [((as_utc(dog.updated_at), dog.id), dog) for dog in dogs]
+        + [((as_utc(tombstone.deleted_at), tombstone.dog_id), None) for tombstone in tombstones],
+        key=lambda entry: entry[0],
+    )
+    has_more = len(merged) > limit
+    merged = merged[:limit]
+
+    # Dogs whose status changed since the token, from their history rows
+    status_changed = set()
+    if after and dogs:
+        result = await db.scalars(
+            select(DogStatusHistory.dog_id).distinct().where(
+                DogStatusHistory.dog_id.in_([dog.id for _, dog in merged if dog is not None]),
+                DogStatusHistory.changed_at > after[0],
+                DogStatusHistory.old_status.is_not(None),
+            )
+        )
+        status_changed = set(result.all())
+
+    changes = []
+    for (changed_at, dog_id), dog in merged:
+        if dog is None:
+            change = "deleted"
+        elif after is None or as_utc(dog.created_at) > after[0]:
+            change = "created"
+        elif dog.id in status_changed:
+            change = "status_changed"
+        else:
+            change = "updated"
+        changes.append({
+            "id": dog_id,
+            "change": change,
+            "changed_at": changed_at,
+            "status": dog.status if dog is not None else None,
+            "dog": to_dicts([dog], VIEW_FIELDS[view])[0] if dog is not None and view != "ids" else None,
+        })
+
+    if has_more:
+        next_key = merged[-1][0]
+    else:
+        settled = (db_now - timedelta(seconds=CHANGE_FEED_SETTLE_SECONDS), UUID(int=0))
+        next_key = min(merged[-1][0], settled) if merged else settled
+        if after:
+            next_key = max(next_key, after)
+
+    return Response(
+        content=dumps({"changes": changes, "next_since": encode_cursor(*next_key), "has_more": has_more}),
+        media_type="application/json",
+    )
+
+
+@router.get("/live")
+async def stream_dog_changes(
+    dog_id: List[UUID] = Query([], description="Only these dogs"),
+    province: Optional[str] = Query(None),
+    publisher_id: Optional[UUID] = Query(None),
+):
+    """
+    Server-sent events for dog writes: created, updated, status_changed and
+    deleted, each with the dog (null for deletes). With filters, events
+    matching any of them are sent; without, every event is. Deletes are sent
+    to all province and publisher streams since the row is gone. An overflow
+    event means the client fell behind and was disconnected: reconnect and
+    reload.
+    """
+    if live_hub.full:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many live connections",
+            headers={"Retry-After": "30"},
+        )
 
-    return nearby_dogs
+    async def events():
+        # Subscribed once the response starts, so finally always runs
+        subscription = live_hub.subscribe(dog_id, province, publisher_id)
+        try:
+            yield b"retry: 5000\n\n"
+            while True:
+                try:
+                    message = await asyncio.wait_for(
+                        subscription.queue.get(), timeout=settings.LIVE_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    # Keeps proxies from closing an idle connection
+                    yield b": keepalive\n\n"
+                    continue
+                yield message
+                if subscription.closed and subscription.queue.empty():
+                    return
+        finally:
+            live_hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/{dog_id}", response_model=DogResponse)
-def get_dog(
+async def get_dog(
+    request: Request,
     dog_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get dog by ID
     """
-    dog = db.query(Dog).filter(Dog.id == dog_id).first()
-    if not dog:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Dog not found"
-        )
-    return dog
+    async def build() -> bytes:
+        dog = await db.get(Dog, dog_id)
+        if not dog:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Dog not found"
+            )
+        return DogResponse.model_validate(dog).model_dump_json().encode()
+
+    detail_namespace, _ = dog_cache_namespaces(dog_id)
+    key = await response_cache.versioned_key(detail_namespace)
+    return await response_cache.respond(request, key, build)
 
 
 @router.post("", response_model=DogResponse, status_code=status.HTTP_201_CREATED)
-def create_dog(
+async def create_dog(
     dog_data: DogCreate,
     current_user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Create a new dog listing
     """
     try:
+        # Dog and its first history row go out in one flush/transaction; server
+        # defaults come back through INSERT ... RETURNING (eager_defaults)
         dog = Dog(
             **dog_data.model_dump(),
+            id=uuid.uuid4(),
             publisher_id=current_user_id
         )
-        db.add(dog)
-        db.commit()
-        db.refresh(dog)
-
-        # Create status history
         history = DogStatusHistory(
             dog_id=dog.id,
             old_status=None,
             new_status='disponible'
         )
-        db.add(history)
-        db.commit()
-
-        return dog
+        db.add_all([dog, history])
+        await db.commit()
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         print(f"Error creating dog: {type(e).__name__}: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error creating dog: {str(e)}"
         )
 
+    await emit_dog_change(DogEvent(DOG_CREATED, dog.id, dog))
+    return dog
 
-@router.put("/{dog_id}", response_model=DogResponse)
-def update_dog(
-    dog_id: UUID,
-    dog_data: DogUpdate,
+
+@router.post("/bulk", response_model=BulkImportResult, status_code=status.HTTP_201_CREATED)
+async def bulk_create_dogs(
+    request: Request,
+    atomic: bool = Query(True, description="Insert nothing if any row is invalid"),
     current_user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
-    Update a dog listing
+    Create many dogs in one transaction from a JSON array, NDJSON or CSV body
+    (by Content-Type). Invalid rows are reported by position.
     """
-    dog = db.query(Dog).filter(Dog.id == dog_id).first()
-    if not dog:
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type in ("application/x-ndjson", "application/ndjson"):
+        rows = iter_ndjson(request.stream())
+    elif content_type == "text/csv":
+        rows = iter_csv(request.stream())
+    elif content_type == "application/json":
+        rows = iter_json_array(await request.body())
+    else:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Dog not found"
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Use application/json, application/x-ndjson or text/csv"
         )
 
-    if str(dog.publisher_id) != current_user_id:
+    created_at = datetime.now(timezone.utc)
+    created, errors, pending = [], [], []
+
+    async def flush_pending():
+        # One executemany per table for the chunk; ids are generated client-side
+        dogs = [{
+            **dog.model_dump(),
+            "id": uuid.uuid4(),
+            "publisher_id": current_user_id,
+            "status": 'disponible',
+            # Core inserts skip the ORM before_insert hook
+            "geohash": geohash_encode(dog.latitude, dog.longitude),
+            # Distinct timestamps in upload order so keyset pages stay stable
+            "created_at": created_at + timedelta(microseconds=len(created) + i),
+        } for i, dog in enumerate(pending)]
+        await db.execute(insert(Dog), dogs)
+        await db.execute(insert(DogStatusHistory), [
+            {"id": uuid.uuid4(), "dog_id": dog["id"], "old_status": None, "new_status": 'disponible'}
+            for dog in dogs
+        ])
+        created.extend(dogs)
+        pending.clear()
+
+    try:
+        row_number = 0
+        async for row in rows:
+            row_number += 1
+            if row_number > BULK_MAX_ROWS:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"At most {BULK_MAX_ROWS} dogs per request"
+                )
+            try:
+                if isinstance(row, RowParseError):
+                    raise row
+                pending.append(DogCreate.model_validate(row))
+            except (RowParseError, ValidationError) as e:
+                errors.append({"row": row_number, "errors": error_details(e)})
+                continue
+            # Once a row failed in atomic mode nothing will be kept; just validate the rest
+            if len(pending) >= BULK_CHUNK_SIZE and not (atomic and errors):
+                await flush_pending()
+
+        if atomic and errors:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=errors
+            )
+        if pending:
+            await flush_pending()
+        await db.commit()
+    except RowParseError as e:
+        await db.rollback()
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to update this dog"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except HTTPException:
+        await db.rollback()
+        raise
+    except Exception as e:
+        await db.rollback()
+        print(f"Error importing dogs: {type(e).__name__}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error importing dogs: {str(e)}"
         )
 
-    for key, value in dog_data.model_dump(exclude_unset=True).items():
-        setattr(dog, key, value)
+    for row in created:
+        await emit_dog_change(DogEvent(DOG_CREATED, row["id"], Dog(**row)))
+    return {"created": len(created), "ids": [row["id"] for row in created], "errors": errors}
 
-    db.commit()
-    db.refresh(dog)
+
+@router.put("/{dog_id}", response_model=DogResponse)
+async def update_dog(
+    dog_id: UUID,
+    dog_data: DogUpdate,
+    current_user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Update a dog listing
+    """
+    values = dog_data.model_dump(exclude_unset=True)
+    if "latitude" in values and "longitude" in values:
+        values["geohash"] = geohash_encode(values["latitude"], values["longitude"])
+
+    result = await db.scalars(
+        update(Dog)
+        .where(Dog.id == dog_id, Dog.publisher_id == current_user_id)
+        .values(**values)
+        .returning(Dog)
+    )
+    dog = result.first()
+    if dog is None:
+        await raise_missing_or_forbidden(db, dog_id, "Not authorized to update this dog")
+
+    # Rare follow-ups (one coordinate changed, photos removed), flushed in the same transaction
+    geohash = geohash_encode(dog.latitude, dog.longitude)
+    if dog.geohash != geohash:
+        dog.geohash = geohash
+    # Forget variants of photos that were removed from the listing
+    if dog_data.photos is not None and dog.photo_variants:
+        kept = [v for v in dog.photo_variants if v["source"] in dog_data.photos]
+        if len(kept) != len(dog.photo_variants):
+            dog.photo_variants = kept
+
+    await db.commit()
+    await emit_dog_change(DogEvent(DOG_UPDATED, dog.id, dog))
     return dog
 
 
-@router.patch("/{dog_id}/status", response_model=DogResponse)
-def update_dog_status(
+@router.post("/{dog_id}/photos", response_model=DogResponse, status_code=status.HTTP_201_CREATED)
+async def upload_dog_photo(
     dog_id: UUID,
-    status_data: DogStatusUpdate,
+    file: UploadFile = File(...),
     current_user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
-    Update dog status (disponible, reservado, adoptado)
+    Upload a photo: strips metadata, stores resized JPEG/WebP variants and
+    appends it to the dog's photos
     """
-    dog = db.query(Dog).filter(Dog.id == dog_id).first()
-    if not dog:
+    # Checked before anything is stored; the append below re-checks in SQL
+    publisher_id = await db.scalar(select(Dog.publisher_id).where(Dog.id == dog_id))
+    if publisher_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Dog not found"
         )
 
-    if str(dog.publisher_id) != current_user_id:
+    if str(publisher_id) != current_user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to update this dog"
         )
 
-    old_status = dog.status
-    new_status = status_data.status
+    data = await file.read(settings.PHOTO_MAX_UPLOAD_BYTES + 1)
+    if len(data) > settings.PHOTO_MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Photo is too large"
+        )
 
-    if new_status not in ['disponible', 'reservado', 'adoptado']:
+    try:
+        rendered = await render_photo_variants(data)
+    except InvalidImageError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid status"
+            detail="Invalid image"
         )
 
-    dog.status = new_status
-    if new_status == 'adoptado':
-        dog.adopted_at = datetime.utcnow()
+    photo_id = uuid.uuid4().hex
+    urls = await asyncio.gather(*(
+        storage.save(f"dogs/{dog_id}/{photo_id}_{width}.{extension}", body, content_type)
+        for extension, body, content_type, width, height in rendered
+    ))
+    variants = [
+        {"url": url, "width": width, "height": height, "format": extension}
+        for url, (extension, _, _, width, height) in zip(urls, rendered)
+    ]
 
-    # Create status history
-    history = DogStatusHistory(
-        dog_id=dog.id,
-        old_status=old_status,
-        new_status=new_status
+    # The largest JPEG stands in for the original in photos
+    source = max((v for v in variants if v["format"] == "jpg"), key=lambda v: v["width"])["url"]
+    # Appended in SQL so concurrent uploads to the same dog don't drop each other's photos
+    result = await db.scalars(
+        update(Dog)
+        .where(Dog.id == dog_id, Dog.publisher_id == current_user_id)
+        .values(
+            photos=func.array_append(Dog.photos, source),
+            photo_variants=func.coalesce(Dog.photo_variants, literal([], JSONB)).op("||")(
+                literal([{"source": source, "variants": variants}], JSONB)
+            ),
+        )
+        .returning(Dog)
     )
-    db.add(history)
+    dog = result.first()
+    if dog is None:
+        await raise_missing_or_forbidden(db, dog_id, "Not authorized to update this dog")
 
-    db.commit()
-    db.refresh(dog)
+    await db.commit()
+    await emit_dog_change(DogEvent(DOG_UPDATED, dog.id, dog))
     return dog
 
 
-@router.delete("/{dog_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_dog(
+@router.patch("/{dog_id}/status", response_model=DogResponse)
+async def update_dog_status(
     dog_id: UUID,
+    status_data: DogStatusUpdate,
     current_user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
-    Delete a dog listing
+    Update dog status (disponible, reservado, adoptado)
     """
-    dog = db.query(Dog).filter(Dog.id == dog_id).first()
-    if not dog:
+    new_status = status_data.status
+
+    if new_status not in ['disponible', 'reservado', 'adoptado']:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Dog not found"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid status"
         )
 
-    if str(dog.publisher_id) != current_user_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to delete this dog"
+    values = {"status": new_status}
+    if new_status == 'adoptado':
+        values["adopted_at"] = datetime.utcnow()
+
+    owned = (Dog.id == dog_id, Dog.publisher_id == current_user_id)
+
+    # Create status history first, copying the current status in SQL (no SELECT
+    # round-trip); it inserts nothing if the guarded UPDATE below will not match
+    await db.execute(
+        insert(DogStatusHistory).from_select(
+            ["id", "dog_id", "old_status", "new_status"],
+            select(
+                literal(uuid.uuid4(), DogStatusHistory.id.type), Dog.id, Dog.status,
+                literal(new_status, DogStatusHistory.new_status.type),
+            ).where(*owned),
         )
+    )
+    result = await db.scalars(update(Dog).where(*owned).values(**values).returning(Dog))
+    dog = result.first()
+    if dog is None:
+        await raise_missing_or_forbidden(db, dog_id, "Not authorized to update this dog")
+
+    await db.commit()
+    await emit_dog_change(DogEvent(DOG_STATUS_CHANGED, dog.id, dog))
+    return dog
 
-    db.delete(dog)
-    db.commit()
+
+@router.delete("/{dog_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_dog(
+    dog_id: UUID,
+    current_user_id: str = Depends(get_current_user_id_verified),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Delete a dog listing
+    """
+    result = await db.execute(
+        delete(Dog)
+        .where(Dog.id == dog_id, Dog.publisher_id == current_user_id)
+        .returning(Dog.id)
+    )
+    if result.first() is None:
+        await raise_missing_or_forbidden(db, dog_id, "Not authorized to delete this dog")
+
+    # Tombstone for GET /dogs/changes, pruning those past the retention
+    retention_cutoff = datetime.now(timezone.utc) - timedelta(days=settings.CHANGE_FEED_RETENTION_DAYS)
+    await db.execute(delete(DogTombstone).where(DogTombstone.deleted_at < retention_cutoff))
+    await db.execute(insert(DogTombstone).values(dog_id=dog_id))
+    await db.commit()
+    await emit_dog_change(DogEvent(DOG_DELETED, dog_id))
     return None
 
 
 @router.get("/{dog_id}/history", response_model=List[StatusHistoryResponse])
-def get_dog_status_history(
+async def get_dog_status_history(
+    request: Request,
     dog_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get dog status history
     """
-    dog = db.query(Dog).filter(Dog.id == dog_id).first()
-    if not dog:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Dog not found"
+    async def build() -> bytes:
+        dog = await db.get(Dog, dog_id)
+        if not dog:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Dog not found"
+            )
+
+        result = await db.scalars(
+            select(DogStatusHistory)
+            .where(DogStatusHistory.dog_id == dog_id)
+            .order_by(DogStatusHistory.changed_at.desc())
         )
+        return history_adapter.dump_json(history_adapter.validate_python(result.all(), from_attributes=True))
 
-    history = db.query(DogStatusHistory).filter(
-        DogStatusHistory.dog_id == dog_id
-    ).order_by(DogStatusHistory.changed_at.desc()).all()
-
-    return history
+    _, history_namespace = dog_cache_namespaces(dog_id)
+    key = await response_cache.versioned_key(history_namespace)
+    return await response_cache.respond(request, key, build)
@@ -1,10 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, load_only
-from sqlalchemy import text
+from sqlalchemy import insert, select, text, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 from typing import List
 from uuid import UUID
 
 from app.core.database import get_db
+from app.core.recommend import bump_profile
+from app.core.replicas import get_read_db
 from app.core.security import get_current_user_id, get_current_user
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate, UserResponse
@@ -13,35 +17,37 @@ router = APIRouter()
 
 
 @router.post("", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def create_user(
+async def create_user(
     user_data: UserCreate,
     current_user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Create a new user profile (must be authenticated with Supabase)
     """
-    # Check if user already exists
-    existing_user = db.query(User).filter(User.id == current_user_id).first()
-    if existing_user:
+    # Create user with Supabase Auth ID; the primary key (or unique email)
+    # rejects duplicates without a separate existence check
+    try:
+        result = await db.scalars(
+            insert(User).values(id=current_user_id, **user_data.model_dump()).returning(User)
+        )
+        user = result.one()
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User profile already exists"
         )
-
-    # Create user with Supabase Auth ID
-    user_dict = user_data.model_dump()
-    user = User(id=current_user_id, **user_dict)
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+    # GET /dogs/recommended entries for this user were ranked without a profile
+    await bump_profile(current_user_id)
     return user
 
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_profile(
     current_user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Get current user profile
@@ -49,7 +55,7 @@ async def get_current_user_profile(
     # Use explicit column selection to avoid location column error
     # This ensures we only query columns that exist in the model
     try:
-        user = db.query(User).options(
+        result = await db.scalars(select(User).options(
             load_only(
                 User.id,
                 User.email,
@@ -61,12 +67,13 @@ async def get_current_user_profile(
                 User.longitude,
                 User.created_at
             )
-        ).filter(User.id == current_user_id).first()
+        ).where(User.id == current_user_id))
+        user = result.first()
     except Exception as e:
         # Fallback: use raw SQL if load_only doesn't work due to metadata issues
         if "location" in str(e).lower() or "undefinedcolumn" in str(e).lower():
             # Use raw SQL to explicitly select only existing columns
-            result = db.execute(
+            result = (await db.execute(
                 text("""
                     SELECT id, email, name, phone, province, canton, 
                            latitude, longitude, created_at
@@ -74,7 +81,7 @@ async def get_current_user_profile(
                     WHERE id = :user_id
                 """),
                 {"user_id": current_user_id}
-            ).first()
+            )).first()
             if not result:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -104,38 +111,43 @@ async def get_current_user_profile(
 
 
 @router.put("/me", response_model=UserResponse)
-def update_user_profile(
+async def update_user_profile(
     user_data: UserUpdate,
     current_user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Update current user profile
     """
-    user = db.query(User).filter(User.id == current_user_id).first()
+    values = user_data.model_dump(exclude_unset=True)
+    if values:
+        result = await db.scalars(
+            update(User).where(User.id == current_user_id).values(**values).returning(User)
+        )
+    else:
+        result = await db.scalars(select(User).where(User.id == current_user_id))
+    user = result.first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
 
-    for key, value in user_data.model_dump(exclude_unset=True).items():
-        setattr(user, key, value)
-
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    if values:
+        await bump_profile(current_user_id)
     return user
 
 
 @router.get("/{user_id}", response_model=UserResponse)
-def get_user(
+async def get_user(
     user_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Get user by ID
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
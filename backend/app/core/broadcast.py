@@ -0,0 +1,163 @@
+"""
+Cross-process dog write events over Postgres LISTEN/NOTIFY.
+
+Every API process (gunicorn worker, replica) keeps in-memory state derived
+from the dogs table: memory cache namespaces, GeoIndex and the available
+dogs read model. Local writes already reach them through emit_dog_change;
+this relays those events to the other processes, which load the changed
+rows and re-emit them locally as remote events.
+
+Memory cache namespaces bumped for other reasons (a user's profile) are
+relayed the same way and bumped on receipt.
+"""
+import asyncio
+import json
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.database import open_session
+from app.core.events import DOG_DELETED, DOGS_RESYNC, DogEvent, emit_dog_change, on_dog_change
+from app.models.dog import Dog
+
+# NOTIFY payloads are limited to 8000 bytes; ~60 bytes per event
+NOTIFY_BATCH_SIZE = 100
+KEEPALIVE_SECONDS = 30
+RECONNECT_MAX_SECONDS = 30
+# Relayed (kind, id) pair whose id is a response cache namespace
+CACHE_BUMP = "cache_bump"
+
+
+class DogEventBroadcaster:
+    def __init__(self, channel: str):
+        self.channel = channel
+        # Lets a process ignore its own notifications
+        self.origin = uuid.uuid4().hex
+        self._outbox: Optional[asyncio.Queue] = None
+        self._inbox: Optional[asyncio.Queue] = None
+        self._unsent: List[Tuple[str, str]] = []
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self):
+        """
+        Start relaying (Postgres only); call from the app's event loop
+        """
+        if self.running or not settings.DOG_EVENTS_BROADCAST:
+            return
+        # LISTEN/NOTIFY needs Postgres; SQLite setups are single-process
+        if make_url(settings.DATABASE_URL).get_backend_name() != "postgresql":
+            return
+        self._outbox = asyncio.Queue()
+        self._inbox = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._connection_loop()), asyncio.create_task(self._apply_loop())]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def publish(self, event: DogEvent):
+        if self.running and not event.remote and event.dog_id is not None:
+            self._outbox.put_nowait((event.kind, str(event.dog_id)))
+
+    def publish_bump(self, namespace: str):
+        # A shared backend (Redis) was already bumped for every process
+        if self.running and not response_cache.backend.shared:
+            self._outbox.put_nowait((CACHE_BUMP, namespace))
+
+    # --- Connection -----------------------------------------------------------
+
+    def _dsn(self) -> str:
+        # asyncpg takes libpq-style DSNs, sslmode included
+        return make_url(settings.DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+
+    async def _connection_loop(self):
+        import asyncpg
+
+        delay, connected_before = 1, False
+        while True:
+            conn = None
+            try:
+                conn = await asyncpg.connect(self._dsn())
+                await conn.add_listener(self.channel, self._on_notify)
+                if connected_before:
+                    # Notifications sent while disconnected are lost
+                    await emit_dog_change(DogEvent(DOGS_RESYNC, None))
+                connected_before, delay = True, 1
+                await self._send_loop(conn)
+            except Exception as e:
+                print(f"Dog event channel error: {type(e).__name__}: {str(e)}")
+            finally:
+                if conn is not None and not conn.is_closed():
+                    conn.terminate()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+
+    async def _send_loop(self, conn):
+        while True:
+            if not self._unsent:
+                try:
+                    self._unsent = [await asyncio.wait_for(self._outbox.get(), timeout=KEEPALIVE_SECONDS)]
+                except asyncio.TimeoutError:
+                    # Notices a dropped connection even when nothing is written
+                    await conn.execute("SELECT 1")
+                    continue
+            while len(self._unsent) < NOTIFY_BATCH_SIZE and not self._outbox.empty():
+                self._unsent.append(self._outbox.get_nowait())
+            payload = json.dumps({"origin": self.origin, "events": self._unsent})
+            await conn.execute("SELECT pg_notify($1, $2)", self.channel, payload)
+            self._unsent = []
+
+    def _on_notify(self, conn, pid, channel, payload):
+        message = json.loads(payload)
+        if message.get("origin") != self.origin:
+            self._inbox.put_nowait(message["events"])
+
+    # --- Applying remote events -------------------------------------------------
+
+    async def _apply_loop(self):
+        while True:
+            events = await self._inbox.get()
+            try:
+                await self._apply(events)
+            except Exception as e:
+                print(f"Dog event channel error: {type(e).__name__}: {str(e)}")
+                await emit_dog_change(DogEvent(DOGS_RESYNC, None))
+
+    async def _apply(self, events: List[List[str]]):
+        for kind, namespace in events:
+            if kind == CACHE_BUMP:
+                await response_cache.bump(namespace)
+        events = [(kind, dog_id) for kind, dog_id in events if kind != CACHE_BUMP]
+
+        changed = [uuid.UUID(dog_id) for kind, dog_id in events if kind != DOG_DELETED]
+        dogs: Dict[uuid.UUID, Dog] = {}
+        if changed:
+            async with open_session() as db:
+                result = await db.scalars(select(Dog).where(Dog.id.in_(changed)))
+                dogs = {dog.id: dog for dog in result.all()}
+
+        for kind, dog_id in events:
+            dog_id = uuid.UUID(dog_id)
+            dog = dogs.get(dog_id)
+            if kind != DOG_DELETED and dog is None:
+                # Deleted again before we got here
+                kind = DOG_DELETED
+            await emit_dog_change(DogEvent(kind, dog_id, dog, remote=True))
+
+
+broadcaster = DogEventBroadcaster(channel=settings.DOG_EVENTS_CHANNEL)
+
+
+@on_dog_change
+def _publish_dog_change(event: DogEvent):
+    broadcaster.publish(event)
@@ -0,0 +1,124 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, Dict, Iterable, List, Union
+
+from app.core.responses import dumps, schema_fields, to_dicts
+from app.schemas.dog import DogCreate, DogResponse
+
+BULK_MAX_ROWS = 5000
+BULK_CHUNK_SIZE = 500
+EXPORT_CHUNK_SIZE = 500
+
+# CSV has no lists; photos are joined with this separator on export and split on import
+CSV_PHOTO_SEPARATOR = "|"
+EXPORT_COLUMNS = ["id", *DogCreate.model_fields, "status", "created_at"]
+EXPORT_NDJSON_FIELDS = schema_fields(DogResponse)
+
+
+class RowParseError(Exception):
+    """
+    A row that could not be decoded (bad JSON line, ragged CSV record)
+    """
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Split a byte stream into text lines without buffering the whole body
+    """
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        # b"\n" never occurs inside a multi-byte UTF-8 sequence, so splitting bytes is safe
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8-sig").rstrip("\r")
+    if buffer:
+        yield buffer.decode("utf-8-sig").rstrip("\r")
+
+
+async def iter_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[Union[Dict, RowParseError]]:
+    async for line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield RowParseError(f"Invalid JSON: {e}")
+            continue
+        yield row if isinstance(row, dict) else RowParseError("Expected a JSON object")
+
+
+async def iter_csv(chunks: AsyncIterator[bytes]) -> AsyncIterator[Union[Dict, RowParseError]]:
+    """
+    Rows of a CSV stream with a header line. Quoted fields may span lines:
+    a record is complete once its double quotes are balanced.
+    """
+    header = None
+    record = ""
+    async for line in iter_lines(chunks):
+        record = f"{record}\n{line}" if record else line
+        if record.count('"') % 2:
+            continue
+        values, record = next(csv.reader([record]), []), ""
+        if header is None:
+            header = values
+            continue
+        if not any(values):
+            continue
+        if len(values) != len(header):
+            yield RowParseError(f"Expected {len(header)} columns, got {len(values)}")
+            continue
+        yield csv_to_row(dict(zip(header, values)))
+    if record:
+        yield RowParseError("Unterminated quoted field")
+
+
+def csv_to_row(values: Dict[str, str]) -> Dict:
+    # Empty cells mean "not provided" so the schema defaults apply
+    row = {key: value for key, value in values.items() if value != ""}
+    if "photos" in row:
+        row["photos"] = [url for url in row["photos"].split(CSV_PHOTO_SEPARATOR) if url]
+    return row
+
+
+async def iter_json_array(body: bytes) -> AsyncIterator[Union[Dict, RowParseError]]:
+    try:
+        rows = json.loads(body)
+    except ValueError as e:
+        raise RowParseError(f"Invalid JSON: {e}")
+    if not isinstance(rows, list):
+        raise RowParseError("Expected a JSON array of dogs")
+    for row in rows:
+        yield row if isinstance(row, dict) else RowParseError("Expected a JSON object")
+
+
+def dogs_to_ndjson(dogs: Iterable) -> bytes:
+    return b"".join(dumps(item) + b"\n" for item in to_dicts(dogs, EXPORT_NDJSON_FIELDS))
+
+
+def dogs_to_csv(dogs: Iterable, header: bool = False) -> bytes:
+    out = io.StringIO()
+    writer = csv.writer(out)
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+    for dog in dogs:
+        values = []
+        for column in EXPORT_COLUMNS:
+            value = getattr(dog, column)
+            if column == "photos":
+                value = CSV_PHOTO_SEPARATOR.join(value or [])
+            elif isinstance(value, bool):
+                value = "true" if value else "false"
+            values.append("" if value is None else value)
+        writer.writerow(values)
+    return out.getvalue().encode()
+
+
+def error_details(error: Exception) -> List[Dict]:
+    """
+    JSON-safe error list for one row
+    """
+    if hasattr(error, "json"):
+        return json.loads(error.json(include_url=False))
+    return [{"type": "parse_error", "loc": [], "msg": str(error)}]
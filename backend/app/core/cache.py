@@ -0,0 +1,255 @@
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Iterable, Optional, Tuple
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+
+from app.core.compression import choose_encoding, compress, weak_etag
+from app.core.config import settings
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after a TTL.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class VersionCounters:
+    """
+    Namespace versions for the memory backend. A version unused for a TTL
+    (no cached entry under it can still be live) is forgotten; its namespace
+    then restarts above every version handed out so far, so an old entry
+    can never match again.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        # key -> (last used, version), least recently used first
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._floor = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> int:
+        with self._lock:
+            return self._use(key, 0)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            return self._use(key, 1)
+
+    def _use(self, key: str, step: int) -> int:
+        now = time.monotonic()
+        while self._data:
+            oldest, (used, version) = next(iter(self._data.items()))
+            if used + self.ttl > now:
+                break
+            del self._data[oldest]
+            self._floor = max(self._floor, version + 1)
+        entry = self._data.get(key)
+        version = (self._floor if entry is None else entry[1]) + step
+        self._data[key] = (now, version)
+        self._data.move_to_end(key)
+        return version
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class MemoryCacheBackend:
+    """
+    In-process LRU + TTL cache backend
+    """
+
+    # Each API process has its own copy (kept coherent by app.core.broadcast)
+    shared = False
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        # Outside the LRU: a version must outlive every entry stored under it
+        self._counters = VersionCounters(ttl=ttl)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._entries.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        self._entries.set(key, value, ttl=ttl)
+
+    async def delete(self, *keys: str):
+        for key in keys:
+            self._entries.delete(key)
+
+    async def get_counter(self, key: str) -> int:
+        return self._counters.get(key)
+
+    async def incr(self, key: str) -> int:
+        return self._counters.incr(key)
+
+    async def close(self):
+        pass
+
+
+class RedisCacheBackend:
+    """
+    Redis-compatible cache backend shared by every API process
+    """
+
+    shared = True
+
+    def __init__(self, url: str, ttl: float):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package")
+        self.ttl = ttl
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None):
+        await self._client.set(key, value, ex=math.ceil(ttl or self.ttl))
+
+    async def delete(self, *keys: str):
+        if keys:
+            await self._client.delete(*keys)
+
+    async def get_counter(self, key: str) -> int:
+        value = await self._client.get(key)
+        return int(value) if value is not None else 0
+
+    async def incr(self, key: str) -> int:
+        return await self._client.incr(key)
+
+    async def close(self):
+        await self._client.aclose()
+
+
+def etag_for(body: bytes) -> str:
+    return '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [value.strip() for value in header.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+# request.state.read_source, set by app.core.replicas.get_read_db
+READ_PINNED = "pinned"
+READ_REPLICA = "replica"
+
+
+class ResponseCache:
+    """
+    Caches serialized JSON bodies with their ETag.
+
+    Keys embed a namespace version: bumping it invalidates every entry in the
+    namespace at once, and a request that read the database before the bump
+    can only ever store its (stale) body under the old version.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    async def versioned_key(self, namespace: str, params: Iterable[Tuple[str, str]] = ()) -> str:
+        version = await self.backend.get_counter(f"{namespace}:version")
+        normalized = urlencode(sorted((k, v) for k, v in params if v != ""))
+        return f"{namespace}:v{version}:{normalized}"
+
+    async def bump(self, namespace: str):
+        await self.backend.incr(f"{namespace}:version")
+
+    async def respond(self, request: Request, key: str, build: Callable[[], Awaitable[bytes]]) -> Response:
+        """
+        Serve key from cache (or build and store it), answering 304 when the
+        client's If-None-Match already has this body.
+
+        Requests pinned to the primary after a write always build, since a
+        cached body may come from a replica that had not replayed the write.
+        Bodies built on a replica are kept no longer than the replica lag
+        allowed by its health check.
+        """
+        read_source = getattr(request.state, "read_source", None)
+        ttl = settings.DATABASE_READ_MAX_LAG_SECONDS if read_source == READ_REPLICA else None
+        fresh = read_source == READ_PINNED
+
+        entry = None if fresh else await self.backend.get(key)
+        if entry is not None:
+            etag, body = entry.split(b"\n", 1)
+            etag = etag.decode()
+        else:
+            body = await build()
+            etag = etag_for(body)
+            fresh = True
+            await self.backend.set(key, etag.encode() + b"\n" + body, ttl=ttl)
+
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+
+        # Compressed once per entry and encoding; CompressionMiddleware passes these through
+        encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+        if settings.COMPRESSION_ENABLED and encoding and len(body) >= settings.COMPRESSION_MIN_SIZE:
+            compressed_key = f"{key}|{encoding}"
+            compressed = None if fresh else await self.backend.get(compressed_key)
+            if compressed is None:
+                compressed = compress(body, encoding, cached=True)
+                await self.backend.set(compressed_key, compressed, ttl=ttl)
+            headers.update({"ETag": weak_etag(etag), "Content-Encoding": encoding})
+            return Response(content=compressed, media_type="application/json", headers=headers)
+
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+def build_response_cache() -> ResponseCache:
+    if settings.CACHE_BACKEND == "redis":
+        backend = RedisCacheBackend(settings.REDIS_URL, ttl=settings.CACHE_TTL_SECONDS)
+    else:
+        backend = MemoryCacheBackend(maxsize=settings.CACHE_MAX_ENTRIES, ttl=settings.CACHE_TTL_SECONDS)
+    return ResponseCache(backend)
+
+
+response_cache = build_response_cache()
@@ -0,0 +1,164 @@
+import gzip
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # optional: without it only gzip is offered
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "application/xml", "text/")
+
+# Cached bodies are compressed once per entry, so they can afford higher levels
+EVENT_STREAM_TYPE = "text/event-stream"
+CACHED_GZIP_LEVEL = 9
+CACHED_BROTLI_QUALITY = 9
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick "br" or "gzip" from an Accept-Encoding header, honouring q=0
+    """
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name] = quality
+
+    wildcard = accepted.get("*", 0.0)
+    for encoding in ("br", "gzip"):
+        if encoding == "br" and brotli is None:
+            continue
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+def is_compressible(content_type: str) -> bool:
+    # Server-sent events must reach the client as each message is written
+    return content_type.startswith(COMPRESSIBLE_TYPES) and not content_type.startswith(EVENT_STREAM_TYPE)
+
+
+def compress(body: bytes, encoding: str, cached: bool = False) -> bytes:
+    if encoding == "br":
+        quality = CACHED_BROTLI_QUALITY if cached else settings.COMPRESSION_BROTLI_QUALITY
+        return brotli.compress(body, quality=quality)
+    level = CACHED_GZIP_LEVEL if cached else settings.COMPRESSION_GZIP_LEVEL
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+class StreamCompressor:
+    """
+    Incremental gzip/br; every chunk is flushed so streamed responses
+    still reach the client as they are produced
+    """
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        else:
+            self._zlib = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def chunk(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+def weak_etag(etag: str) -> str:
+    # The compressed bytes differ from the identity ones; If-None-Match uses weak comparison
+    return etag if etag.startswith("W/") else f"W/{etag}"
+
+
+class CompressionMiddleware:
+    """
+    gzip/Brotli for compressible responses of at least minimum_size bytes.
+
+    Responses that already carry Content-Encoding (precompressed cache
+    entries) pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        compressor: Optional[StreamCompressor] = None
+        passthrough = False
+
+        async def send_compressed(message: Message):
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is None:
+                headers = MutableHeaders(raw=start["headers"])
+                if not is_compressible(headers.get("content-type", "")) or "content-encoding" in headers:
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+
+                if "accept-encoding" not in headers.get("vary", "").lower():
+                    headers.add_vary_header("Accept-Encoding")
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+
+                headers["Content-Encoding"] = encoding
+                if "etag" in headers:
+                    headers["ETag"] = weak_etag(headers["etag"])
+                if not more_body:
+                    body = compress(body, encoding)
+                    headers["Content-Length"] = str(len(body))
+                    passthrough = True
+                    await send(start)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+
+                del headers["Content-Length"]
+                compressor = StreamCompressor(encoding)
+                await send(start)
+
+            data = compressor.chunk(body)
+            if not more_body:
+                data += compressor.finish()
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
@@ -1,15 +1,40 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
+    # Use SQLAlchemy's AsyncEngine (asyncpg) instead of blocking psycopg2 sessions
+    DATABASE_ASYNC: bool = False
+    # Connections this deployment may hold across all workers (each pool gets a share)
+    DB_MAX_CONNECTIONS: int = 30
+    # Connections each worker opens at startup (0: open on first use)
+    DB_POOL_PREWARM: int = 0
+    # Comma-separated read replicas for the public GET endpoints (app.core.replicas)
+    DATABASE_READ_URLS: str = ""
+    DATABASE_READ_HEALTH_SECONDS: int = 10
+    DATABASE_READ_MAX_LAG_SECONDS: float = 5
+    # After a write, the client's reads go to the primary for this long
+    DATABASE_READ_PIN_SECONDS: int = 10
+
+    # Server processes (read by gunicorn too, see gunicorn.conf.py)
+    WEB_CONCURRENCY: int = 1
+    # Relay dog writes between processes with Postgres LISTEN/NOTIFY (app.core.broadcast)
+    DOG_EVENTS_BROADCAST: bool = True
+    DOG_EVENTS_CHANNEL: str = "dog_events"
 
     # Supabase
     SUPABASE_URL: str
     SUPABASE_KEY: str
     SUPABASE_JWT_SECRET: str
+    SUPABASE_JWT_AUDIENCE: str = "authenticated"
+
+    # Auth: verified token claims are cached locally
+    AUTH_CACHE_TTL_SECONDS: int = 300
+    AUTH_CACHE_MAX_SIZE: int = 10000
+    # Re-check tokens with Supabase on revocation-sensitive endpoints
+    AUTH_REMOTE_REVOCATION_CHECK: bool = True
 
     # API
     SECRET_KEY: str
@@ -22,10 +47,65 @@ class Settings(BaseSettings):
     # Environment
     ENVIRONMENT: str = "development"
 
+    # Response cache for public dog endpoints: "memory" or "redis"
+    CACHE_BACKEND: str = "memory"
+    CACHE_TTL_SECONDS: int = 60
+    CACHE_MAX_ENTRIES: int = 1000
+    REDIS_URL: Optional[str] = None
+
+    # Metrics (Prometheus text format at /metrics) and slow-query log
+    METRICS_ENABLED: bool = True
+    SLOW_QUERY_MS: float = 200
+
+    # GET /dogs/changes: tombstones of deleted dogs are kept this long
+    CHANGE_FEED_RETENTION_DAYS: int = 30
+
+    # In-memory read model of available dogs serving GET /dogs and /dogs/nearby
+    READ_MODEL_ENABLED: bool = True
+    READ_MODEL_REFRESH_SECONDS: int = 300
+
+    # GET /dogs/live (server-sent events): open streams per worker and messages
+    # buffered per stream before a slow client is disconnected
+    LIVE_MAX_SUBSCRIBERS: int = 1000
+    LIVE_QUEUE_SIZE: int = 64
+    LIVE_KEEPALIVE_SECONDS: int = 15
+
+    # Response compression: gzip, plus Brotli when the brotli package is installed
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+
+    # Photo processing: "supabase" (bucket) or "local" (MEDIA_ROOT served at MEDIA_URL)
+    PHOTO_STORAGE_BACKEND: str = "supabase"
+    PHOTO_STORAGE_BUCKET: str = "dog-photos"
+    MEDIA_ROOT: str = "media"
+    MEDIA_URL: str = "/media"
+    PHOTO_WIDTHS: str = "320,640,1280"
+    PHOTO_MAX_UPLOAD_BYTES: int = 10 * 1024 * 1024
+    PHOTO_WORKERS: int = 2
+
+    # Geo index (in-process coordinates of available dogs)
+    GEO_INDEX_REFRESH_SECONDS: int = 300
+
+    # GET /dogs/recommended (app.core.recommend): candidate radius around the
+    # user's location and the distance/age at which those scores drop to ~37%
+    RECOMMEND_RADIUS_KM: float = 100
+    RECOMMEND_DISTANCE_SCALE_KM: float = 25
+    RECOMMEND_RECENCY_DAYS: float = 30
+
     @property
     def allowed_origins_list(self) -> List[str]:
         return [origin.strip() for origin in self.ALLOWED_ORIGINS.split(",")]
 
+    @property
+    def database_read_urls_list(self) -> List[str]:
+        return [url.strip() for url in self.DATABASE_READ_URLS.split(",") if url.strip()]
+
+    @property
+    def photo_widths_list(self) -> List[int]:
+        return [int(width) for width in self.PHOTO_WIDTHS.split(",")]
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -1,24 +1,172 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
+from app.core.metrics import TimedAsyncQueuePool, TimedQueuePool, instrument_engine, watch_pool
+
+
+def pool_options(url, poolclass) -> dict:
+    """
+    Pool sizing per process: DB_MAX_CONNECTIONS shared by WEB_CONCURRENCY
+    workers, less the connection each keeps for the dog event channel.
+    A third stays open, the rest is overflow.
+    """
+    # SQLite (local benchmarks) does not take QueuePool sizing arguments
+    if make_url(url).drivername.startswith("sqlite"):
+        return {}
+    per_worker = settings.DB_MAX_CONNECTIONS // max(settings.WEB_CONCURRENCY, 1)
+    if settings.DOG_EVENTS_BROADCAST:
+        per_worker -= 1
+    per_worker = max(per_worker, 2)
+    pool_size = max(per_worker // 3, 1)
+    return {"pool_size": pool_size, "max_overflow": per_worker - pool_size, "poolclass": poolclass}
+
 
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    **pool_options(settings.DATABASE_URL, TimedQueuePool),
 )
+instrument_engine(engine)
+watch_pool("sync", engine)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 Base = declarative_base()
 
 
-# Dependency
-def get_db():
-    db = SessionLocal()
+def async_database_url(url: str):
+    """
+    Translate DATABASE_URL to its async driver (asyncpg / aiosqlite)
+    """
+    url = make_url(url)
+    if url.drivername.startswith("sqlite"):
+        return url.set(drivername="sqlite+aiosqlite")
+
+    url = url.set(drivername="postgresql+asyncpg")
+    # asyncpg takes "ssl" instead of libpq's "sslmode"
+    if "sslmode" in url.query:
+        url = url.update_query_dict({"ssl": url.query["sslmode"]}).difference_update_query(["sslmode"])
+    return url
+
+
+async_engine = None
+AsyncSessionLocal = None
+if settings.DATABASE_ASYNC:
+    async_engine = create_async_engine(
+        async_database_url(settings.DATABASE_URL),
+        pool_pre_ping=True,
+        **pool_options(settings.DATABASE_URL, TimedAsyncQueuePool),
+    )
+    instrument_engine(async_engine.sync_engine)
+    watch_pool("async", async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+class SyncSessionAdapter:
+    """
+    Exposes the awaitable subset of AsyncSession used by the routes on top of a
+    blocking Session, running each call in the threadpool. Lets the same route
+    code run whether or not DATABASE_ASYNC is enabled.
+    """
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    def get_bind(self, *args, **kwargs):
+        return self.sync_session.get_bind(*args, **kwargs)
+
+    def add(self, instance):
+        self.sync_session.add(instance)
+
+    def add_all(self, instances):
+        self.sync_session.add_all(instances)
+
+    async def execute(self, statement, params=None, **kwargs):
+        return await run_in_threadpool(self.sync_session.execute, statement, params, **kwargs)
+
+    async def scalar(self, statement, params=None, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalar, statement, params, **kwargs)
+
+    async def scalars(self, statement, params=None, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalars, statement, params, **kwargs)
+
+    async def get(self, entity, ident, **kwargs):
+        return await run_in_threadpool(self.sync_session.get, entity, ident, **kwargs)
+
+    async def delete(self, instance):
+        await run_in_threadpool(self.sync_session.delete, instance)
+
+    async def flush(self):
+        await run_in_threadpool(self.sync_session.flush)
+
+    async def commit(self):
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self):
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def refresh(self, instance, attribute_names=None):
+        await run_in_threadpool(self.sync_session.refresh, instance, attribute_names)
+
+    async def close(self):
+        await run_in_threadpool(self.sync_session.close)
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await run_in_threadpool(fn, self.sync_session, *args, **kwargs)
+
+
+@asynccontextmanager
+async def open_session():
+    """
+    AsyncSession or SyncSessionAdapter for work outside the request
+    dependency, e.g. a StreamingResponse body that outlives get_db
+    """
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+
+    db = SyncSessionAdapter(SessionLocal())
     try:
         yield db
     finally:
-        db.close()
+        await db.close()
+
+
+async def prewarm_pool(connections: int):
+    """
+    Open connections before the first request instead of during it. Only up
+    to the pool size stay open; failures are logged, not raised.
+    """
+    try:
+        if async_engine is not None:
+            opened = await asyncio.gather(*(async_engine.connect() for _ in range(connections)))
+            for conn in opened:
+                await conn.close()
+        else:
+            def open_and_return():
+                opened = [engine.connect() for _ in range(connections)]
+                for conn in opened:
+                    conn.close()
+            await run_in_threadpool(open_and_return)
+    except Exception as e:
+        print(f"Pool prewarm error: {type(e).__name__}: {str(e)}")
+
+
+async def dispose_engines():
+    engine.dispose()
+    if async_engine is not None:
+        await async_engine.dispose()
+
+
+# Dependency
+async def get_db():
+    async with open_session() as db:
+        yield db
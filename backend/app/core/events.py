@@ -0,0 +1,45 @@
+import inspect
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
+from uuid import UUID
+
+# Kinds of dog write events
+DOG_CREATED = "created"
+DOG_UPDATED = "updated"
+DOG_STATUS_CHANGED = "status_changed"
+DOG_DELETED = "deleted"
+# Writes may have been missed (e.g. the cross-process channel reconnected):
+# drop any state derived from the dogs table. dog_id is None.
+DOGS_RESYNC = "resync"
+
+
+@dataclass
+class DogEvent:
+    kind: str
+    dog_id: Optional[UUID]
+    # The committed Dog row; None for deletes
+    dog: Optional[Any] = None
+    # Committed by another API process and relayed by app.core.broadcast
+    remote: bool = False
+
+
+_listeners: List[Callable] = []
+
+
+def on_dog_change(listener: Callable):
+    """
+    Register a listener (sync or async) called after every committed dog write
+    """
+    _listeners.append(listener)
+    return listener
+
+
+async def emit_dog_change(event: DogEvent):
+    for listener in _listeners:
+        try:
+            result = listener(event)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            # A failing listener must not turn a committed write into an error
+            print(f"Dog event listener error: {type(e).__name__}: {str(e)}")
@@ -0,0 +1,78 @@
+from typing import Dict, List
+
+from sqlalchemy import func, literal, select, union_all
+
+from app.models.dog import Dog
+
+# Facet name -> column; every facet is counted for the same filtered set of dogs
+FACET_COLUMNS = {
+    "size": Dog.size,
+    "gender": Dog.gender,
+    "province": Dog.province,
+    "vaccinated": Dog.vaccinated,
+    "sterilized": Dog.sterilized,
+    "dewormed": Dog.dewormed,
+}
+BOOLEAN_FACETS = {"vaccinated", "sterilized", "dewormed"}
+
+
+def grouping_sets_query(whereclause=None):
+    """
+    One pass over dogs: GROUP BY GROUPING SETS ((size), (gender), ...).
+
+    grouping(size, gender, ...) is a bitmask with a 1 for every column a row
+    is NOT grouped by, which tells us which facet each row belongs to.
+    """
+    columns = list(FACET_COLUMNS.values())
+    stmt = select(
+        *columns,
+        func.grouping(*columns).label("grouping"),
+        func.count().label("count"),
+    ).group_by(func.grouping_sets(*columns))
+    if whereclause is not None:
+        stmt = stmt.where(whereclause)
+    return stmt
+
+
+def union_query(whereclause=None):
+    """
+    Portable equivalent for databases without GROUPING SETS (SQLite): one
+    statement, one GROUP BY per facet
+    """
+    parts = []
+    for name, column in FACET_COLUMNS.items():
+        part = select(
+            literal(name).label("facet"), column.label("value"), func.count().label("count")
+        ).group_by(column)
+        if whereclause is not None:
+            part = part.where(whereclause)
+        parts.append(part)
+    return union_all(*parts)
+
+
+async def count_facets(db, whereclause=None) -> Dict:
+    """
+    Counts per facet value for dogs matching whereclause, most common first
+    """
+    facets: Dict[str, List[Dict]] = {name: [] for name in FACET_COLUMNS}
+    names = list(FACET_COLUMNS)
+
+    if db.get_bind().dialect.name == "postgresql":
+        result = await db.execute(grouping_sets_query(whereclause))
+        for row in result.all():
+            mask = row.grouping
+            for i, name in enumerate(names):
+                if not mask & (1 << (len(names) - 1 - i)):
+                    facets[name].append({"value": row[i], "count": row.count})
+                    break
+    else:
+        result = await db.execute(union_query(whereclause))
+        for facet, value, count in result.all():
+            if facet in BOOLEAN_FACETS and value is not None:
+                value = bool(value)
+            facets[facet].append({"value": value, "count": count})
+
+    for counts in facets.values():
+        counts.sort(key=lambda item: item["count"], reverse=True)
+    # size is NOT NULL, so its buckets add up to the number of matching dogs
+    return {"total": sum(item["count"] for item in facets["size"]), **facets}
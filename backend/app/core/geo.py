@@ -0,0 +1,109 @@
+import math
+from typing import Tuple
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371
+
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+# Stored on Dog.geohash; ~5 m cells, any coarser level is a prefix
+GEOHASH_PRECISION = 9
+
+
+def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Calculate distance between two points in kilometers using Haversine formula
+    """
+    lat1_rad = math.radians(lat1)
+    lat2_rad = math.radians(lat2)
+    delta_lat = math.radians(lat2 - lat1)
+    delta_lon = math.radians(lon2 - lon1)
+
+    a = math.sin(delta_lat / 2) ** 2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon / 2) ** 2
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+    return EARTH_RADIUS_KM * c
+
+
+def haversine_many(latitude: float, longitude: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """
+    Vectorized calculate_distance from one point to arrays of points, in kilometers
+    """
+    lat1_rad = math.radians(latitude)
+    lat2_rad = np.radians(lats)
+    delta_lat = lat2_rad - lat1_rad
+    delta_lon = np.radians(lons - longitude)
+
+    a = np.sin(delta_lat / 2) ** 2 + math.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(delta_lon / 2) ** 2
+    a = np.minimum(a, 1.0)
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+    return EARTH_RADIUS_KM * c
+
+
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """
+    Return (min_lat, max_lat, min_lon, max_lon) enclosing a circle of radius_km.
+
+    The box is a cheap prefilter that can use an index on latitude/longitude;
+    exact distances still have to be checked with calculate_distance.
+    """
+    delta_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat = max(latitude - delta_lat, -90.0)
+    max_lat = min(latitude + delta_lat, 90.0)
+
+    # Longitude degrees shrink towards the poles; use the widest latitude in the box
+    widest = max(abs(min_lat), abs(max_lat))
+    if widest >= 90.0:
+        return min_lat, max_lat, -180.0, 180.0
+
+    delta_lon = math.degrees(radius_km / (EARTH_RADIUS_KM * math.cos(math.radians(widest))))
+    if delta_lon >= 180.0:
+        return min_lat, max_lat, -180.0, 180.0
+
+    return min_lat, max_lat, longitude - delta_lon, longitude + delta_lon
+
+
+def geohash_encode(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """
+    Geohash of a point; nearby points share prefixes, so a prefix is a map cell
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = bit_count = 0
+    even = True
+    while len(chars) < precision:
+        value, interval = (longitude, lon_range) if even else (latitude, lat_range)
+        mid = (interval[0] + interval[1]) / 2
+        if value >= mid:
+            bits = bits * 2 + 1
+            interval[0] = mid
+        else:
+            bits = bits * 2
+            interval[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_ALPHABET[bits])
+            bits = bit_count = 0
+    return "".join(chars)
+
+
+def geohash_precision_for_zoom(zoom: int) -> int:
+    """
+    Geohash length whose cells are roughly 30-80 px wide at a web map zoom level
+    """
+    if zoom <= 2:
+        return 1
+    if zoom <= 4:
+        return 2
+    if zoom <= 7:
+        return 3
+    if zoom <= 9:
+        return 4
+    if zoom <= 12:
+        return 5
+    if zoom <= 14:
+        return 6
+    return 7
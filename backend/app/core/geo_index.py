@@ -0,0 +1,287 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.events import DOG_DELETED, DOGS_RESYNC, DogEvent, on_dog_change
+from app.core.geo import bounding_box, haversine_many
+from app.models.dog import Dog
+
+
+# Region code of a province/canton value the index has never seen (matches nothing)
+UNKNOWN_REGION = -2
+NO_REGION = -1
+UNKNOWN_PUBLISHER = -1
+
+
+def _epoch(value: Optional[datetime]) -> float:
+    # Rows inserted without server defaults (bulk import) get theirs on the next load
+    if value is None:
+        return np.nan
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class Candidates(NamedTuple):
+    """
+    Parallel arrays of the dogs inside a search area, for vectorized scoring;
+    ids[positions[i]] is the dog of entry i
+    """
+    ids: List[UUID]
+    positions: np.ndarray
+    distances: Optional[np.ndarray]
+    created: np.ndarray
+    provinces: np.ndarray
+    cantons: np.ndarray
+
+
+class GeoIndex:
+    """
+    In-process NumPy arrays with the coordinates of every available dog,
+    plus the attributes GET /dogs/recommended scores and filters on
+    (creation time, province/canton and publisher, interned to integer codes).
+
+    Loaded from the database on first use (and again after
+    GEO_INDEX_REFRESH_SECONDS), then kept current from dog write events.
+    Events arriving while a reload query runs are replayed on top of its
+    snapshot, and reloads run one at a time.
+    """
+
+    def __init__(self, refresh_seconds: int):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._ids: List[UUID] = []
+        self._positions: dict = {}
+        self._lats = np.empty(0, dtype=np.float64)
+        self._lons = np.empty(0, dtype=np.float64)
+        self._created = np.empty(0, dtype=np.float64)
+        self._provinces = np.empty(0, dtype=np.int32)
+        self._cantons = np.empty(0, dtype=np.int32)
+        self._publishers = np.empty(0, dtype=np.int32)
+        self._region_codes: Dict[str, int] = {}
+        self._publisher_codes: Dict[UUID, int] = {}
+        self._size = 0
+        self._loaded_at: Optional[float] = None
+        # Events seen while a reload query runs, replayed on top of its snapshot
+        self._pending: Optional[List[DogEvent]] = None
+        self._reload_lock = asyncio.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def _is_stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.refresh_seconds
+
+    async def ensure_loaded(self, db):
+        if not self._is_stale():
+            return
+        async with self._reload_lock:
+            # Another request may have reloaded while this one waited
+            if not self._is_stale():
+                return
+            with self._lock:
+                self._pending = []
+            try:
+                result = await db.execute(
+                    select(
+                        Dog.id, Dog.latitude, Dog.longitude, Dog.created_at, Dog.province, Dog.canton, Dog.publisher_id,
+                    ).where(Dog.status == 'disponible')
+                )
+                rows = result.all()
+            except Exception:
+                with self._lock:
+                    self._pending = None
+                raise
+            self.load(rows)
+
+    def _region_code(self, value: Optional[str]) -> int:
+        # Caller holds the lock
+        if value is None:
+            return NO_REGION
+        return self._region_codes.setdefault(value, len(self._region_codes))
+
+    def region_code(self, value: Optional[str]) -> int:
+        """
+        Code of a province/canton for comparing against Candidates arrays
+        """
+        if value is None:
+            return NO_REGION
+        return self._region_codes.get(value, UNKNOWN_REGION)
+
+    def _publisher_code(self, publisher_id: UUID) -> int:
+        # Caller holds the lock
+        return self._publisher_codes.setdefault(publisher_id, len(self._publisher_codes))
+
+    def load(self, rows):
+        """
+        Replace the contents with (id, latitude, longitude, created_at, province, canton, publisher_id) rows
+        """
+        count = len(rows)
+        ids = [row[0] for row in rows]
+        lats = np.fromiter((row[1] for row in rows), dtype=np.float64, count=count)
+        lons = np.fromiter((row[2] for row in rows), dtype=np.float64, count=count)
+        created = np.fromiter((_epoch(row[3]) for row in rows), dtype=np.float64, count=count)
+        with self._lock:
+            provinces = np.fromiter((self._region_code(row[4]) for row in rows), dtype=np.int32, count=count)
+            cantons = np.fromiter((self._region_code(row[5]) for row in rows), dtype=np.int32, count=count)
+            publishers = np.fromiter((self._publisher_code(row[6]) for row in rows), dtype=np.int32, count=count)
+            self._ids = ids
+            self._positions = {dog_id: i for i, dog_id in enumerate(ids)}
+            self._lats = lats
+            self._lons = lons
+            self._created = created
+            self._provinces = provinces
+            self._cantons = cantons
+            self._publishers = publishers
+            self._size = len(ids)
+            self._loaded_at = time.monotonic()
+            pending, self._pending = self._pending or [], None
+            for event in pending:
+                self._apply(event)
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+
+    def _grow(self):
+        capacity = max(16, len(self._lats) * 2)
+        for name in ("_lats", "_lons", "_created", "_provinces", "_cantons", "_publishers"):
+            current = getattr(self, name)
+            grown = np.empty(capacity, dtype=current.dtype)
+            grown[:self._size] = current[:self._size]
+            setattr(self, name, grown)
+
+    def _upsert(self, dog: Dog):
+        # Caller holds the lock
+        position = self._positions.get(dog.id)
+        if position is None:
+            if self._size == len(self._lats):
+                self._grow()
+            position = self._size
+            self._ids.append(dog.id)
+            self._positions[dog.id] = position
+            self._size += 1
+        self._lats[position] = dog.latitude
+        self._lons[position] = dog.longitude
+        self._created[position] = _epoch(dog.created_at)
+        self._provinces[position] = self._region_code(dog.province)
+        self._cantons[position] = self._region_code(dog.canton)
+        self._publishers[position] = self._publisher_code(dog.publisher_id)
+
+    def _discard(self, dog_id: UUID):
+        # Caller holds the lock
+        position = self._positions.pop(dog_id, None)
+        if position is None:
+            return
+        # Move the last entry into the freed slot
+        last = self._size - 1
+        if position != last:
+            moved_id = self._ids[last]
+            self._ids[position] = moved_id
+            self._positions[moved_id] = position
+            for array in (self._lats, self._lons, self._created, self._provinces, self._cantons, self._publishers):
+                array[position] = array[last]
+        self._ids.pop()
+        self._size -= 1
+
+    def _apply(self, event: DogEvent):
+        if event.kind != DOG_DELETED and event.dog.status == 'disponible':
+            self._upsert(event.dog)
+        else:
+            self._discard(event.dog_id)
+
+    def sync(self, event: DogEvent):
+        """
+        Reflect a committed write: dogs are indexed while available, dropped otherwise
+        """
+        if event.kind == DOGS_RESYNC:
+            self.invalidate()
+            return
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append(event)
+            if self.loaded:
+                self._apply(event)
+
+    def _within(self, latitude: float, longitude: float, radius_km: float, attributes: bool = False):
+        """
+        (ids, positions, distances, attribute arrays) of the dogs within
+        radius_km: bounding-box prefilter, then exact distances
+        """
+        with self._lock:
+            ids = self._ids[:]
+            lats = self._lats[:self._size].copy()
+            lons = self._lons[:self._size].copy()
+            if attributes:
+                extra = tuple(array[:self._size].copy() for array in self._attribute_arrays())
+
+        min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+        candidates = np.flatnonzero(
+            (lats >= min_lat) & (lats <= max_lat) & (lons >= min_lon) & (lons <= max_lon)
+        )
+        distances = haversine_many(latitude, longitude, lats[candidates], lons[candidates])
+        within = distances <= radius_km
+        candidates, distances = candidates[within], distances[within]
+        return ids, candidates, distances, (tuple(array[candidates] for array in extra) if attributes else None)
+
+    def _attribute_arrays(self):
+        return self._created, self._provinces, self._cantons, self._publishers
+
+    def candidates(
+        self, latitude: Optional[float], longitude: Optional[float], radius_km: float,
+        exclude_publisher: Optional[UUID] = None,
+    ) -> Candidates:
+        """
+        Attributes of the dogs within radius_km, or of every dog (without
+        distances) when no location is given, leaving out exclude_publisher's dogs
+        """
+        if latitude is None or longitude is None:
+            with self._lock:
+                ids = self._ids[:]
+                positions = np.arange(self._size)
+                distances = None
+                created, provinces, cantons, publishers = (
+                    array[:self._size].copy() for array in self._attribute_arrays()
+                )
+        else:
+            ids, positions, distances, (created, provinces, cantons, publishers) = self._within(
+                latitude, longitude, radius_km, attributes=True
+            )
+
+        if exclude_publisher is not None:
+            keep = publishers != self._publisher_codes.get(exclude_publisher, UNKNOWN_PUBLISHER)
+            positions, created, provinces, cantons = positions[keep], created[keep], provinces[keep], cantons[keep]
+            if distances is not None:
+                distances = distances[keep]
+        return Candidates(ids, positions, distances, created, provinces, cantons)
+
+    def nearest(self, latitude: float, longitude: float, radius_km: float, k: int) -> List[Tuple[UUID, float]]:
+        """
+        Return up to k (dog_id, distance_km) pairs within radius_km, nearest first
+        """
+        ids, candidates, distances, _ = self._within(latitude, longitude, radius_km)
+        if candidates.size == 0:
+            return []
+
+        if candidates.size > k:
+            top = np.argpartition(distances, k - 1)[:k]
+            candidates, distances = candidates[top], distances[top]
+
+        order = np.argsort(distances)
+        return [(ids[i], float(distances[j])) for j, i in zip(order, candidates[order])]
+
+
+geo_index = GeoIndex(refresh_seconds=settings.GEO_INDEX_REFRESH_SECONDS)
+
+
+@on_dog_change
+def _sync_geo_index(event: DogEvent):
+    geo_index.sync(event)
@@ -0,0 +1,70 @@
+import asyncio
+import io
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+
+from PIL import Image, ImageOps
+
+from app.core.config import settings
+
+# Output formats for every width: (format, content type, extension, save options)
+VARIANT_FORMATS = [
+    ("JPEG", "image/jpeg", "jpg", {"quality": 82, "optimize": True, "progressive": True}),
+    ("WEBP", "image/webp", "webp", {"quality": 80, "method": 4}),
+]
+
+
+class InvalidImageError(ValueError):
+    pass
+
+
+def process_photo(data: bytes, widths: List[int]) -> List[Tuple[str, bytes, str, int, int]]:
+    """
+    Decode an uploaded photo, drop its metadata and render resized variants.
+
+    Runs in a worker process. Returns (extension, bytes, content_type, width, height)
+    for every width/format pair; widths larger than the original are capped
+    to the original size.
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as original:
+            # Bake EXIF orientation into the pixels; EXIF itself is not copied to the variants
+            image = ImageOps.exif_transpose(original)
+            image = image.convert("RGB")
+    except Exception as e:
+        raise InvalidImageError(f"Could not decode image: {e}")
+
+    variants = []
+    for width in sorted(set(min(w, image.width) for w in widths)):
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        for fmt, content_type, extension, options in VARIANT_FORMATS:
+            buffer = io.BytesIO()
+            resized.save(buffer, format=fmt, **options)
+            variants.append((extension, buffer.getvalue(), content_type, width, height))
+    return variants
+
+
+_executor = None
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=settings.PHOTO_WORKERS)
+    return _executor
+
+
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
+
+
+async def render_photo_variants(data: bytes) -> List[Tuple[str, bytes, str, int, int]]:
+    """
+    Run process_photo in the worker pool so decoding/resizing never blocks the event loop
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), process_photo, data, settings.photo_widths_list)
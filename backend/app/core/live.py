@@ -0,0 +1,134 @@
+"""
+In-process pub/sub hub behind GET /dogs/live (server-sent events).
+
+Every dog write event is encoded once and pushed to the bounded queue of
+each matching subscriber. Subscribers are indexed by dog id, province and
+publisher, so a write only touches the tabs that asked for it. A
+subscriber that falls LIVE_QUEUE_SIZE messages behind is sent an overflow
+event and disconnected rather than buffered without limit; EventSource
+reconnects and the page reloads its state.
+
+Events committed by other workers arrive here through app.core.broadcast.
+"""
+import asyncio
+import itertools
+from typing import Dict, Iterable, Optional, Set
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.events import DOG_DELETED, DOGS_RESYNC, DogEvent, on_dog_change
+from app.core.responses import dumps, schema_fields, to_dicts
+from app.schemas.dog import DogResponse
+
+DOG_FIELDS = schema_fields(DogResponse)
+
+# Sentinel queued (instead of a message) when a subscriber overflowed
+OVERFLOW = b"event: overflow\ndata: {}\n\n"
+
+
+class Subscription:
+    def __init__(self, dog_ids: Set[UUID], province: Optional[str], publisher_id: Optional[UUID], queue_size: int):
+        self.dog_ids = dog_ids
+        self.province = province
+        self.publisher_id = publisher_id
+        self.queue_size = queue_size
+        # One extra slot is reserved for the overflow sentinel
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size + 1)
+        self.closed = False
+
+    @property
+    def unfiltered(self) -> bool:
+        return not self.dog_ids and self.province is None and self.publisher_id is None
+
+    def offer(self, message: bytes):
+        if self.closed:
+            return
+        if self.queue.qsize() >= self.queue_size:
+            self.closed = True
+            self.queue.put_nowait(OVERFLOW)
+            return
+        self.queue.put_nowait(message)
+
+
+class LiveHub:
+    def __init__(self, max_subscribers: int, queue_size: int):
+        self.max_subscribers = max_subscribers
+        self.queue_size = queue_size
+        self._count = 0
+        self._unfiltered: Set[Subscription] = set()
+        self._by_dog: Dict[UUID, Set[Subscription]] = {}
+        self._by_province: Dict[str, Set[Subscription]] = {}
+        self._by_publisher: Dict[UUID, Set[Subscription]] = {}
+        self._event_ids = itertools.count(1)
+
+    @property
+    def full(self) -> bool:
+        return self._count >= self.max_subscribers
+
+    def _indexes(self, subscription: Subscription):
+        for dog_id in subscription.dog_ids:
+            yield self._by_dog, dog_id
+        if subscription.province is not None:
+            yield self._by_province, subscription.province
+        if subscription.publisher_id is not None:
+            yield self._by_publisher, subscription.publisher_id
+
+    def subscribe(self, dog_ids: Iterable[UUID] = (), province: Optional[str] = None,
+                  publisher_id: Optional[UUID] = None) -> Subscription:
+        """
+        A subscription receives events matching any of its filters, or every event without filters
+        """
+        subscription = Subscription(set(dog_ids), province, publisher_id, self.queue_size)
+        if subscription.unfiltered:
+            self._unfiltered.add(subscription)
+        for index, key in self._indexes(subscription):
+            index.setdefault(key, set()).add(subscription)
+        self._count += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscription.closed = True
+        self._unfiltered.discard(subscription)
+        for index, key in self._indexes(subscription):
+            subscribers = index.get(key)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del index[key]
+        self._count -= 1
+
+    def _recipients(self, event: DogEvent) -> Set[Subscription]:
+        recipients = set(self._unfiltered)
+        recipients.update(self._by_dog.get(event.dog_id, ()))
+        dog = event.dog
+        if dog is not None:
+            recipients.update(self._by_province.get(dog.province, ()))
+            recipients.update(self._by_publisher.get(dog.publisher_id, ()))
+        elif self._by_province or self._by_publisher:
+            # Deletes relayed from another worker carry no row; let clients ignore unknown ids
+            for index in (self._by_province, self._by_publisher):
+                for subscribers in index.values():
+                    recipients.update(subscribers)
+        return recipients
+
+    def publish(self, event: DogEvent):
+        if event.kind == DOGS_RESYNC or self._count == 0:
+            return
+        dog = event.dog
+        data = {
+            "kind": event.kind,
+            "dog_id": event.dog_id,
+            "status": dog.status if dog is not None and event.kind != DOG_DELETED else None,
+            "dog": to_dicts([dog], DOG_FIELDS)[0] if dog is not None and event.kind != DOG_DELETED else None,
+        }
+        message = b"id: %d\nevent: %s\ndata: %s\n\n" % (next(self._event_ids), event.kind.encode(), dumps(data))
+        for subscription in self._recipients(event):
+            subscription.offer(message)
+
+
+live_hub = LiveHub(max_subscribers=settings.LIVE_MAX_SUBSCRIBERS, queue_size=settings.LIVE_QUEUE_SIZE)
+
+
+@on_dog_change
+def _publish_live(event: DogEvent):
+    live_hub.publish(event)
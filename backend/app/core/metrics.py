@@ -0,0 +1,199 @@
+"""
+Request-level performance metrics in the Prometheus text format, served by
+GET /metrics.
+
+Under gunicorn every worker has its own copy of these metrics, so
+gunicorn.conf.py sets PROMETHEUS_MULTIPROC_DIR: prometheus_client then
+writes each worker's values to files there and a scrape of any worker
+returns the sum over all of them. Per-request query counts and DB time are
+accumulated in a context variable, which also reaches sync sessions run in
+the threadpool and async sessions run in SQLAlchemy's greenlets.
+"""
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client import multiprocess
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+SLOW_QUERY_MAX_CHARS = 500
+
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route.", ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries", "Database queries executed per HTTP request.", ["route"], buckets=QUERY_COUNT_BUCKETS
+)
+REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds", "Database time spent per HTTP request.", ["route"], buckets=LATENCY_BUCKETS
+)
+QUERY_SECONDS = Histogram("db_query_duration_seconds", "Duration of individual SQL statements.", buckets=QUERY_BUCKETS)
+SLOW_QUERIES = Counter("db_slow_queries", "SQL statements slower than SLOW_QUERY_MS.")
+POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds", "Time waiting for a pooled database connection.", ["engine"], buckets=QUERY_BUCKETS
+)
+AUTH_SECONDS = Histogram("auth_duration_seconds", "Time spent authenticating a request.", ["method"], buckets=QUERY_BUCKETS)
+
+# Summed over the live workers in multiprocess mode
+POOL_GAUGES = {
+    "db_pool_size": ("Configured pool size.", lambda pool: pool.size()),
+    "db_pool_checked_out": ("Connections currently in use.", lambda pool: pool.checkedout()),
+    "db_pool_checked_in": ("Idle connections in the pool.", lambda pool: pool.checkedin()),
+    "db_pool_overflow": ("Connections open beyond pool_size.", lambda pool: pool.overflow()),
+}
+_pool_gauges = {
+    metric: (Gauge(metric, documentation, ["engine"], multiprocess_mode="livesum"), read)
+    for metric, (documentation, read) in POOL_GAUGES.items()
+}
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+@contextmanager
+def timed(histogram: Histogram, **labels: str):
+    metric = histogram.labels(**labels) if labels else histogram
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metric.observe(time.perf_counter() - start)
+
+
+# --- Database ---------------------------------------------------------------
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    QUERY_SECONDS.observe(elapsed)
+
+    stats = request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+
+    if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        SLOW_QUERIES.inc()
+        print(f"Slow query ({elapsed * 1000:.0f} ms): {' '.join(statement.split())[:SLOW_QUERY_MAX_CHARS]}")
+
+
+def instrument_engine(engine):
+    """
+    Time every statement run on a (sync) Engine; pass async_engine.sync_engine for async engines
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class TimedQueuePool(QueuePool):
+    """
+    QueuePool that records how long each checkout waits for a connection
+    """
+
+    def connect(self):
+        with timed(POOL_CHECKOUT_SECONDS, engine="sync"):
+            return super().connect()
+
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    def connect(self):
+        with timed(POOL_CHECKOUT_SECONDS, engine="async"):
+            return super().connect()
+
+
+_pools: Dict[str, Callable[[], object]] = {}
+
+
+def _update_pool_gauges(name: str):
+    pool = _pools[name]()
+    if isinstance(pool, QueuePool):
+        for gauge, read in _pool_gauges.values():
+            gauge.labels(engine=name).set(read(pool))
+
+
+def watch_pool(name: str, engine):
+    """
+    Export an engine's pool gauges. Each worker updates its own on every
+    checkout/checkin, since a scrape may be answered by another worker.
+    """
+    # Read engine.pool when updating: dispose() replaces the pool object
+    _pools[name] = lambda: engine.pool
+    for identifier in ("connect", "checkout", "checkin", "close"):
+        event.listen(engine, identifier, lambda *args: _update_pool_gauges(name))
+
+
+def render() -> bytes:
+    for name in _pools:
+        _update_pool_gauges(name)
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+# --- HTTP -------------------------------------------------------------------
+
+def route_label(scope: Scope) -> str:
+    # Path templates keep label cardinality bounded; unmatched paths share one label
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Records latency, query count and DB time per route
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            request_stats.reset(token)
+            route = route_label(scope)
+            REQUEST_SECONDS.labels(method=scope["method"], route=route, status=str(status_code)).observe(
+                time.perf_counter() - start
+            )
+            REQUEST_QUERIES.labels(route=route).observe(stats.queries)
+            REQUEST_DB_SECONDS.labels(route=route).observe(stats.db_seconds)
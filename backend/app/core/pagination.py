@@ -0,0 +1,64 @@
+import base64
+import json
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+
+
+def as_utc(value: datetime) -> datetime:
+    """
+    Timezone-aware UTC, like the timestamptz columns cursors point into;
+    naive values (SQLite) are taken to be UTC already
+    """
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def encode_cursor(created_at: datetime, item_id: UUID) -> str:
+    """
+    Opaque cursor pointing just after (created_at, id) in newest-first order
+    """
+    raw = json.dumps([created_at.isoformat(), str(item_id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    (created_at, id) of a cursor; the timestamp is always UTC-aware
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, item_id = json.loads(base64.urlsafe_b64decode(padded))
+        return as_utc(datetime.fromisoformat(created_at)), UUID(item_id)
+    except (ValueError, TypeError, AttributeError, OverflowError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+async def paginate(db, stmt, created_col, id_col, cursor: Optional[str], limit: int):
+    """
+    Keyset pagination of a select() over (created_at, id) descending.
+
+    Returns (items, next_cursor); next_cursor is None on the last page.
+    """
+    if cursor:
+        created_at, item_id = decode_cursor(cursor)
+        # Row-value comparison so the planner can range-scan (created_at, id) indexes
+        stmt = stmt.where(tuple_(created_col, id_col) < tuple_(created_at, item_id))
+
+    result = await db.scalars(stmt.order_by(created_col.desc(), id_col.desc()).limit(limit + 1))
+    items = result.all()
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, created_col.key), getattr(last, id_col.key))
+
+    return items, next_cursor
@@ -0,0 +1,214 @@
+import asyncio
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.events import DOG_DELETED, DOGS_RESYNC, DogEvent, on_dog_change
+from app.core.pagination import as_utc, decode_cursor, encode_cursor
+from app.core.responses import dumps, schema_fields, to_dicts
+from app.models.dog import Dog
+from app.schemas.dog import DogMapResponse, DogNearbyResponse, DogSummaryResponse
+
+# Fragments are encoded without distance_km, which is spliced in per response
+DISTANCE_FIELD = "distance_km"
+VIEW_SCHEMAS = {"summary": DogSummaryResponse, "map": DogMapResponse, "full": DogNearbyResponse}
+VIEW_FIELDS = {
+    view: tuple(field for field in schema_fields(schema) if field != DISTANCE_FIELD)
+    for view, schema in VIEW_SCHEMAS.items()
+}
+INDEXED_FIELDS = ("province", "size", "gender")
+
+Key = Tuple  # (created_at, id): the keyset pagination order
+
+
+class AvailableDog:
+    __slots__ = ("key", "province", "size", "gender", "vaccinated", "sterilized", "dewormed", "fragments")
+
+    def __init__(self, dog: Dog):
+        # UTC-aware like decoded cursors, whatever the driver returns
+        self.key = (as_utc(dog.created_at), dog.id)
+        self.province = dog.province
+        self.size = dog.size
+        self.gender = dog.gender
+        self.vaccinated = dog.vaccinated
+        self.sterilized = dog.sterilized
+        self.dewormed = dog.dewormed
+        self.fragments = {view: dumps(to_dicts([dog], fields)[0]) for view, fields in VIEW_FIELDS.items()}
+
+    def matches(self, filters: Dict) -> bool:
+        return all(getattr(self, field) in values for field, values in filters.items())
+
+    def fragment(self, view: str, distance=...) -> bytes:
+        fragment = self.fragments[view]
+        if distance is ...:
+            return fragment
+        return fragment[:-1] + b',"distance_km":' + dumps(distance) + b"}"
+
+
+class AvailableDogs:
+    """
+    In-memory read model of every available dog, pre-encoded per view.
+
+    Entries are ordered by (created_at, id) like the keyset pages of
+    GET /dogs, with the same order kept per province/size/gender value so
+    filtered pages only walk matching dogs. Loaded from the database on first
+    use (and reconciled after READ_MODEL_REFRESH_SECONDS), then kept current
+    from dog write events.
+    """
+
+    def __init__(self, refresh_seconds: int):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._dogs: Dict[UUID, AvailableDog] = {}
+        self._order: List[Key] = []
+        self._by_key: Dict[Key, AvailableDog] = {}
+        self._indexes: Dict[str, Dict[object, List[Key]]] = {field: {} for field in INDEXED_FIELDS}
+        self._loaded_at: Optional[float] = None
+        # Events seen while a reload query runs, replayed on top of its snapshot
+        self._pending: Optional[List[DogEvent]] = None
+        # One reload at a time: a second one would drop the first one's pending events
+        self._reload_lock = asyncio.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def _is_stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.refresh_seconds
+
+    async def ensure_loaded(self, db):
+        if not self._is_stale():
+            return
+        async with self._reload_lock:
+            # Another request may have reloaded while this one waited
+            if not self._is_stale():
+                return
+            with self._lock:
+                self._pending = []
+            try:
+                result = await db.scalars(select(Dog).where(Dog.status == 'disponible'))
+                dogs = result.all()
+            except Exception:
+                with self._lock:
+                    self._pending = None
+                raise
+            self.load(dogs)
+
+    def load(self, dogs: Sequence[Dog]):
+        entries = [AvailableDog(dog) for dog in dogs]
+        with self._lock:
+            self._dogs = {entry.key[1]: entry for entry in entries}
+            self._by_key = {entry.key: entry for entry in entries}
+            self._order = sorted(self._by_key)
+            self._indexes = {field: {} for field in INDEXED_FIELDS}
+            for key in self._order:
+                entry = self._by_key[key]
+                for field in INDEXED_FIELDS:
+                    self._indexes[field].setdefault(getattr(entry, field), []).append(key)
+            self._loaded_at = time.monotonic()
+            pending, self._pending = self._pending or [], None
+            for event in pending:
+                self._apply(event)
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+
+    def _insert(self, entry: AvailableDog):
+        self._dogs[entry.key[1]] = entry
+        self._by_key[entry.key] = entry
+        insort(self._order, entry.key)
+        for field in INDEXED_FIELDS:
+            insort(self._indexes[field].setdefault(getattr(entry, field), []), entry.key)
+
+    def _remove(self, dog_id: UUID):
+        entry = self._dogs.pop(dog_id, None)
+        if entry is None:
+            return
+        del self._by_key[entry.key]
+        for keys in [self._order] + [self._indexes[field][getattr(entry, field)] for field in INDEXED_FIELDS]:
+            index = bisect_left(keys, entry.key)
+            if index < len(keys) and keys[index] == entry.key:
+                del keys[index]
+
+    def _apply(self, event: DogEvent):
+        self._remove(event.dog_id)
+        if event.kind != DOG_DELETED and event.dog.status == 'disponible':
+            self._insert(AvailableDog(event.dog))
+
+    def sync(self, event: DogEvent):
+        """
+        Reflect a committed write: entries exist only while the dog is available
+        """
+        dog = event.dog
+        if event.kind == DOGS_RESYNC or (dog is not None and (dog.created_at is None or dog.updated_at is None)):
+            # Rows without their server defaults (bulk import) are picked up by a reload
+            self.invalidate()
+            return
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append(event)
+            if self.loaded:
+                self._apply(event)
+
+    def page(self, view: str, cursor: Optional[str], limit: int, **filters) -> Tuple[List[bytes], Optional[str]]:
+        """
+        A GET /dogs page (newest first) of dogs matching the filters (a
+        value, a list of accepted values, or None for unfiltered); returns
+        (fragments, next_cursor)
+        """
+        filters = {
+            field: set(value) if isinstance(value, list) else {value}
+            for field, value in filters.items() if value is not None
+        }
+        after = decode_cursor(cursor) if cursor else None
+
+        with self._lock:
+            # Walk the smallest ordered list covering one of the filters
+            keys = self._order
+            for field in INDEXED_FIELDS:
+                if len(filters.get(field, ())) == 1:
+                    candidate = self._indexes[field].get(next(iter(filters[field])), [])
+                    if len(candidate) < len(keys):
+                        keys = candidate
+            position = bisect_left(keys, after) if after else len(keys)
+
+            entries = []
+            while position > 0 and len(entries) <= limit:
+                position -= 1
+                entry = self._by_key[keys[position]]
+                if entry.matches(filters):
+                    entries.append(entry)
+
+        next_cursor = None
+        if len(entries) > limit:
+            entries = entries[:limit]
+            next_cursor = encode_cursor(*entries[-1].key)
+        return [entry.fragment(view) for entry in entries], next_cursor
+
+    def nearby(self, view: str, hits: Sequence[Tuple[UUID, float]]) -> Optional[List[bytes]]:
+        """
+        Fragments with distance_km for GeoIndex hits (left out for a None
+        distance); None if any hit is unknown
+        """
+        fragments = []
+        with self._lock:
+            for dog_id, distance in hits:
+                entry = self._dogs.get(dog_id)
+                if entry is None:
+                    return None
+                fragments.append(entry.fragment(view, ... if distance is None else round(distance, 2)))
+        return fragments
+
+
+available_dogs = AvailableDogs(refresh_seconds=settings.READ_MODEL_REFRESH_SECONDS)
+
+
+@on_dog_change
+def _sync_available_dogs(event: DogEvent):
+    available_dogs.sync(event)
@@ -0,0 +1,98 @@
+"""
+Ranking for GET /dogs/recommended.
+
+Candidates come from the GeoIndex (available dogs within
+RECOMMEND_RADIUS_KM of the user's stored location, or every available dog
+when the profile has none) and are scored in one vectorized pass:
+
+    score = DISTANCE_WEIGHT * exp(-distance / RECOMMEND_DISTANCE_SCALE_KM)
+          + RECENCY_WEIGHT * exp(-age / RECOMMEND_RECENCY_DAYS)
+          + REGION_WEIGHT * (1 for the user's canton, 0.5 for their province)
+"""
+import time
+from typing import List, NamedTuple, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+
+from app.core.broadcast import broadcaster
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.geo_index import GeoIndex
+
+DISTANCE_WEIGHT = 0.5
+RECENCY_WEIGHT = 0.3
+REGION_WEIGHT = 0.2
+PROVINCE_MATCH = 0.5
+CANTON_MATCH = 1.0
+SECONDS_PER_DAY = 86400
+
+
+class Profile(NamedTuple):
+    latitude: Optional[float]
+    longitude: Optional[float]
+    province: Optional[str]
+    canton: Optional[str]
+
+
+def score(
+    distances: Optional[np.ndarray], created: np.ndarray, province_match: np.ndarray, canton_match: np.ndarray,
+    now: float,
+) -> np.ndarray:
+    # Dogs whose creation time is not known yet (bulk import) count as new
+    age_days = np.maximum(now - np.where(np.isnan(created), now, created), 0) / SECONDS_PER_DAY
+    scores = RECENCY_WEIGHT * np.exp(-age_days / settings.RECOMMEND_RECENCY_DAYS)
+    scores += REGION_WEIGHT * np.where(canton_match, CANTON_MATCH, np.where(province_match, PROVINCE_MATCH, 0.0))
+    if distances is not None:
+        scores += DISTANCE_WEIGHT * np.exp(-distances / settings.RECOMMEND_DISTANCE_SCALE_KM)
+    return scores
+
+
+def profile_namespace(user_id) -> str:
+    """
+    Cache namespace bumped whenever the user's profile changes
+    """
+    return f"users:profile:{user_id}"
+
+
+async def bump_profile(user_id):
+    """
+    Invalidate the user's cached recommendations in every API process
+    """
+    namespace = profile_namespace(user_id)
+    await response_cache.bump(namespace)
+    broadcaster.publish_bump(namespace)
+
+
+def recommend(
+    index: GeoIndex, profile: Profile, limit: int, user_id: Optional[UUID] = None,
+) -> List[Tuple[UUID, Optional[float]]]:
+    """
+    Up to limit (dog_id, distance_km) pairs, best first, leaving out the
+    user's own dogs; distance_km is None when the profile has no location
+    """
+    candidates = index.candidates(
+        profile.latitude, profile.longitude, settings.RECOMMEND_RADIUS_KM, exclude_publisher=user_id
+    )
+    if candidates.positions.size == 0:
+        return []
+
+    no_match = np.zeros(candidates.positions.size, dtype=bool)
+    province_match = no_match
+    if profile.province is not None:
+        province_match = candidates.provinces == index.region_code(profile.province)
+    # Canton names repeat across provinces, so a canton only matches within the province
+    canton_match = no_match
+    if profile.canton is not None:
+        canton_match = province_match & (candidates.cantons == index.region_code(profile.canton))
+    scores = score(candidates.distances, candidates.created, province_match, canton_match, time.time())
+
+    top = np.arange(scores.size)
+    if scores.size > limit:
+        top = np.argpartition(-scores, limit - 1)[:limit]
+    top = top[np.argsort(-scores[top], kind="stable")]
+
+    ids = candidates.ids
+    if candidates.distances is None:
+        return [(ids[candidates.positions[i]], None) for i in top]
+    return [(ids[candidates.positions[i]], float(candidates.distances[i])) for i in top]
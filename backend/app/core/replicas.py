@@ -0,0 +1,215 @@
+"""
+Read replicas for the public GET endpoints.
+
+With DATABASE_READ_URLS set, get_read_db hands out sessions on the replicas
+in turn, skipping any that failed their last health check (unreachable or
+lagging more than DATABASE_READ_MAX_LAG_SECONDS) and falling back to the
+primary when none is healthy.
+
+A client that just wrote must see its write, so successful unsafe requests
+pin their bearer token to the primary for DATABASE_READ_PIN_SECONDS, and
+their reads skip cached responses. Pins live in Redis when that is the cache backend, so they hold across workers;
+otherwise each worker keeps its own.
+"""
+import asyncio
+import hashlib
+import itertools
+from contextlib import asynccontextmanager
+from typing import List, Optional
+
+from fastapi import Request
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.cache import READ_PINNED, READ_REPLICA, TTLCache, response_cache
+from app.core.config import settings
+from app.core.database import SyncSessionAdapter, async_database_url, open_session, pool_options
+from app.core.metrics import TimedAsyncQueuePool, TimedQueuePool, instrument_engine, watch_pool
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+PIN_KEY_PREFIX = "db:pin:"
+PIN_MAX_ENTRIES = 10000
+
+# Seconds a streaming replica has not yet replayed; 0 when caught up
+POSTGRES_LAG_QUERY = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+    "THEN 0 ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+class Replica:
+    def __init__(self, name: str, url: str):
+        self.name = name
+        self.healthy = True
+        if settings.DATABASE_ASYNC:
+            self.async_engine = create_async_engine(
+                async_database_url(url),
+                pool_pre_ping=True,
+                **pool_options(url, TimedAsyncQueuePool),
+            )
+            self.engine = self.async_engine.sync_engine
+            self.async_sessions = async_sessionmaker(self.async_engine, autoflush=False, expire_on_commit=False)
+        else:
+            self.async_engine = None
+            self.engine = create_engine(url, pool_pre_ping=True, **pool_options(url, TimedQueuePool))
+            self.sessions = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=self.engine)
+        self.lag_query = POSTGRES_LAG_QUERY if make_url(url).get_backend_name() == "postgresql" else text("SELECT 0")
+        instrument_engine(self.engine)
+        watch_pool(name, self.engine)
+        event.listen(self.engine, "handle_error", self._on_error)
+
+    def _on_error(self, context):
+        # Stop routing here until the next health check instead of failing every request
+        if context.is_disconnect:
+            self.healthy = False
+
+    @asynccontextmanager
+    async def session(self):
+        if self.async_engine is not None:
+            async with self.async_sessions() as db:
+                yield db
+            return
+
+        db = SyncSessionAdapter(self.sessions())
+        try:
+            yield db
+        finally:
+            await db.close()
+
+    async def check(self):
+        try:
+            async with self.session() as db:
+                lag = (await db.execute(self.lag_query)).scalar()
+            healthy = float(lag or 0) <= settings.DATABASE_READ_MAX_LAG_SECONDS
+        except Exception as e:
+            print(f"Replica {self.name} health check error: {type(e).__name__}: {str(e)}")
+            healthy = False
+        if healthy != self.healthy:
+            print(f"Replica {self.name} is now {'healthy' if healthy else 'unhealthy'}")
+        self.healthy = healthy
+
+    async def dispose(self):
+        if self.async_engine is not None:
+            await self.async_engine.dispose()
+        else:
+            self.engine.dispose()
+
+
+class ReplicaSet:
+    def __init__(self, urls: List[str]):
+        self.replicas = [Replica(f"replica{i}", url) for i, url in enumerate(urls)]
+        self._turn = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def pick(self) -> Optional[Replica]:
+        """
+        Next healthy replica in round-robin order, or None for the primary
+        """
+        start = next(self._turn)
+        for offset in range(len(self.replicas)):
+            replica = self.replicas[(start + offset) % len(self.replicas)]
+            if replica.healthy:
+                return replica
+        return None
+
+    def start(self):
+        """
+        Start the health checks; call from the app's event loop
+        """
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._health_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for replica in self.replicas:
+            await replica.dispose()
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.gather(*(replica.check() for replica in self.replicas))
+            await asyncio.sleep(settings.DATABASE_READ_HEALTH_SECONDS)
+
+
+replicas = ReplicaSet(settings.database_read_urls_list)
+# Kept apart from the memory cache so response entries never evict pins
+_local_pins = TTLCache(maxsize=PIN_MAX_ENTRIES, ttl=settings.DATABASE_READ_PIN_SECONDS)
+
+
+def _pin_key(request: Request) -> Optional[str]:
+    # The token itself, unverified: a pin only decides where reads go
+    authorization = request.headers.get("authorization")
+    if not authorization:
+        return None
+    return PIN_KEY_PREFIX + hashlib.sha256(authorization.encode()).hexdigest()[:32]
+
+
+async def pin_to_primary(key: str):
+    if response_cache.backend.shared:
+        await response_cache.backend.set(key, b"1", ttl=settings.DATABASE_READ_PIN_SECONDS)
+    else:
+        _local_pins.set(key, True)
+
+
+async def is_pinned(request: Request) -> bool:
+    key = _pin_key(request)
+    if key is None:
+        return False
+    if response_cache.backend.shared:
+        return await response_cache.backend.get(key) is not None
+    return _local_pins.get(key) is not None
+
+
+class PinAfterWriteMiddleware:
+    """
+    Pin the client's reads to the primary once an authenticated write
+    succeeds, before the response reaches it
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        key = _pin_key(Request(scope))
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_pinned(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                await pin_to_primary(key)
+            await send(message)
+
+        await self.app(scope, receive, send_pinned)
+
+
+# Dependency for read-only routes; request.state.read_source tells the
+# response cache where the session reads from
+async def get_read_db(request: Request):
+    replica = None
+    if replicas.enabled:
+        if await is_pinned(request):
+            # Even with every replica down: cached bodies may predate its write
+            request.state.read_source = READ_PINNED
+        else:
+            replica = replicas.pick()
+    if replica is None:
+        async with open_session() as db:
+            yield db
+        return
+
+    request.state.read_source = READ_REPLICA
+    async with replica.session() as db:
+        yield db
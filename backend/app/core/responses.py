@@ -0,0 +1,120 @@
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Type
+
+import orjson
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel
+
+# UTC datetimes end in "Z", matching Pydantic's own JSON output
+JSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_SERIALIZE_NUMPY
+STREAM_CHUNK_SIZE = 200
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def dumps(content) -> bytes:
+    return orjson.dumps(content, option=JSON_OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    Default response class: same output as JSONResponse, encoded with orjson
+    """
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def schema_fields(model: Type[BaseModel]) -> Tuple[str, ...]:
+    return tuple(model.model_fields)
+
+
+def to_dicts(objects: Iterable, fields: Sequence[str]) -> List[dict]:
+    """
+    Map ORM rows straight to dicts with a response schema's fields, skipping
+    per-object Pydantic validation. Values must already be JSON-ready
+    (orjson handles UUID and datetime).
+    """
+    return [{field: getattr(obj, field, None) for field in fields} for obj in objects]
+
+
+def _chunks(objects: Sequence, fields: Sequence[str]) -> Iterator[List[dict]]:
+    for start in range(0, len(objects), STREAM_CHUNK_SIZE):
+        yield to_dicts(objects[start:start + STREAM_CHUNK_SIZE], fields)
+
+
+def encode_json_array(objects: Sequence, fields: Sequence[str], prefix: bytes = b"", suffix: bytes = b"") -> Iterator[bytes]:
+    """
+    prefix + JSON array + suffix, encoded a chunk at a time
+    """
+    yield prefix + b"["
+    for i, chunk in enumerate(_chunks(objects, fields)):
+        body = dumps(chunk)[1:-1]
+        yield body if i == 0 else b"," + body
+    yield b"]" + suffix
+
+
+def encode_ndjson(objects: Sequence, fields: Sequence[str]) -> Iterator[bytes]:
+    for chunk in _chunks(objects, fields):
+        yield b"".join(dumps(item) + b"\n" for item in chunk)
+
+
+def join_fragments(fragments: Sequence[bytes]) -> bytes:
+    """
+    JSON array of already-encoded objects
+    """
+    return b"[" + b",".join(fragments) + b"]"
+
+
+def _fragment_chunks(fragments: Sequence[bytes]) -> Iterator[bytes]:
+    yield b"["
+    for start in range(0, len(fragments), STREAM_CHUNK_SIZE):
+        body = b",".join(fragments[start:start + STREAM_CHUNK_SIZE])
+        yield body if start == 0 else b"," + body
+    yield b"]"
+
+
+def wants_ndjson(request: Request) -> bool:
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def list_response(request: Request, objects: Sequence, fields: Sequence[str], stream: bool = False) -> Response:
+    """
+    A JSON array of objects; NDJSON when the client accepts it, or a
+    chunk-encoded streaming array with stream=True
+    """
+    if wants_ndjson(request):
+        return StreamingResponse(encode_ndjson(objects, fields), media_type=NDJSON_MEDIA_TYPE)
+    if stream:
+        return StreamingResponse(encode_json_array(objects, fields), media_type="application/json")
+    return Response(content=dumps(to_dicts(objects, fields)), media_type="application/json")
+
+
+def fragments_response(request: Request, fragments: Sequence[bytes], stream: bool = False) -> Response:
+    """
+    list_response for objects that are already encoded
+    """
+    if wants_ndjson(request):
+        return Response(content=b"".join(f + b"\n" for f in fragments), media_type=NDJSON_MEDIA_TYPE)
+    if stream:
+        return StreamingResponse(_fragment_chunks(fragments), media_type="application/json")
+    return Response(content=join_fragments(fragments), media_type="application/json")
+
+
+def page_response(
+    request: Request, objects: Sequence, fields: Sequence[str], next_cursor: Optional[str], stream: bool = False
+) -> Response:
+    """
+    {"items": [...], "next_cursor": ...}; as NDJSON the cursor moves to the
+    X-Next-Cursor header
+    """
+    if wants_ndjson(request):
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+        return StreamingResponse(encode_ndjson(objects, fields), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+    if stream:
+        suffix = b',"next_cursor":' + dumps(next_cursor) + b"}"
+        return StreamingResponse(
+            encode_json_array(objects, fields, prefix=b'{"items":', suffix=suffix), media_type="application/json"
+        )
+    return Response(
+        content=dumps({"items": to_dicts(objects, fields), "next_cursor": next_cursor}),
+        media_type="application/json",
+    )
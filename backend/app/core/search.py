@@ -0,0 +1,104 @@
+import difflib
+import unicodedata
+from typing import List, Optional
+
+from sqlalchemy import func, literal_column, or_
+from sqlalchemy.orm import load_only, undefer
+
+from app.models.dog import Dog
+
+# Postgres: dogs.search_vector is a generated tsvector (see migrations/add_dogs_search.sql)
+SEARCH_CONFIG = "spanish"
+search_vector = literal_column("dogs.search_vector")
+
+
+def normalize(text: str) -> str:
+    """
+    Lowercase and strip accents so "Pastor Alemán" matches "pastor aleman"
+    """
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return " ".join("".join(c for c in decomposed if not unicodedata.combining(c)).split())
+
+
+def _postgres_terms(q: str):
+    q = normalize(q)
+    return (
+        q,
+        func.websearch_to_tsquery(SEARCH_CONFIG, q),
+        func.immutable_unaccent(func.lower(Dog.name)),
+        func.immutable_unaccent(func.lower(Dog.breed)),
+    )
+
+
+def postgres_match(q: str):
+    """
+    WHERE clause for dogs matching q (full-text or trigram)
+    """
+    q, ts_query, name, breed = _postgres_terms(q)
+    return or_(
+        search_vector.op("@@")(ts_query),
+        breed.op("%")(q),
+        name.op("%")(q),
+    )
+
+
+def postgres_search(query, q: str):
+    """
+    Add full-text + trigram matching and ranking to a select(Dog)
+    """
+    q, ts_query, name, breed = _postgres_terms(q)
+    rank = func.greatest(
+        func.ts_rank(search_vector, ts_query),
+        func.similarity(breed, q),
+        func.similarity(name, q),
+    )
+    return query.where(postgres_match(q)).order_by(rank.desc(), Dog.created_at.desc())
+
+
+def score(q: str, dog: Dog) -> float:
+    """
+    Python stand-in for the Postgres ranking: token matches plus fuzzy similarity
+    """
+    name, breed = normalize(dog.name), normalize(dog.breed)
+    words = set(f"{name} {breed} {normalize(dog.description or '')}".split())
+    tokens = q.split()
+    token_score = sum(any(word.startswith(token) for word in words) for token in tokens) / len(tokens)
+    fuzzy = max(
+        difflib.SequenceMatcher(None, q, breed).ratio(),
+        difflib.SequenceMatcher(None, q, name).ratio(),
+    )
+    return max(token_score, fuzzy)
+
+
+def rank_in_memory(dogs: List[Dog], q: str, limit: Optional[int], threshold: float = 0.6) -> List[Dog]:
+    q = normalize(q)
+    scored = [(score(q, dog), dog) for dog in dogs]
+    scored = [item for item in scored if item[0] >= threshold]
+    scored.sort(key=lambda item: (item[0], item[1].created_at), reverse=True)
+    return [dog for _, dog in scored[:limit]]
+
+
+async def search_dogs(db, query, q: str, limit: int) -> List[Dog]:
+    """
+    Ranked search over a filtered select(Dog); falls back to in-memory
+    ranking on databases without tsvector/pg_trgm (SQLite in tests)
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        result = await db.scalars(postgres_search(query, q).limit(limit))
+        return result.all()
+
+    # Projected views defer description; scoring must not lazy-load it per row
+    result = await db.scalars(query.options(undefer(Dog.name), undefer(Dog.breed), undefer(Dog.description)))
+    return rank_in_memory(result.all(), q, limit)
+
+
+async def search_condition(db, query, q: str):
+    """
+    WHERE clause for every dog of a filtered select(Dog) that search_dogs
+    would match for q, unranked and without its limit
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return postgres_match(q)
+
+    result = await db.scalars(query.options(load_only(Dog.id, Dog.name, Dog.breed, Dog.description)))
+    return Dog.id.in_([dog.id for dog in rank_in_memory(result.all(), q, None)])
@@ -1,15 +1,37 @@
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.metrics import AUTH_SECONDS, timed
 
 security = HTTPBearer()
 
-# Supabase client
-from supabase import create_client, Client
-supabase: Client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+# Supabase client (revocation checks, photo storage); created on first use
+_supabase = None
+_supabase_lock = threading.Lock()
+
+# Claims of tokens that already passed signature/exp/aud verification
+verified_tokens = TTLCache(maxsize=settings.AUTH_CACHE_MAX_SIZE, ttl=settings.AUTH_CACHE_TTL_SECONDS)
+
+
+def get_supabase():
+    """
+    Shared Supabase client. Importing and constructing it is slow, so it is
+    deferred until a request needs it instead of happening at import time.
+    """
+    global _supabase
+    if _supabase is None:
+        with _supabase_lock:
+            if _supabase is None:
+                from supabase import create_client
+                _supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+    return _supabase
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -23,32 +45,78 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    """
-    Verify JWT token and return user data from Supabase
-    """
-    token = credentials.credentials
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+
+def verify_token(token: str) -> dict:
+    """
+    Verify a Supabase access token locally (signature, exp, aud) and return its claims
+    """
+    claims = verified_tokens.get(token)
+    if claims is not None:
+        return claims
+
     try:
-        user = supabase.auth.get_user(token)
-        if user and user.user:
-            return user.user
-        raise credentials_exception
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"Supabase auth error: {type(e).__name__}: {str(e)}")
-        raise credentials_exception
+        claims = jwt.decode(
+            token,
+            settings.SUPABASE_JWT_SECRET,
+            algorithms=["HS256"],
+            audience=settings.SUPABASE_JWT_AUDIENCE,
+            options={"require_exp": True},
+        )
+    except JWTError as e:
+        print(f"JWT verification error: {type(e).__name__}: {str(e)}")
+        raise _credentials_exception()
+
+    if not claims.get("sub"):
+        raise _credentials_exception()
+
+    # Never keep a token cached past its own expiry
+    verified_tokens.set(token, claims, ttl=claims["exp"] - time.time())
+    return claims
+
+
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
+    """
+    Verify JWT token and return its claims
+    """
+    with timed(AUTH_SECONDS, method="local"):
+        return verify_token(credentials.credentials)
 
 
 async def get_current_user_id(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
     """
     Get current user ID from token
     """
-    user = await get_current_user(credentials)
-    return user.id
+    claims = await get_current_user(credentials)
+    return claims["sub"]
+
+
+async def get_current_user_id_verified(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
+    """
+    Get current user ID, also checking with Supabase that the session was not revoked.
+
+    Use for revocation-sensitive endpoints only; it costs a network round-trip.
+    """
+    user_id = await get_current_user_id(credentials)
+    if not settings.AUTH_REMOTE_REVOCATION_CHECK:
+        return user_id
+
+    try:
+        with timed(AUTH_SECONDS, method="remote"):
+            # get_supabase() inside the thread: the first call builds the client
+            user = await run_in_threadpool(lambda: get_supabase().auth.get_user(credentials.credentials))
+    except Exception as e:
+        print(f"Supabase auth error: {type(e).__name__}: {str(e)}")
+        verified_tokens.delete(credentials.credentials)
+        raise _credentials_exception()
+
+    if not user or not user.user or user.user.id != user_id:
+        verified_tokens.delete(credentials.credentials)
+        raise _credentials_exception()
+    return user_id
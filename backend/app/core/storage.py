@@ -0,0 +1,53 @@
+import os
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+
+class LocalStorage:
+    """
+    Stores files on the local filesystem, served by the app under MEDIA_URL
+    """
+
+    def __init__(self, root: str, base_url: str):
+        self.root = root
+        self.base_url = base_url.rstrip("/")
+
+    def _write(self, path: str, data: bytes):
+        full_path = os.path.join(self.root, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "wb") as f:
+            f.write(data)
+
+    async def save(self, path: str, data: bytes, content_type: str) -> str:
+        await run_in_threadpool(self._write, path, data)
+        return f"{self.base_url}/{path}"
+
+
+class SupabaseStorage:
+    """
+    Stores files in a public Supabase Storage bucket
+    """
+
+    def __init__(self, bucket: str):
+        self.bucket = bucket
+
+    def _upload(self, path: str, data: bytes, content_type: str) -> str:
+        from app.core.security import get_supabase
+
+        bucket = get_supabase().storage.from_(self.bucket)
+        bucket.upload(path, data, {"content-type": content_type, "cache-control": "31536000"})
+        return bucket.get_public_url(path)
+
+    async def save(self, path: str, data: bytes, content_type: str) -> str:
+        return await run_in_threadpool(self._upload, path, data, content_type)
+
+
+def build_storage():
+    if settings.PHOTO_STORAGE_BACKEND == "local":
+        return LocalStorage(settings.MEDIA_ROOT, settings.MEDIA_URL)
+    return SupabaseStorage(settings.PHOTO_STORAGE_BUCKET)
+
+
+storage = build_storage()
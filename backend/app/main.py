@@ -1,16 +1,48 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.staticfiles import StaticFiles
+import os
+from app.core.broadcast import broadcaster
+from app.core.compression import CompressionMiddleware
+from app.core.cache import response_cache
 from app.core.config import settings
-from app.core.database import Base, engine
+from app.core.database import dispose_engines, prewarm_pool
+from app.core.images import shutdown_executor
+from app.core import metrics
+from app.core.replicas import PinAfterWriteMiddleware, replicas
+from app.core.responses import ORJSONResponse
 from app.api.v1 import users, dogs
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+# Schema is managed by Alembic: alembic upgrade head (see start.sh).
+# Importing this module has no side effects: database connections, the
+# Supabase client and worker pools are created on first use or below.
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.PHOTO_STORAGE_BACKEND == "local":
+        os.makedirs(settings.MEDIA_ROOT, exist_ok=True)
+    if settings.DB_POOL_PREWARM > 0:
+        await prewarm_pool(settings.DB_POOL_PREWARM)
+    # Per worker: relay dog writes to/from the other processes
+    broadcaster.start()
+    replicas.start()
+    yield
+    await broadcaster.stop()
+    await replicas.stop()
+    await response_cache.backend.close()
+    shutdown_executor()
+    await dispose_engines()
+
 
 app = FastAPI(
     title="Pura Pata API",
     description="API for dog adoption platform in Costa Rica",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # CORS
@@ -22,10 +54,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip/Brotli; registered after CORS so it runs inside it
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+
+# Keeps a client's reads on the primary right after its writes
+if replicas.enabled:
+    app.add_middleware(PinAfterWriteMiddleware)
+
+# Outermost, so latency includes compression and CORS
+if settings.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+
 # Include routers
 app.include_router(users.router, prefix="/api/v1/users", tags=["users"])
 app.include_router(dogs.router, prefix="/api/v1/dogs", tags=["dogs"])
 
+# Photos stored on the local filesystem (PHOTO_STORAGE_BACKEND=local); MEDIA_ROOT is created in lifespan
+if settings.PHOTO_STORAGE_BACKEND == "local":
+    app.mount(settings.MEDIA_URL, StaticFiles(directory=settings.MEDIA_ROOT, check_dir=False), name="media")
+
 
 @app.get("/")
 def root():
@@ -36,6 +84,12 @@ def root():
     }
 
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    def get_metrics():
+        return Response(metrics.render(), media_type=metrics.CONTENT_TYPE_LATEST)
+
+
 @app.get("/health")
 def health_check():
     return {
@@ -1,13 +1,17 @@
-from sqlalchemy import Column, String, Integer, Float, Boolean, Text, DateTime, ForeignKey, ARRAY, CheckConstraint
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Integer, Float, Boolean, Text, DateTime, ForeignKey, ARRAY, CheckConstraint, Index, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
+from sqlalchemy import event
 from sqlalchemy.orm import relationship
 from app.core.database import Base
+from app.core.geo import geohash_encode
 import uuid
 
 
 class Dog(Base):
     __tablename__ = "dogs"
+    # Fetch server defaults (created_at, updated_at) with RETURNING instead of a refresh
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(100), nullable=False)
@@ -27,12 +31,16 @@ class Dog(Base):
     longitude = Column(Float, nullable=False)
     province = Column(String(50), nullable=True)
     canton = Column(String(50), nullable=True)
+    # Precomputed map cell (see _set_geohash); prefixes are the cluster cells
+    geohash = Column(String(12), nullable=True)
 
     contact_phone = Column(String(20), nullable=True)
     contact_email = Column(String(255), nullable=True)
     has_whatsapp = Column(Boolean, default=False)
 
     photos = Column(ARRAY(Text), nullable=False)
+    # Resized JPEG/WebP renditions of photos uploaded through the API
+    photo_variants = Column(JSONB, nullable=True)
 
     status = Column(String(20), default='disponible')  # disponible, reservado, adoptado
 
@@ -42,9 +50,61 @@ class Dog(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     adopted_at = Column(DateTime(timezone=True), nullable=True)
 
+    @property
+    def thumbnail_url(self):
+        """
+        Smallest WebP rendition of the first photo, or the photo itself
+        """
+        if not self.photos:
+            return None
+        for variant_set in self.photo_variants or []:
+            if variant_set["source"] == self.photos[0]:
+                webp = [v for v in variant_set["variants"] if v["format"] == "webp"]
+                if webp:
+                    return min(webp, key=lambda v: v["width"])["url"]
+        return self.photos[0]
+
     __table_args__ = (
         CheckConstraint(
             "status IN ('disponible', 'reservado', 'adoptado')",
             name='valid_status'
         ),
+        # Bounding box prefilter for GET /dogs/map (points and city-level clusters);
+        # /dogs/nearby is served from the in-memory geo index
+        Index('idx_dogs_status_lat_lng', 'status', 'latitude', 'longitude'),
+        # Keyset pagination on (created_at, id) for the feed and /dogs/me
+        Index('idx_dogs_created_at_id', created_at.desc(), id.desc()),
+        Index('idx_dogs_publisher_created_at_id', publisher_id, created_at.desc(), id.desc()),
+        # GET /dogs/changes scans (updated_at, id) > since in order
+        Index('idx_dogs_updated_at_id', updated_at, id),
+        # The public feed is status=disponible plus any mix of filters, newest first.
+        # Partial indexes stay small as adopted dogs accumulate; province and size are
+        # the selective filters, gender/vaccinated/sterilized are checked during the
+        # ordered scan (see benchmarks/explain_filters.py).
+        Index(
+            'idx_dogs_available_created_at', created_at.desc(), id.desc(),
+            postgresql_where=text("status = 'disponible'"), sqlite_where=text("status = 'disponible'"),
+        ),
+        Index(
+            'idx_dogs_available_province_created_at', province, created_at.desc(), id.desc(),
+            postgresql_where=text("status = 'disponible'"), sqlite_where=text("status = 'disponible'"),
+        ),
+        Index(
+            'idx_dogs_available_size_created_at', size, created_at.desc(), id.desc(),
+            postgresql_where=text("status = 'disponible'"), sqlite_where=text("status = 'disponible'"),
+        ),
+        # GET /dogs/map groups available dogs by geohash prefix inside a bbox
+        Index(
+            'idx_dogs_available_geohash', geohash, latitude, longitude,
+            postgresql_where=text("status = 'disponible'"), sqlite_where=text("status = 'disponible'"),
+        ),
     )
+
+
+@event.listens_for(Dog, "before_insert")
+@event.listens_for(Dog, "before_update")
+def _set_geohash(mapper, connection, dog):
+    if dog.latitude is not None and dog.longitude is not None:
+        geohash = geohash_encode(dog.latitude, dog.longitude)
+        if dog.geohash != geohash:
+            dog.geohash = geohash
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -13,3 +13,8 @@ class DogStatusHistory(Base):
     old_status = Column(String(20), nullable=True)
     new_status = Column(String(20), nullable=False)
     changed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # GET /dogs/{id}/history and the ON DELETE CASCADE lookup from dogs
+        Index('idx_dog_status_history_dog_changed_at', dog_id, changed_at.desc()),
+    )
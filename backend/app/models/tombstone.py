@@ -0,0 +1,19 @@
+from sqlalchemy import Column, DateTime, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class DogTombstone(Base):
+    """
+    Left behind by a deleted dog so GET /dogs/changes can report the delete
+    """
+    __tablename__ = "dog_tombstones"
+
+    dog_id = Column(UUID(as_uuid=True), primary_key=True)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        # Change feed scan (deleted_at, dog_id) > since, and retention pruning
+        Index('idx_dog_tombstones_deleted_at', deleted_at, dog_id),
+    )
@@ -7,6 +7,8 @@ import uuid
 
 class User(Base):
     __tablename__ = "users"
+    # Fetch server defaults (created_at, updated_at) with RETURNING instead of a refresh
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     email = Column(String(255), unique=True, nullable=False, index=True)
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Union
 from uuid import UUID
 
 
@@ -55,9 +55,22 @@ class DogStatusUpdate(BaseModel):
     status: str  # disponible, reservado, adoptado
 
 
+class PhotoVariant(BaseModel):
+    url: str
+    width: int
+    height: int
+    format: str  # jpg, webp
+
+
+class PhotoVariantSet(BaseModel):
+    source: str  # the entry in photos these variants were rendered from
+    variants: List[PhotoVariant]
+
+
 class DogResponse(DogBase):
     id: UUID
     photos: List[str]
+    photo_variants: Optional[List[PhotoVariantSet]] = None
     status: str
     publisher_id: UUID
     created_at: datetime
@@ -68,6 +81,131 @@ class DogResponse(DogBase):
         from_attributes = True
 
 
+class DogPage(BaseModel):
+    items: List[DogResponse]
+    next_cursor: Optional[str] = None
+
+
+class DogNearbyResponse(DogResponse):
+    distance_km: float
+
+
+class DogSummaryResponse(BaseModel):
+    """
+    Fields needed by the listing cards (view=summary)
+    """
+    id: UUID
+    name: str
+    age_years: int
+    age_months: int = 0
+    breed: str
+    size: str
+    gender: str
+    vaccinated: bool = False
+    sterilized: bool = False
+    dewormed: bool = False
+    latitude: float
+    longitude: float
+    province: Optional[str] = None
+    canton: Optional[str] = None
+    status: str
+    thumbnail_url: Optional[str] = None
+    created_at: datetime
+    distance_km: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+
+
+class DogMapResponse(BaseModel):
+    """
+    Fields needed by map markers (view=map)
+    """
+    id: UUID
+    name: str
+    breed: str
+    size: str
+    gender: str
+    latitude: float
+    longitude: float
+    status: str
+    distance_km: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+
+
+class DogSummaryPage(BaseModel):
+    items: List[DogSummaryResponse]
+    next_cursor: Optional[str] = None
+
+
+class DogMapPage(BaseModel):
+    items: List[DogMapResponse]
+    next_cursor: Optional[str] = None
+
+
+class MapCluster(BaseModel):
+    geohash: str
+    count: int
+    latitude: float
+    longitude: float
+
+
+class DogMapTile(BaseModel):
+    """
+    GET /dogs/map: clusters below MAP_POINTS_ZOOM, individual dogs at or above it
+    """
+    zoom: int
+    precision: Optional[int] = None
+    clusters: List[MapCluster] = []
+    points: List[DogMapResponse] = []
+
+
+class FacetCount(BaseModel):
+    value: Union[bool, str, None]
+    count: int
+
+
+class DogFacets(BaseModel):
+    """
+    Counts per filter value for GET /dogs/facets
+    """
+    total: int
+    size: List[FacetCount]
+    gender: List[FacetCount]
+    province: List[FacetCount]
+    vaccinated: List[FacetCount]
+    sterilized: List[FacetCount]
+    dewormed: List[FacetCount]
+
+
+class BulkRowError(BaseModel):
+    row: int  # 1-based position of the dog in the upload
+    errors: List[Dict[str, Any]]
+
+
+class BulkImportResult(BaseModel):
+    created: int
+    ids: List[UUID]
+    errors: List[BulkRowError] = []
+
+
+class DogChange(BaseModel):
+    id: UUID
+    change: str  # created, updated, status_changed, deleted
+    changed_at: datetime
+    status: Optional[str] = None  # None for deleted
+    # In the requested view; None for deletes and view=ids
+    dog: Optional[Union[DogResponse, DogSummaryResponse, DogMapResponse]] = None
+
+
+class DogChangeFeed(BaseModel):
+    changes: List[DogChange]
+    next_since: str
+    has_more: bool
+
+
 class StatusHistoryResponse(BaseModel):
     id: UUID
     dog_id: UUID
@@ -0,0 +1,99 @@
+"""
+Authenticated request throughput: remote Supabase check vs local JWT verification.
+
+Mints HS256 tokens with SUPABASE_JWT_SECRET and drives a minimal app whose
+only route depends on the auth dependency, so the numbers isolate auth cost.
+The remote (pre-change) path is only measured when a real Supabase access
+token is passed with --remote-token.
+
+    python -m benchmarks.auth_benchmark --requests 5000 --concurrency 50
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import jwt
+
+from app.core.config import settings
+from app.core.security import get_current_user_id, get_supabase, security, verified_tokens
+
+
+async def remote_user_id(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
+    # The pre-change dependency: a blocking Supabase call per request
+    user = get_supabase().auth.get_user(credentials.credentials)
+    if not user or not user.user:
+        raise HTTPException(status_code=401)
+    return user.user.id
+
+
+def build_app(dependency) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/whoami")
+    async def whoami(user_id: str = Depends(dependency)):
+        return {"id": user_id}
+
+    return app
+
+
+def mint_token(ttl_seconds: int = 3600) -> str:
+    return jwt.encode(
+        {
+            "sub": str(uuid.uuid4()),
+            "aud": settings.SUPABASE_JWT_AUDIENCE,
+            "role": "authenticated",
+            "exp": int(time.time()) + ttl_seconds,
+        },
+        settings.SUPABASE_JWT_SECRET,
+        algorithm="HS256",
+    )
+
+
+async def drive(app: FastAPI, tokens, total: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        counter = iter(range(total))
+
+        async def worker():
+            for i in counter:
+                token = tokens[i % len(tokens)]
+                response = await client.get("/whoami", headers={"Authorization": f"Bearer {token}"})
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return total / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--users", type=int, default=100, help="distinct tokens in rotation")
+    parser.add_argument("--remote-token", help="real Supabase access token to measure the remote path")
+    args = parser.parse_args()
+
+    local_app = build_app(get_current_user_id)
+
+    tokens = [mint_token() for _ in range(args.users)]
+    verified_tokens.clear()
+    verified_tokens.maxsize, original_maxsize = 0, verified_tokens.maxsize
+    uncached = asyncio.run(drive(local_app, tokens, args.requests, args.concurrency))
+    verified_tokens.maxsize = original_maxsize
+    cached = asyncio.run(drive(local_app, tokens, args.requests, args.concurrency))
+
+    print(f"{'path':>16} {'req/s':>10}")
+    if args.remote_token:
+        remote_requests = min(args.requests, 200)
+        remote = asyncio.run(drive(build_app(remote_user_id), [args.remote_token], remote_requests, args.concurrency))
+        print(f"{'remote':>16} {remote:>10.0f}")
+    print(f"{'local uncached':>16} {uncached:>10.0f}")
+    print(f"{'local cached':>16} {cached:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Cross-process cache coherence with the memory cache backend: starts two
+uvicorn processes (standing in for gunicorn workers, each with its own
+cache) on DATABASE_URL and checks that writes served by one invalidate
+cached responses on the other within --timeout seconds:
+
+    profile     PUT /users/me on A, then GET /dogs/recommended on B ranks
+                with the new location
+    status      PATCH /dogs/{id}/status on A, then GET /dogs on B drops the dog
+
+Needs Postgres (the processes talk over LISTEN/NOTIFY). Seeded rows are
+deleted afterwards. Exits 1 if a check fails.
+
+    python -m benchmarks.coherence_check
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.load_test import mint_token
+from benchmarks.startup_benchmark import free_port, wait_for
+
+API = "/api/v1"
+
+
+def start_worker(port: int) -> subprocess.Popen:
+    env = {**os.environ, "CACHE_BACKEND": "memory", "DOG_EVENTS_BROADCAST": "true"}
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"], env=env,
+    )
+
+
+def poll(fn, timeout: float) -> bool:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if fn():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def seed(db):
+    """
+    A publisher with one available dog; returns (publisher_id, dog row)
+    """
+    from sqlalchemy import insert
+
+    from app.models.dog import Dog
+    from app.models.user import User
+    from benchmarks.common import make_dog_rows, make_user_row
+
+    publisher = make_user_row()
+    dog = {**make_dog_rows(1, publisher["id"])[0], "status": "disponible"}
+    db.execute(insert(User), [publisher])
+    db.execute(insert(Dog), [dog])
+    db.commit()
+    return publisher["id"], dog
+
+
+def check_profile(a: httpx.Client, b: httpx.Client, headers, dog, timeout: float) -> bool:
+    a.post(f"{API}/users", json={"email": f"coherence-{time.time_ns()}@bench.example.com", "name": "Coherence"},
+           headers=headers).raise_for_status()
+
+    def recommended():
+        response = b.get(f"{API}/dogs/recommended", params={"view": "map"}, headers=headers)
+        response.raise_for_status()
+        return response.json()
+
+    # Cached on B without a location: no distances
+    before = recommended()
+    if any("distance_km" in item for item in before):
+        print("profile: unexpected distance_km before the update")
+        return False
+    a.put(f"{API}/users/me", json={"latitude": dog["latitude"], "longitude": dog["longitude"]},
+          headers=headers).raise_for_status()
+    return poll(lambda: any("distance_km" in item for item in recommended()), timeout)
+
+
+def check_status(a: httpx.Client, b: httpx.Client, headers, dog, timeout: float) -> bool:
+    dog_id = str(dog["id"])
+
+    def listed():
+        response = b.get(f"{API}/dogs", params={"status": "disponible", "view": "map", "limit": 100})
+        response.raise_for_status()
+        return any(item["id"] == dog_id for item in response.json()["items"])
+
+    if not listed():
+        print("status: seeded dog missing from GET /dogs")
+        return False
+    a.patch(f"{API}/dogs/{dog_id}/status", json={"status": "adoptado"}, headers=headers).raise_for_status()
+    return poll(lambda: not listed(), timeout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--timeout", type=float, default=5.0, help="Seconds allowed for a write to reach the other process")
+    args = parser.parse_args()
+
+    import uuid
+
+    from sqlalchemy import delete
+
+    from app.core.database import SessionLocal
+    from app.models.user import User
+
+    db = SessionLocal()
+    publisher_id, dog = seed(db)
+    user_id = str(uuid.uuid4())
+    ports = [free_port(), free_port()]
+    workers = [start_worker(port) for port in ports]
+    try:
+        started = time.perf_counter()
+        for port in ports:
+            wait_for(f"http://127.0.0.1:{port}/health", started, 30)
+        a, b = (httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=30) for port in ports)
+        results = {
+            "profile": check_profile(a, b, {"Authorization": f"Bearer {mint_token(user_id)}"}, dog, args.timeout),
+            "status": check_status(a, b, {"Authorization": f"Bearer {mint_token(str(publisher_id))}"}, dog, args.timeout),
+        }
+    finally:
+        for worker in workers:
+            worker.terminate()
+            worker.wait()
+        # The dog goes with its publisher (ON DELETE CASCADE)
+        db.execute(delete(User).where(User.id.in_([publisher_id, user_id])))
+        db.commit()
+        db.close()
+
+    for name, ok in results.items():
+        print(f"{name:<8} {'ok' if ok else 'STALE'}")
+    if not all(results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
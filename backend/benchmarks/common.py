@@ -0,0 +1,110 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Run benchmarks from the backend directory, e.g.:
+
+    python -m benchmarks.nearby_benchmark
+"""
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List
+
+from sqlalchemy import insert
+
+from app.models.dog import Dog
+from app.models.user import User
+
+# Rough bounding box of Costa Rica
+CR_MIN_LAT, CR_MAX_LAT = 8.03, 11.22
+CR_MIN_LON, CR_MAX_LON = -85.95, -82.55
+
+PROVINCES = ["San José", "Alajuela", "Cartago", "Heredia", "Guanacaste", "Puntarenas", "Limón"]
+SIZES = ["pequeño", "mediano", "grande"]
+GENDERS = ["macho", "hembra"]
+STATUSES = ["disponible"] * 8 + ["reservado", "adoptado"]
+BREEDS = ["Mestizo", "Labrador", "Pastor Alemán", "Chihuahua", "Poodle", "Zaguate", "Husky"]
+
+
+def random_point(rng: random.Random):
+    return rng.uniform(CR_MIN_LAT, CR_MAX_LAT), rng.uniform(CR_MIN_LON, CR_MAX_LON)
+
+
+def make_user_row() -> Dict:
+    user_id = uuid.uuid4()
+    return {
+        "id": user_id,
+        "email": f"bench-{user_id}@bench.example.com",
+        "name": "Benchmark",
+    }
+
+
+def make_dog_rows(n: int, publisher_id, seed: int = 42) -> List[Dict]:
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    rows = []
+    for i in range(n):
+        latitude, longitude = random_point(rng)
+        rows.append({
+            "id": uuid.uuid4(),
+            "name": f"Perro {i}",
+            "age_years": rng.randint(0, 14),
+            "age_months": rng.randint(0, 11),
+            "breed": rng.choice(BREEDS),
+            "size": rng.choice(SIZES),
+            "gender": rng.choice(GENDERS),
+            "description": "Perro muy juguetón y amigable",
+            "vaccinated": rng.random() < 0.6,
+            "sterilized": rng.random() < 0.4,
+            "dewormed": rng.random() < 0.7,
+            "latitude": latitude,
+            "longitude": longitude,
+            "province": rng.choice(PROVINCES),
+            "contact_phone": "8888-8888",
+            "has_whatsapp": rng.random() < 0.5,
+            "photos": ["https://images.unsplash.com/photo-1601758228041-f3b2795255f1?w=800"],
+            "status": rng.choice(STATUSES),
+            "publisher_id": publisher_id,
+            # Spread over a year so created_at ordering behaves like production
+            "created_at": now - timedelta(seconds=rng.randint(0, 365 * 24 * 3600)),
+        })
+    return rows
+
+
+def seed_dogs(db, n: int, seed: int = 42, batch_size: int = 5000):
+    """
+    Insert a synthetic publisher and n dogs. Does not commit.
+    """
+    user = make_user_row()
+    db.execute(insert(User), [user])
+    rows = make_dog_rows(n, user["id"], seed=seed)
+    for start in range(0, n, batch_size):
+        db.execute(insert(Dog), rows[start:start + batch_size])
+    db.flush()
+    return user["id"]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def time_calls(fn: Callable[[], object], iterations: int) -> Dict[str, float]:
+    """
+    Call fn repeatedly and return latency stats in milliseconds.
+    """
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "p50": percentile(samples, 50),
+        "p99": percentile(samples, 99),
+        "mean": statistics.fmean(samples),
+    }
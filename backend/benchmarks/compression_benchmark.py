@@ -0,0 +1,68 @@
+"""
+Bytes on the wire and CPU cost per request for list responses, per encoding:
+
+    identity    no compression
+    gzip-N      gzip at level N (COMPRESSION_GZIP_LEVEL for live responses)
+    br-N        Brotli at quality N (COMPRESSION_BROTLI_QUALITY for live responses)
+
+Cached responses are compressed once per entry (CACHED_GZIP_LEVEL /
+CACHED_BROTLI_QUALITY), so their CPU cost is paid once, not per request.
+The transfer column estimates download time on a slow mobile link.
+
+Uses transient Dog objects, no database needed.
+
+    python -m benchmarks.compression_benchmark --sizes 20 100 1000
+"""
+import argparse
+import gzip
+import time
+
+from app.api.v1.dogs import VIEW_FIELDS
+from app.core.compression import brotli
+from app.core.responses import dumps, to_dicts
+from benchmarks.common import percentile
+from benchmarks.serialization_benchmark import make_dogs
+
+LINK_KBPS = 1600  # ~3G downlink
+
+
+def encoders(gzip_levels, brotli_qualities):
+    result = {"identity": lambda body: body}
+    for level in gzip_levels:
+        result[f"gzip-{level}"] = lambda body, level=level: gzip.compress(body, compresslevel=level, mtime=0)
+    if brotli is not None:
+        for quality in brotli_qualities:
+            result[f"br-{quality}"] = lambda body, quality=quality: brotli.compress(body, quality=quality)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 100, 1000])
+    parser.add_argument("--view", choices=sorted(VIEW_FIELDS), default="full")
+    parser.add_argument("--gzip-levels", type=int, nargs="+", default=[1, 6, 9])
+    parser.add_argument("--brotli-qualities", type=int, nargs="+", default=[1, 5, 9, 11])
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    if brotli is None:
+        print("brotli is not installed; only gzip is measured")
+
+    print(f"{'dogs':>6} {'encoding':>9} {'bytes':>10} {'ratio':>6} {'p50 ms':>8} {'p99 ms':>8} {'transfer ms':>12}")
+    for size in args.sizes:
+        body = dumps(to_dicts(make_dogs(size), VIEW_FIELDS[args.view]))
+        for name, fn in encoders(args.gzip_levels, args.brotli_qualities).items():
+            samples = []
+            for _ in range(args.iterations):
+                start = time.perf_counter()
+                wire = fn(body)
+                samples.append((time.perf_counter() - start) * 1000)
+            transfer_ms = len(wire) * 8 / LINK_KBPS
+            print(
+                f"{size:>6} {name:>9} {len(wire):>10} {len(body) / len(wire):>6.1f} "
+                f"{percentile(samples, 50):>8.2f} {percentile(samples, 99):>8.2f} {transfer_ms:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
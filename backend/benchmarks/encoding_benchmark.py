@@ -0,0 +1,89 @@
+"""
+CPU time and peak memory to encode a list of dogs, per encoder:
+
+    fastapi     response_model validation + jsonable_encoder + json.dumps (the old default)
+    pydantic    TypeAdapter validation + dump_json
+    orjson      direct row-to-dict mapping + orjson (what list endpoints use now)
+    streamed    orjson in 200-dog chunks, as ?stream=true sends it
+
+Uses transient Dog objects, no database needed.
+
+    python -m benchmarks.encoding_benchmark --sizes 100 1000 10000
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.api.v1.dogs import VIEW_FIELDS
+from app.core.responses import dumps, encode_json_array, to_dicts
+from app.schemas.dog import DogResponse
+from benchmarks.common import percentile
+from benchmarks.serialization_benchmark import make_dogs
+
+adapter = TypeAdapter(List[DogResponse])
+FIELDS = VIEW_FIELDS["full"]
+
+
+def encode_fastapi(dogs) -> int:
+    content = jsonable_encoder(adapter.validate_python(dogs, from_attributes=True))
+    return len(json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode())
+
+
+def encode_pydantic(dogs) -> int:
+    return len(adapter.dump_json(adapter.validate_python(dogs, from_attributes=True)))
+
+
+def encode_orjson(dogs) -> int:
+    return len(dumps(to_dicts(dogs, FIELDS)))
+
+
+def encode_streamed(dogs) -> int:
+    # Each chunk is handed to the server and dropped, as StreamingResponse does
+    return sum(len(chunk) for chunk in encode_json_array(dogs, FIELDS))
+
+
+ENCODERS = {
+    "fastapi": encode_fastapi,
+    "pydantic": encode_pydantic,
+    "orjson": encode_orjson,
+    "streamed": encode_streamed,
+}
+
+
+def peak_kib(fn, dogs) -> float:
+    tracemalloc.start()
+    try:
+        fn(dogs)
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'dogs':>6} {'encoder':>9} {'bytes':>10} {'p50 ms':>9} {'p99 ms':>9} {'peak KiB':>10}")
+    for size in args.sizes:
+        dogs = make_dogs(size)
+        for name, fn in ENCODERS.items():
+            samples = []
+            for _ in range(args.iterations):
+                start = time.perf_counter()
+                size_bytes = fn(dogs)
+                samples.append((time.perf_counter() - start) * 1000)
+            print(
+                f"{size:>6} {name:>9} {size_bytes:>10} {percentile(samples, 50):>9.2f} "
+                f"{percentile(samples, 99):>9.2f} {peak_kib(fn, dogs):>10.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
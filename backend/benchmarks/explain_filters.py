@@ -0,0 +1,128 @@
+"""
+EXPLAIN ANALYZE plans and timings for each GET /dogs filter combination.
+
+Seeds synthetic dogs (and one status history row per dog) into the database
+at DATABASE_URL inside a transaction that is rolled back at the end. Run it
+before and after `alembic upgrade head` to compare plans.
+
+    python -m benchmarks.explain_filters --size 100000
+    python -m benchmarks.explain_filters --size 100000 --plans
+
+SQLite URLs run through benchmarks.sqlite_standin; there only EXPLAIN QUERY
+PLAN is available, and timings are still measured.
+"""
+import argparse
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import insert, select, text
+
+from app.api.v1.dogs import filter_dogs
+from app.core.database import SessionLocal, engine
+from app.models.dog import Dog
+from app.models.status_history import DogStatusHistory
+from benchmarks.common import seed_dogs, time_calls
+
+PAGE_SIZE = 20
+
+COMBINATIONS = [
+    {},
+    {"status": "disponible"},
+    {"status": "disponible", "province": "Heredia"},
+    {"status": "disponible", "size": "pequeño"},
+    {"status": "disponible", "gender": "hembra"},
+    {"status": "disponible", "size": "grande", "gender": "macho"},
+    {"status": "disponible", "vaccinated": True, "sterilized": True},
+    {"status": "disponible", "province": "Limón", "size": "mediano", "vaccinated": True},
+    {"status": "adoptado"},
+    {"status": "reservado", "province": "Cartago"},
+]
+
+
+def feed_query(filters):
+    """
+    First page of GET /dogs, as paginate() issues it
+    """
+    return (
+        filter_dogs(select(Dog), **filters)
+        .order_by(Dog.created_at.desc(), Dog.id.desc())
+        .limit(PAGE_SIZE + 1)
+    )
+
+
+def history_query(dog_id):
+    return (
+        select(DogStatusHistory)
+        .where(DogStatusHistory.dog_id == dog_id)
+        .order_by(DogStatusHistory.changed_at.desc())
+    )
+
+
+def explain(db, stmt):
+    sql = str(stmt.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    if engine.dialect.name == "postgresql":
+        rows = db.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}")).all()
+        return [row[0] for row in rows]
+    rows = db.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+    return [row[-1] for row in rows]
+
+
+def execution_ms(plan):
+    for line in plan:
+        if line.startswith("Execution Time:"):
+            return float(line.split()[2])
+    return None
+
+
+def seed_history(db, size):
+    dog_ids = db.scalars(select(Dog.id).limit(size)).all()
+    now = datetime.now(timezone.utc)
+    db.execute(insert(DogStatusHistory), [
+        {"id": uuid.uuid4(), "dog_id": dog_id, "old_status": None, "new_status": "disponible", "changed_at": now}
+        for dog_id in dog_ids
+    ])
+    return dog_ids
+
+
+def label(filters):
+    return ", ".join(f"{k}={v}" for k, v in filters.items()) or "(no filters)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--plans", action="store_true", help="print the full plan for every query")
+    args = parser.parse_args()
+
+    if engine.dialect.name == "sqlite":
+        from benchmarks import sqlite_standin
+        sqlite_standin.install(engine)
+
+    db = SessionLocal()
+    try:
+        seed_dogs(db, args.size)
+        dog_ids = seed_history(db, args.size)
+        db.execute(text("ANALYZE dogs"))
+        db.execute(text("ANALYZE dog_status_history"))
+
+        queries = [(label(filters), feed_query(filters)) for filters in COMBINATIONS]
+        queries.append(("history by dog_id", history_query(dog_ids[len(dog_ids) // 2])))
+
+        print(f"{args.size} dogs, page size {PAGE_SIZE}\n")
+        print(f"{'query':<66} {'explain ms':>10} {'p50 ms':>8} {'p99 ms':>8}  top plan node")
+        for name, stmt in queries:
+            plan = explain(db, stmt)
+            stats = time_calls(lambda: db.execute(stmt).all(), args.iterations)
+            analyzed = execution_ms(plan)
+            analyzed = f"{analyzed:.2f}" if analyzed is not None else "-"
+            print(f"{name:<66} {analyzed:>10} {stats['p50']:>8.2f} {stats['p99']:>8.2f}  {plan[0].strip()}")
+            if args.plans:
+                print("\n".join(f"    {line}" for line in plan) + "\n")
+    finally:
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
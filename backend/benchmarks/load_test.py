@@ -0,0 +1,344 @@
+"""
+Scripted load test of the full API: throughput and p50/p95/p99 per endpoint.
+
+Seeds synthetic users, dogs (Costa Rica coordinates) and status history, then
+runs --concurrency virtual users, each picking weighted scenarios:
+
+    feed       GET /dogs, sometimes with a filter and a second page
+    nearby     GET /dogs/nearby around a random point
+    detail     GET /dogs/{id}, sometimes its /history
+    publish    POST /dogs
+    status     PATCH /dogs/{id}/status on one of the user's dogs
+    me         GET /users/me
+
+Requests go through the app in-process (httpx ASGITransport), or to a running
+server with --base-url. Auth tokens are minted locally with
+SUPABASE_JWT_SECRET and the Supabase revocation check is bypassed, so no
+network calls are made.
+
+    # Postgres, schema from `alembic upgrade head`; seeded rows are deleted afterwards
+    python -m benchmarks.load_test --dogs 10000 --requests 5000 --concurrency 20
+
+    # SQLite stand-in, no Postgres needed
+    python -m benchmarks.load_test --sqlite /tmp/purapata-load.db
+
+    # Save results, or fail when p95 regresses more than 20% against a saved run
+    python -m benchmarks.load_test --output before.json
+    python -m benchmarks.load_test --baseline before.json --tolerance 0.2
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+# A subdomain of example.com: valid for EmailStr (unlike .test) and specific
+# enough that delete_seeded only removes seeded users
+SEED_EMAIL_DOMAIN = "load-test.example.com"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dogs", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000, help="Total requests across all virtual users")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--mix", default="feed=35,nearby=20,detail=25,publish=5,status=10,me=5",
+                        help="Scenario weights")
+    parser.add_argument("--base-url", help="Drive a running server instead of the in-process app")
+    parser.add_argument("--sqlite", metavar="PATH", help="Run against a fresh SQLite file instead of DATABASE_URL")
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded rows")
+    parser.add_argument("--output", help="Write results as JSON")
+    parser.add_argument("--baseline", help="JSON from a previous --output run to compare p95 against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed p95 regression vs --baseline")
+    return parser.parse_args()
+
+
+def configure_sqlite(path: str):
+    # Settings are read at import time, so this has to run before importing app
+    if os.path.exists(path):
+        os.remove(path)
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.abspath(path)}"
+    os.environ.setdefault("SUPABASE_URL", "http://localhost")
+    os.environ.setdefault("SUPABASE_KEY", "load.test.key")
+    os.environ.setdefault("SUPABASE_JWT_SECRET", uuid.uuid4().hex)
+    os.environ.setdefault("SECRET_KEY", uuid.uuid4().hex)
+
+
+# --- Seeding ----------------------------------------------------------------
+
+def seed(db, n_users: int, n_dogs: int, seed_value: int) -> Dict[str, List]:
+    """
+    Insert users, their dogs and status history; returns {user_id: [dog ids]}
+    """
+    from sqlalchemy import insert
+
+    from app.core.geo import geohash_encode
+    from app.models.dog import Dog
+    from app.models.status_history import DogStatusHistory
+    from app.models.user import User
+    from benchmarks.common import make_dog_rows, random_point
+
+    rng = random.Random(seed_value)
+    users, dogs, history = [], [], []
+    owned: Dict[str, List] = {}
+    per_user = max(1, n_dogs // n_users)
+    for i in range(n_users):
+        user_id = uuid.uuid4()
+        latitude, longitude = random_point(rng)
+        users.append({
+            "id": user_id,
+            "email": f"load-{user_id}@{SEED_EMAIL_DOMAIN}",
+            "name": f"Usuario {i}",
+            "latitude": latitude,
+            "longitude": longitude,
+        })
+        rows = make_dog_rows(per_user, user_id, seed=seed_value + i)
+        owned[str(user_id)] = [row["id"] for row in rows]
+        dogs.extend(rows)
+        for row in rows:
+            # Core inserts skip the ORM listener that fills geohash
+            row["geohash"] = geohash_encode(row["latitude"], row["longitude"])
+            history.append({"id": uuid.uuid4(), "dog_id": row["id"], "old_status": None,
+                            "new_status": "disponible", "changed_at": row["created_at"]})
+            if row["status"] != "disponible":
+                history.append({"id": uuid.uuid4(), "dog_id": row["id"], "old_status": "disponible",
+                                "new_status": row["status"], "changed_at": row["created_at"]})
+
+    db.execute(insert(User), users)
+    for table, rows in ((Dog, dogs), (DogStatusHistory, history)):
+        for start in range(0, len(rows), 5000):
+            db.execute(insert(table), rows[start:start + 5000])
+    db.commit()
+    return owned
+
+
+def delete_seeded(db):
+    from sqlalchemy import delete
+
+    from app.models.user import User
+
+    # Dogs and their history go with their publisher (ON DELETE CASCADE)
+    db.execute(delete(User).where(User.email.like(f"%@{SEED_EMAIL_DOMAIN}")))
+    db.commit()
+
+
+def mint_token(user_id: str) -> str:
+    from jose import jwt
+
+    from app.core.config import settings
+
+    return jwt.encode(
+        {"sub": user_id, "aud": settings.SUPABASE_JWT_AUDIENCE, "role": "authenticated",
+         "exp": int(time.time()) + 3600},
+        settings.SUPABASE_JWT_SECRET,
+        algorithm="HS256",
+    )
+
+
+# --- Scenarios --------------------------------------------------------------
+
+API = "/api/v1"
+STATUSES = ["disponible", "reservado", "adoptado"]
+
+
+class Recorder:
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.count = 0
+
+    async def call(self, client, label: str, method: str, url: str, **kwargs):
+        self.count += 1
+        start = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        self.samples[label].append((time.perf_counter() - start) * 1000)
+        if response.status_code >= 400:
+            self.errors[label] += 1
+        return response
+
+
+class VirtualUser:
+    def __init__(self, user_id: str, token: str, dog_ids: List, all_dog_ids: List, rng: random.Random):
+        self.user_id = user_id
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.dog_ids = [str(dog_id) for dog_id in dog_ids]
+        self.all_dog_ids = all_dog_ids
+        self.rng = rng
+
+    async def feed(self, client, recorder: Recorder):
+        from benchmarks.common import PROVINCES, SIZES
+
+        # The listing page always asks for available dogs
+        params = {"status": "disponible", "limit": 20, "view": "summary"}
+        choice = self.rng.random()
+        if choice < 0.3:
+            params["province"] = self.rng.choice(PROVINCES)
+        elif choice < 0.5:
+            params["size"] = self.rng.choice(SIZES)
+        response = await recorder.call(client, "GET /dogs", "GET", f"{API}/dogs", params=params)
+        next_cursor = response.json().get("next_cursor") if response.status_code == 200 else None
+        if next_cursor and self.rng.random() < 0.3:
+            await recorder.call(client, "GET /dogs", "GET", f"{API}/dogs",
+                                params={**params, "cursor": next_cursor})
+
+    async def nearby(self, client, recorder: Recorder):
+        from benchmarks.common import random_point
+
+        latitude, longitude = random_point(self.rng)
+        params = {"latitude": latitude, "longitude": longitude, "radius": 25, "limit": 50}
+        await recorder.call(client, "GET /dogs/nearby", "GET", f"{API}/dogs/nearby", params=params)
+
+    async def detail(self, client, recorder: Recorder):
+        dog_id = self.rng.choice(self.all_dog_ids)
+        await recorder.call(client, "GET /dogs/{id}", "GET", f"{API}/dogs/{dog_id}")
+        if self.rng.random() < 0.3:
+            await recorder.call(client, "GET /dogs/{id}/history", "GET", f"{API}/dogs/{dog_id}/history")
+
+    async def publish(self, client, recorder: Recorder):
+        from benchmarks.common import BREEDS, GENDERS, PROVINCES, SIZES, random_point
+
+        latitude, longitude = random_point(self.rng)
+        body = {
+            "name": "Perro nuevo",
+            "age_years": self.rng.randint(0, 14),
+            "breed": self.rng.choice(BREEDS),
+            "size": self.rng.choice(SIZES),
+            "gender": self.rng.choice(GENDERS),
+            "latitude": latitude,
+            "longitude": longitude,
+            "province": self.rng.choice(PROVINCES),
+            "photos": ["https://images.unsplash.com/photo-1601758228041-f3b2795255f1?w=800"],
+        }
+        response = await recorder.call(client, "POST /dogs", "POST", f"{API}/dogs", json=body, headers=self.headers)
+        if response.status_code == 201:
+            self.dog_ids.append(response.json()["id"])
+
+    async def status(self, client, recorder: Recorder):
+        if not self.dog_ids:
+            return await self.publish(client, recorder)
+        dog_id = self.rng.choice(self.dog_ids)
+        await recorder.call(client, "PATCH /dogs/{id}/status", "PATCH", f"{API}/dogs/{dog_id}/status",
+                            json={"status": self.rng.choice(STATUSES)}, headers=self.headers)
+
+    async def me(self, client, recorder: Recorder):
+        await recorder.call(client, "GET /users/me", "GET", f"{API}/users/me", headers=self.headers)
+
+
+async def run_load(app, base_url: Optional[str], owned: Dict[str, List], args) -> Dict:
+    import httpx
+
+    weights = {name: float(weight) for name, weight in (part.split("=") for part in args.mix.split(","))}
+    names = list(weights)
+    all_dog_ids = [str(dog_id) for dog_ids in owned.values() for dog_id in dog_ids]
+    user_ids = list(owned)
+
+    recorder = Recorder()
+    if base_url:
+        transport, base_url = None, base_url
+    else:
+        transport, base_url = httpx.ASGITransport(app=app), "http://load-test"
+
+    async def virtual_user(index: int, client):
+        rng = random.Random(args.seed * 1000 + index)
+        user_id = user_ids[index % len(user_ids)]
+        user = VirtualUser(user_id, mint_token(user_id), owned[user_id], all_dog_ids, rng)
+        while recorder.count < args.requests:
+            scenario = rng.choices(names, weights=[weights[name] for name in names])[0]
+            await getattr(user, scenario)(client, recorder)
+
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=60) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(virtual_user(i, client) for i in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+
+    from benchmarks.common import percentile
+
+    endpoints = {}
+    for label, samples in sorted(recorder.samples.items()):
+        endpoints[label] = {
+            "requests": len(samples),
+            "errors": recorder.errors[label],
+            "rps": len(samples) / elapsed,
+            "p50": percentile(samples, 50),
+            "p95": percentile(samples, 95),
+            "p99": percentile(samples, 99),
+        }
+    total = sum(len(samples) for samples in recorder.samples.values())
+    return {"elapsed_s": elapsed, "rps": total / elapsed, "endpoints": endpoints}
+
+
+def report(results: Dict):
+    print(f"{'endpoint':<26} {'requests':>8} {'errors':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for label, stats in results["endpoints"].items():
+        print(
+            f"{label:<26} {stats['requests']:>8} {stats['errors']:>6} {stats['rps']:>8.1f} "
+            f"{stats['p50']:>8.2f} {stats['p95']:>8.2f} {stats['p99']:>8.2f}"
+        )
+    print(f"total {results['rps']:.1f} req/s over {results['elapsed_s']:.1f} s")
+
+
+def regressions(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    found = []
+    for label, stats in results["endpoints"].items():
+        before = baseline["endpoints"].get(label)
+        if before and before["p95"] > 0 and stats["p95"] > before["p95"] * (1 + tolerance):
+            found.append(f"{label}: p95 {before['p95']:.2f} ms -> {stats['p95']:.2f} ms")
+    return found
+
+
+def main():
+    args = parse_args()
+    if args.sqlite:
+        configure_sqlite(args.sqlite)
+
+    from sqlalchemy import text
+
+    from app.core.database import SessionLocal, engine
+    from app.core.security import get_current_user_id, get_current_user_id_verified
+    from app.main import app
+
+    if args.sqlite:
+        from benchmarks import sqlite_standin
+        sqlite_standin.install(engine)
+
+    # Local JWT verification only: skip the Supabase revocation round-trip
+    app.dependency_overrides[get_current_user_id_verified] = get_current_user_id
+
+    db = SessionLocal()
+    try:
+        owned = seed(db, args.users, args.dogs, args.seed)
+        db.execute(text("ANALYZE"))
+        db.commit()
+
+        async def run():
+            async with app.router.lifespan_context(app):
+                return await run_load(app, args.base_url, owned, args)
+
+        results = asyncio.run(run())
+    finally:
+        if not args.keep and not args.sqlite:
+            delete_seeded(db)
+        db.close()
+
+    report(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            found = regressions(results, json.load(f), args.tolerance)
+        for line in found:
+            print(f"REGRESSION {line}")
+        if found:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
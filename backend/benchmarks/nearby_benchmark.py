@@ -0,0 +1,103 @@
+"""
+Latency of /dogs/nearby: full scan + Python haversine vs the current indexed path.
+
+Seeds synthetic dogs into the database at DATABASE_URL and deletes them at
+the end. The seed is committed: the route loads the geo index through its
+own session, which would not see an uncommitted one. SQLite URLs run
+through benchmarks.sqlite_standin.
+
+    python -m benchmarks.nearby_benchmark --sizes 1000 10000 100000
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from sqlalchemy import delete, text
+from starlette.requests import Request
+
+from app.api.v1.dogs import ensure_loaded_from_primary, get_nearby_dogs
+from app.core.database import SessionLocal, SyncSessionAdapter, engine
+from app.core.geo import calculate_distance
+from app.core.geo_index import geo_index
+from app.core.read_model import available_dogs
+from app.models.dog import Dog
+from app.models.user import User
+from benchmarks.common import random_point, seed_dogs, time_calls
+
+
+def legacy_nearby(db, latitude, longitude, radius):
+    dogs = db.query(Dog).filter(Dog.status == 'disponible').all()
+    return [
+        dog for dog in dogs
+        if calculate_distance(latitude, longitude, dog.latitude, dog.longitude) <= radius
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--radius", type=int, default=25)
+    args = parser.parse_args()
+
+    if engine.dialect.name == "sqlite":
+        from benchmarks import sqlite_standin
+        sqlite_standin.install(engine)
+
+    rng = random.Random(7)
+    loop = asyncio.new_event_loop()
+    print(f"{'dogs':>8} {'method':>8} {'p50 ms':>10} {'p99 ms':>10} {'results':>8}")
+    for size in args.sizes:
+        db = SessionLocal()
+        publisher_id = seed_dogs(db, size)
+        db.commit()
+        try:
+            db.execute(text("ANALYZE dogs"))
+            db.commit()
+            # Bulk inserts emit no dog events
+            geo_index.invalidate()
+            available_dogs.invalidate()
+            points = [random_point(rng) for _ in range(args.iterations)]
+
+            def run(fn):
+                it = iter(points * 2)
+                return time_calls(lambda: fn(*next(it)), args.iterations)
+
+            adapter = SyncSessionAdapter(db)
+            request = Request({"type": "http", "headers": []})
+
+            def legacy(lat, lon):
+                return len(legacy_nearby(db, lat, lon, args.radius))
+
+            def indexed(lat, lon):
+                response = loop.run_until_complete(get_nearby_dogs(
+                    request=request, latitude=lat, longitude=lon, radius=args.radius, limit=100, view="full",
+                    stream=False, db=adapter,
+                ))
+                return len(json.loads(response.body))
+
+            def report(name, fn):
+                stats = run(fn)
+                # Mean result count, so an empty index shows up instead of looking fast
+                results = sum(fn(*point) for point in points[:10]) / 10
+                print(f"{size:>8} {name:>8} {stats['p50']:>10.2f} {stats['p99']:>10.2f} {results:>8.1f}")
+
+            report("legacy", legacy)
+            # The first request loads the geo index and read model; time that apart,
+            # right before the indexed run so no refresh falls inside it
+            started = time.perf_counter()
+            loop.run_until_complete(ensure_loaded_from_primary(geo_index, available_dogs))
+            print(f"{size:>8} {'load':>8} {(time.perf_counter() - started) * 1000:>10.2f}")
+            report("indexed", indexed)
+        finally:
+            db.rollback()
+            # The dogs go with their publisher (ON DELETE CASCADE)
+            db.execute(delete(User).where(User.id == publisher_id))
+            db.commit()
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
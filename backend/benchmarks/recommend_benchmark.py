@@ -0,0 +1,102 @@
+"""
+Ranking latency of GET /dogs/recommended at large catalogue sizes: the
+vectorized GeoIndex scoring vs scoring every available dog in a Python loop.
+
+Runs in memory on synthetic dogs (no database needed beyond the settings):
+
+    python -m benchmarks.recommend_benchmark --sizes 10000 100000 1000000
+"""
+import argparse
+import math
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.core.geo import calculate_distance
+from app.core.geo_index import GeoIndex
+from app.core.recommend import (
+    CANTON_MATCH, DISTANCE_WEIGHT, PROVINCE_MATCH, RECENCY_WEIGHT, REGION_WEIGHT, SECONDS_PER_DAY, Profile,
+    recommend,
+)
+from benchmarks.common import PROVINCES, random_point, time_calls
+
+CANTONS = [f"Cantón {i}" for i in range(12)]
+
+
+def synthetic_rows(rng: random.Random, size: int):
+    now = datetime.now(timezone.utc)
+    publishers = [uuid.uuid4() for _ in range(max(size // 20, 1))]
+    rows = []
+    for _ in range(size):
+        latitude, longitude = random_point(rng)
+        created_at = now - timedelta(days=rng.uniform(0, 365))
+        rows.append((
+            uuid.uuid4(), latitude, longitude, created_at, rng.choice(PROVINCES), rng.choice(CANTONS), rng.choice(publishers),
+        ))
+    return rows
+
+
+def loop_recommend(rows, profile: Profile, limit: int, user_id: uuid.UUID):
+    now = time.time()
+    scored = []
+    for dog_id, latitude, longitude, created_at, province, canton, publisher_id in rows:
+        if publisher_id == user_id:
+            continue
+        distance = calculate_distance(profile.latitude, profile.longitude, latitude, longitude)
+        if distance > settings.RECOMMEND_RADIUS_KM:
+            continue
+        age_days = (now - created_at.timestamp()) / SECONDS_PER_DAY
+        region = 0.0
+        if province == profile.province:
+            region = CANTON_MATCH if canton == profile.canton else PROVINCE_MATCH
+        score = (
+            DISTANCE_WEIGHT * math.exp(-distance / settings.RECOMMEND_DISTANCE_SCALE_KM)
+            + RECENCY_WEIGHT * math.exp(-age_days / settings.RECOMMEND_RECENCY_DAYS)
+            + REGION_WEIGHT * region
+        )
+        scored.append((score, dog_id, distance))
+    scored.sort(key=lambda entry: entry[0], reverse=True)
+    return [(dog_id, distance) for _, dog_id, distance in scored[:limit]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--skip-loop-above", type=int, default=200000,
+                        help="Skip the Python loop baseline for larger catalogues")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    print(f"{'dogs':>8} {'method':>10} {'p50 ms':>10} {'p99 ms':>10}")
+    for size in args.sizes:
+        rows = synthetic_rows(rng, size)
+        index = GeoIndex(refresh_seconds=3600)
+        index.load(rows)
+        profiles = [
+            Profile(*random_point(rng), rng.choice(PROVINCES), rng.choice(CANTONS))
+            for _ in range(args.iterations)
+        ]
+
+        def run(fn):
+            it = iter(profiles * 2)
+            return time_calls(lambda: fn(next(it)), args.iterations)
+
+        # Ranked for a user with listings of their own, which are left out
+        user_id = rows[0][6]
+        results = [("vectorized", run(lambda profile: recommend(index, profile, args.limit, user_id)))]
+        without_location = run(
+            lambda profile: recommend(index, profile._replace(latitude=None, longitude=None), args.limit, user_id)
+        )
+        results.append(("no-loc", without_location))
+        if size <= args.skip_loop_above:
+            results.append(("loop", run(lambda profile: loop_recommend(rows, profile, args.limit, user_id))))
+        for name, stats in results:
+            print(f"{size:>8} {name:>10} {stats['p50']:>10.2f} {stats['p99']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Payload size and serialization time per 1,000 dogs for each list view.
+
+Builds transient Dog objects (no database needed) with realistic text and
+photo lists, then encodes them the way GET /dogs does.
+
+    python -m benchmarks.serialization_benchmark --dogs 1000
+"""
+import argparse
+import time
+import uuid
+from datetime import datetime, timezone
+
+from app.api.v1.dogs import VIEW_FIELDS
+from app.core.responses import dumps, to_dicts
+from app.models.dog import Dog
+from benchmarks.common import make_dog_rows, percentile
+
+DESCRIPTION = (
+    "Perro muy juguetón y amigable, rescatado de la calle hace unos meses. "
+    "Se lleva bien con otros perros y con niños, ya sabe hacer sus necesidades afuera."
+)
+PHOTOS = [f"https://example.supabase.co/storage/v1/object/public/dog-photos/dogs/{i}.jpg" for i in range(4)]
+
+
+def make_dogs(n: int):
+    now = datetime.now(timezone.utc)
+    dogs = []
+    for row in make_dog_rows(n, uuid.uuid4()):
+        row.update(
+            description=DESCRIPTION,
+            special_needs="Necesita medicación para la piel",
+            contact_email="refugio@example.com",
+            photos=PHOTOS,
+            created_at=now,
+            updated_at=now,
+        )
+        dogs.append(Dog(**row))
+    return dogs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dogs", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    dogs = make_dogs(args.dogs)
+    print(f"{'view':>8} {'bytes':>10} {'p50 ms':>10} {'p99 ms':>10}")
+    for view, fields in VIEW_FIELDS.items():
+        samples = []
+        for _ in range(args.iterations):
+            start = time.perf_counter()
+            body = dumps({"items": to_dicts(dogs, fields), "next_cursor": None})
+            samples.append((time.perf_counter() - start) * 1000)
+        print(f"{view:>8} {len(body):>10} {percentile(samples, 50):>10.2f} {percentile(samples, 99):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+Run the app on SQLite when no Postgres is available.
+
+Adapts the Postgres-only column types (ARRAY, JSONB) to JSON and lets UUID
+columns take the string ids the routes pass. Postgres-only paths (full-text
+search, GROUPING SETS facets) fall back as they do in any non-Postgres
+deployment, so numbers are only comparable run to run on the same backend.
+
+Call install() before anything creates the engine's tables or runs a query.
+"""
+import uuid
+
+from sqlalchemy import JSON
+from sqlalchemy.sql import sqltypes
+
+
+def _uuid_bind_processor(original):
+    def bind_processor(self, dialect):
+        process = original(self, dialect)
+        if process is None:
+            return None
+        return lambda value: process(uuid.UUID(value) if isinstance(value, str) else value)
+    return bind_processor
+
+
+def install(engine):
+    from app.core.database import Base
+    from app.models.dog import Dog
+    # Register every table on Base.metadata before create_all
+    from app.models import status_history, tombstone, user  # noqa: F401
+
+    Dog.__table__.c.photos.type = JSON()
+    Dog.__table__.c.photo_variants.type = JSON()
+    sqltypes.Uuid.bind_processor = _uuid_bind_processor(sqltypes.Uuid.bind_processor)
+    Base.metadata.create_all(bind=engine)
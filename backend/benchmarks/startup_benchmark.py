@@ -0,0 +1,111 @@
+"""
+Cold-start cost of the API, each run in a fresh process:
+
+    import      time to import app.main
+    first       uvicorn launch until the first GET /health answers
+    first_db    uvicorn launch until the first GET /api/v1/dogs?status=disponible
+                answers (opens a DB connection and loads the read model)
+
+Uses the environment's DATABASE_URL etc., like the server would.
+
+    python -m benchmarks.startup_benchmark --runs 5
+    python -m benchmarks.startup_benchmark --importtime   # slowest modules to import
+"""
+import argparse
+import json
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+
+
+def measure_import() -> float:
+    output = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET], check=True, capture_output=True, text=True)
+    return float(output.stdout.strip().splitlines()[-1]) * 1000
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for(url: str, started: float, timeout: float) -> float:
+    while time.perf_counter() - started < timeout:
+        try:
+            if httpx.get(url, timeout=timeout).status_code == 200:
+                return (time.perf_counter() - started) * 1000
+        except httpx.TransportError:
+            time.sleep(0.01)
+    raise TimeoutError(f"{url} did not answer within {timeout} s")
+
+
+def measure_first_responses(timeout: float):
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+    )
+    try:
+        first = wait_for(f"{base}/health", started, timeout)
+        first_db = wait_for(f"{base}/api/v1/dogs?status=disponible&view=summary", started, timeout)
+        return first, first_db
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def print_importtime(top: int):
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"], check=True, capture_output=True, text=True
+    )
+    rows = []
+    for line in output.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.strip()))
+    print(f"{'self ms':>8} {'cumul ms':>9}  module")
+    for self_us, cumulative_us, name in sorted(rows, reverse=True)[:top]:
+        print(f"{self_us / 1000:>8.1f} {cumulative_us / 1000:>9.1f}  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--importtime", action="store_true", help="List the slowest imports instead")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--output", help="Write results as JSON")
+    args = parser.parse_args()
+
+    if args.importtime:
+        print_importtime(args.top)
+        return
+
+    samples = {"import": [], "first": [], "first_db": []}
+    for _ in range(args.runs):
+        samples["import"].append(measure_import())
+        first, first_db = measure_first_responses(args.timeout)
+        samples["first"].append(first)
+        samples["first_db"].append(first_db)
+
+    results = {}
+    print(f"{'phase':>9} {'median ms':>10} {'min ms':>8} {'max ms':>8}")
+    for phase, values in samples.items():
+        results[phase] = {"median": statistics.median(values), "min": min(values), "max": max(values)}
+        print(f"{phase:>9} {results[phase]['median']:>10.0f} {results[phase]['min']:>8.0f} {results[phase]['max']:>8.0f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
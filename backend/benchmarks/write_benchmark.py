@@ -0,0 +1,177 @@
+"""
+Writes/sec for the dog write paths under concurrency: the previous
+SELECT / commit / refresh pattern vs the current single-transaction
+RETURNING routes.
+
+Creates a throwaway publisher in the database at DATABASE_URL, runs
+create -> update -> status -> delete for every dog, and removes the
+publisher and anything left over at the end.
+
+    python -m benchmarks.write_benchmark --dogs 500 --concurrency 1 8 32
+"""
+import argparse
+import asyncio
+import time
+
+from fastapi import HTTPException
+from sqlalchemy import delete, event, insert, select
+
+from app.api.v1.dogs import create_dog, delete_dog, update_dog, update_dog_status
+from app.core import database
+from app.core.database import open_session
+from app.models.dog import Dog
+from app.models.status_history import DogStatusHistory
+from app.models.user import User
+from app.schemas.dog import DogCreate, DogStatusUpdate, DogUpdate
+from benchmarks.common import make_dog_rows, make_user_row
+
+
+async def legacy_create(db, publisher_id, dog_data):
+    dog = Dog(**dog_data.model_dump(), publisher_id=publisher_id)
+    db.add(dog)
+    await db.commit()
+    await db.refresh(dog)
+    db.add(DogStatusHistory(dog_id=dog.id, old_status=None, new_status='disponible'))
+    await db.commit()
+    return dog
+
+
+async def legacy_owned_dog(db, dog_id, publisher_id):
+    dog = await db.get(Dog, dog_id)
+    if not dog or str(dog.publisher_id) != publisher_id:
+        raise HTTPException(status_code=404)
+    return dog
+
+
+async def legacy_update(db, dog_id, publisher_id, dog_data):
+    dog = await legacy_owned_dog(db, dog_id, publisher_id)
+    for key, value in dog_data.model_dump(exclude_unset=True).items():
+        setattr(dog, key, value)
+    await db.commit()
+    await db.refresh(dog)
+    return dog
+
+
+async def legacy_status(db, dog_id, publisher_id, status_data):
+    dog = await legacy_owned_dog(db, dog_id, publisher_id)
+    db.add(DogStatusHistory(dog_id=dog.id, old_status=dog.status, new_status=status_data.status))
+    dog.status = status_data.status
+    await db.commit()
+    await db.refresh(dog)
+    return dog
+
+
+async def legacy_delete(db, dog_id, publisher_id):
+    dog = await legacy_owned_dog(db, dog_id, publisher_id)
+    await db.delete(dog)
+    await db.commit()
+
+
+IMPLEMENTATIONS = {
+    "legacy": {
+        "create": lambda db, uid, payload: legacy_create(db, uid, payload),
+        "update": lambda db, uid, dog_id: legacy_update(db, dog_id, uid, DogUpdate(name="Actualizado")),
+        "status": lambda db, uid, dog_id: legacy_status(db, dog_id, uid, DogStatusUpdate(status="reservado")),
+        "delete": lambda db, uid, dog_id: legacy_delete(db, dog_id, uid),
+    },
+    "returning": {
+        "create": lambda db, uid, payload: create_dog(dog_data=payload, current_user_id=uid, db=db),
+        "update": lambda db, uid, dog_id: update_dog(
+            dog_id=dog_id, dog_data=DogUpdate(name="Actualizado"), current_user_id=uid, db=db
+        ),
+        "status": lambda db, uid, dog_id: update_dog_status(
+            dog_id=dog_id, status_data=DogStatusUpdate(status="reservado"), current_user_id=uid, db=db
+        ),
+        "delete": lambda db, uid, dog_id: delete_dog(dog_id=dog_id, current_user_id=uid, db=db),
+    },
+}
+
+
+class StatementCounter:
+    def __init__(self, engine):
+        self.statements = self.commits = 0
+        event.listen(engine, "before_cursor_execute", self._statement)
+        event.listen(engine, "commit", self._commit)
+
+    def _statement(self, *args):
+        self.statements += 1
+
+    def _commit(self, *args):
+        self.commits += 1
+
+    def reset(self):
+        self.statements = self.commits = 0
+
+
+async def run_op(op, items, concurrency):
+    """
+    Run op(db, item) for every item with `concurrency` workers, one session
+    per call (as a request would); returns (results, elapsed seconds)
+    """
+    queue = list(enumerate(items))
+    results = [None] * len(items)
+
+    async def worker():
+        while queue:
+            index, item = queue.pop()
+            async with open_session() as db:
+                results[index] = await op(db, item)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return results, time.perf_counter() - start
+
+
+async def cleanup(publisher_id):
+    async with open_session() as db:
+        dog_ids = select(Dog.id).where(Dog.publisher_id == publisher_id)
+        await db.execute(delete(DogStatusHistory).where(DogStatusHistory.dog_id.in_(dog_ids)))
+        await db.execute(delete(Dog).where(Dog.publisher_id == publisher_id))
+        await db.execute(delete(User).where(User.id == publisher_id))
+        await db.commit()
+
+
+async def main_async(args):
+    engine = database.async_engine.sync_engine if database.async_engine is not None else database.engine
+    counter = StatementCounter(engine)
+
+    user = make_user_row()
+    publisher_id = str(user["id"])
+    async with open_session() as db:
+        await db.execute(insert(User), [user])
+        await db.commit()
+
+    payloads = [DogCreate.model_validate(row) for row in make_dog_rows(args.dogs, user["id"])]
+    print(f"{'impl':>10} {'op':>7} {'workers':>8} {'writes/s':>10} {'stmts/op':>9} {'commits/op':>11}")
+    try:
+        for concurrency in args.concurrency:
+            for name, ops in IMPLEMENTATIONS.items():
+                ids = None
+                for op_name in ("create", "update", "status", "delete"):
+                    op = ops[op_name]
+                    items = payloads if op_name == "create" else ids
+                    counter.reset()
+                    results, elapsed = await run_op(
+                        lambda db, item: op(db, publisher_id, item), items, concurrency
+                    )
+                    if op_name == "create":
+                        ids = [dog.id for dog in results]
+                    n = len(items)
+                    print(
+                        f"{name:>10} {op_name:>7} {concurrency:>8} {n / elapsed:>10.0f} "
+                        f"{counter.statements / n:>9.2f} {counter.commits / n:>11.2f}"
+                    )
+    finally:
+        await cleanup(publisher_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dogs", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
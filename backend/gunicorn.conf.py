@@ -0,0 +1,28 @@
+# Production server settings (see start.sh)
+import os
+import shutil
+import tempfile
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+# Same variable as settings.WEB_CONCURRENCY, which sizes each worker's DB pool
+workers = int(os.environ.get("WEB_CONCURRENCY", "1"))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = 60
+graceful_timeout = 30
+keepalive = 5
+
+# Workers write their metrics here so GET /metrics on any of them covers the
+# whole server (app.core.metrics); set before the workers import the app
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "pura-pata-metrics"))
+
+
+def on_starting(server):
+    # Files left by a previous run would be added to this one's totals
+    metrics_dir = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
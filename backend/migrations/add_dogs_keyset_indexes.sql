@@ -0,0 +1,8 @@
+-- Migration: Add indexes for keyset (cursor) pagination
+-- Date: 2026-10-18
+
+-- GET /dogs pages newest-first on (created_at, id)
+CREATE INDEX IF NOT EXISTS idx_dogs_created_at_id ON dogs(created_at DESC, id DESC);
+
+-- GET /dogs/me pages a publisher's dogs the same way
+CREATE INDEX IF NOT EXISTS idx_dogs_publisher_created_at_id ON dogs(publisher_id, created_at DESC, id DESC);
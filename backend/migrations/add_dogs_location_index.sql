@@ -0,0 +1,5 @@
+-- Migration: Add composite index for nearby dog searches
+-- Date: 2026-10-18
+
+-- /dogs/nearby filters available dogs by a latitude/longitude bounding box
+CREATE INDEX IF NOT EXISTS idx_dogs_status_lat_lng ON dogs(status, latitude, longitude);
@@ -0,0 +1,23 @@
+-- Migration: Full-text and fuzzy search over dogs
+-- Date: 2026-10-18
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS unaccent;
+
+-- unaccent() is only STABLE; generated columns and indexes need an IMMUTABLE wrapper
+CREATE OR REPLACE FUNCTION immutable_unaccent(text) RETURNS text AS $$
+  SELECT public.unaccent('public.unaccent', $1)
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT;
+
+-- Maintained by Postgres on every insert/update
+ALTER TABLE dogs ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+  setweight(to_tsvector('spanish', immutable_unaccent(lower(coalesce(name, '')))), 'A') ||
+  setweight(to_tsvector('spanish', immutable_unaccent(lower(coalesce(breed, '')))), 'A') ||
+  setweight(to_tsvector('spanish', immutable_unaccent(lower(coalesce(description, '')))), 'B')
+) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_dogs_search_vector ON dogs USING GIN (search_vector);
+
+-- Trigram matching for misspelled / unaccented breeds and names ("pastor aleman")
+CREATE INDEX IF NOT EXISTS idx_dogs_breed_trgm ON dogs USING GIN (immutable_unaccent(lower(breed)) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_dogs_name_trgm ON dogs USING GIN (immutable_unaccent(lower(name)) gin_trgm_ops);
@@ -0,0 +1,6 @@
+-- Migration: Add photo_variants field to dogs table
+-- Date: 2026-10-18
+
+-- Resized JPEG/WebP renditions for photos uploaded through POST /dogs/{id}/photos
+ALTER TABLE dogs
+ADD COLUMN IF NOT EXISTS photo_variants JSONB;
@@ -3,8 +3,9 @@
 # Start script for Railway deployment
 echo "Starting Pura Pata Backend on port ${PORT:-8000}..."
 
-# Run database migrations (optional, if using alembic)
-# alembic upgrade head
+# Run database migrations
+alembic upgrade head || exit 1
 
-# Start uvicorn server with PORT env variable
-exec uvicorn app.main:app --host 0.0.0.0 --port "${PORT:-8000}"
+# Start WEB_CONCURRENCY uvicorn workers under gunicorn (binds to $PORT, see gunicorn.conf.py)
+echo "Workers: ${WEB_CONCURRENCY:-1}"
+exec gunicorn app.main:app -c gunicorn.conf.py
@@ -5,7 +5,7 @@ import { useRouter } from 'next/navigation';
 import Link from 'next/link';
 import Image from 'next/image';
 import { supabase } from '@/lib/supabase';
-import api from '@/lib/api';
+import api, { dogsApi } from '@/lib/api';
 import Navbar from '@/components/Navbar';
 import { Plus, Edit, Trash2, MapPin, Calendar } from 'lucide-react';
 
@@ -56,8 +56,7 @@ export default function MisPerrosPage() {
   const fetchMyDogs = async () => {
     try {
       setLoading(true);
-      const response = await api.get('/dogs/me');
-      setDogs(response.data);
+      setDogs(await dogsApi.getMyDogs());
     } catch (err: any) {
       console.error('Error fetching dogs:', err);
       setError('Error al cargar tus perros');
@@ -1,8 +1,8 @@
 'use client';
 
-import { useEffect, useState } from 'react';
+import { useEffect, useRef, useState } from 'react';
 import dynamic from 'next/dynamic';
-import { Dog, DogFilters } from '@/types';
+import { Dog, DogFacets, DogFilters } from '@/types';
 import { dogsApi } from '@/lib/api';
 import DogCard from '@/components/DogCard';
 import Navbar from '@/components/Navbar';
@@ -15,64 +15,78 @@ const MapView = dynamic(() => import('@/components/MapView'), {
   loading: () => <div className="h-[600px] bg-gray-200 rounded-lg flex items-center justify-center">Cargando mapa...</div>
 });
 
+// Query params for GET /dogs; the backend takes several sizes separated by commas
+const toQuery = (filters: DogFilters, query: string) => ({
+  status: 'disponible',
+  q: query.trim().length >= 2 ? query.trim() : undefined,
+  size: filters.size?.length ? filters.size.join(',') : undefined,
+  gender: filters.gender || undefined,
+  province: filters.province || undefined,
+  vaccinated: filters.vaccinated || undefined,
+  sterilized: filters.sterilized || undefined,
+  dewormed: filters.dewormed || undefined,
+});
+
 export default function Home() {
   const [dogs, setDogs] = useState<Dog[]>([]);
-  const [filteredDogs, setFilteredDogs] = useState<Dog[]>([]);
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [viewMode, setViewMode] = useState<'map' | 'list'>('list');
   const [showFilters, setShowFilters] = useState(false);
   const [filters, setFilters] = useState<DogFilters>({});
+  const [searchQuery, setSearchQuery] = useState('');
+  const [activeQuery, setActiveQuery] = useState('');
+  const [facets, setFacets] = useState<DogFacets | null>(null);
+  // Bumped on every new search so late responses for old filters are dropped
+  const requestId = useRef(0);
 
+  // Any filter or search change starts again from the first page
   useEffect(() => {
     loadDogs();
     // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, []);
-
-  useEffect(() => {
-    applyFilters();
-    // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, [dogs, filters]);
+  }, [filters, activeQuery]);
 
   const loadDogs = async () => {
+    const id = ++requestId.current;
+    const query = toQuery(filters, activeQuery);
+    // Counts for the same filters and search as the list
+    dogsApi.getFacets(query)
+      .then(result => { if (id === requestId.current) setFacets(result); })
+      .catch(error => console.error('Error loading facets:', error));
     try {
       setLoading(true);
-      const data = await dogsApi.getDogs({ status: 'disponible' } as any);
-      setDogs(data);
+      setNextCursor(null);
+      const page = await dogsApi.getDogs(query as any, null, 'summary');
+      if (id !== requestId.current) return;
+      setDogs(page.items);
+      setNextCursor(page.next_cursor);
     } catch (error) {
       console.error('Error loading dogs:', error);
     } finally {
-      setLoading(false);
+      if (id === requestId.current) setLoading(false);
     }
   };
 
-  const applyFilters = () => {
-    let result = dogs.filter(dog => dog.status === 'disponible');
-
-    if (filters.size && filters.size.length > 0) {
-      result = result.filter(dog => filters.size!.includes(dog.size));
-    }
-
-    if (filters.gender) {
-      result = result.filter(dog => dog.gender === filters.gender);
-    }
-
-    if (filters.province) {
-      result = result.filter(dog => dog.province === filters.province);
-    }
-
-    if (filters.vaccinated) {
-      result = result.filter(dog => dog.vaccinated);
-    }
-
-    if (filters.sterilized) {
-      result = result.filter(dog => dog.sterilized);
-    }
-
-    if (filters.dewormed) {
-      result = result.filter(dog => dog.dewormed);
+  const loadMoreDogs = async () => {
+    if (!nextCursor) return;
+    const id = requestId.current;
+    try {
+      setLoadingMore(true);
+      const page = await dogsApi.getDogs(toQuery(filters, activeQuery) as any, nextCursor, 'summary');
+      if (id !== requestId.current) return;
+      setDogs(prev => [...prev, ...page.items]);
+      setNextCursor(page.next_cursor);
+    } catch (error) {
+      console.error('Error loading more dogs:', error);
+    } finally {
+      setLoadingMore(false);
     }
+  };
 
-    setFilteredDogs(result);
+  const facetCount = (facet: keyof Omit<DogFacets, 'total'>, value: string | boolean) => {
+    const match = facets?.[facet].find(item => item.value === value);
+    return facets ? ` (${match?.count ?? 0})` : '';
   };
 
   return (
@@ -91,14 +105,23 @@ export default function Home() {
         {/* Search and Filter Bar */}
         <div className="bg-white rounded-lg shadow-md p-4 mb-6">
           <div className="flex flex-col md:flex-row gap-4 items-center">
-            <div className="flex-1 relative w-full">
+            <form
+              onSubmit={(e) => {
+                e.preventDefault();
+                if (searchQuery === activeQuery) loadDogs();
+                else setActiveQuery(searchQuery);
+              }}
+              className="flex-1 relative w-full"
+            >
               <Search className="absolute left-3 top-1/2 transform -translate-y-1/2 text-gray-400 h-5 w-5" />
               <input
-                type="text"
-                placeholder="Buscar por ubicación..."
+                type="search"
+                value={searchQuery}
+                onChange={(e) => setSearchQuery(e.target.value)}
+                placeholder="Buscar por nombre, raza o descripción..."
                 className="w-full pl-10 pr-4 py-2 border border-gray-300 rounded-md focus:ring-2 focus:ring-primary-500 focus:border-transparent text-gray-900"
               />
-            </div>
+            </form>
 
             <button
               onClick={() => setShowFilters(!showFilters)}
@@ -147,7 +170,7 @@ export default function Home() {
                         }}
                         className="mr-2"
                       />
-                      {size.label}
+                      {size.label}{facetCount('size', size.value)}
                     </label>
                   ))}
                 </div>
@@ -161,8 +184,8 @@ export default function Home() {
                   className="w-full px-3 py-2 border border-gray-300 rounded-md text-gray-900"
                 >
                   <option value="">Todos</option>
-                  <option value="macho">Macho</option>
-                  <option value="hembra">Hembra</option>
+                  <option value="macho">Macho{facetCount('gender', 'macho')}</option>
+                  <option value="hembra">Hembra{facetCount('gender', 'hembra')}</option>
                 </select>
               </div>
 
@@ -175,7 +198,7 @@ export default function Home() {
                 >
                   <option value="">Todas</option>
                   {costaRicaProvinces.map(province => (
-                    <option key={province} value={province}>{province}</option>
+                    <option key={province} value={province}>{province}{facetCount('province', province)}</option>
                   ))}
                 </select>
               </div>
@@ -189,7 +212,7 @@ export default function Home() {
                       onChange={(e) => setFilters({ ...filters, vaccinated: e.target.checked })}
                       className="mr-2"
                     />
-                    Vacunado
+                    Vacunado{facetCount('vaccinated', true)}
                   </label>
                   <label className="flex items-center text-gray-900">
                     <input
@@ -198,7 +221,7 @@ export default function Home() {
                       onChange={(e) => setFilters({ ...filters, sterilized: e.target.checked })}
                       className="mr-2"
                     />
-                    Castrado
+                    Castrado{facetCount('sterilized', true)}
                   </label>
                   <label className="flex items-center text-gray-900">
                     <input
@@ -207,7 +230,7 @@ export default function Home() {
                       onChange={(e) => setFilters({ ...filters, dewormed: e.target.checked })}
                       className="mr-2"
                     />
-                    Desparasitado
+                    Desparasitado{facetCount('dewormed', true)}
                   </label>
                 </div>
               </div>
@@ -224,24 +247,47 @@ export default function Home() {
         ) : (
           <>
             <div className="mb-4 text-gray-600">
-              {filteredDogs.length} {filteredDogs.length === 1 ? 'perro encontrado' : 'perros encontrados'}
+              {dogs.length} {dogs.length === 1 ? 'perro encontrado' : 'perros encontrados'}
             </div>
 
             {viewMode === 'map' ? (
-              <MapView dogs={filteredDogs} height="600px" />
+              <MapView
+                clustered
+                filters={{
+                  size: filters.size?.length ? filters.size.join(',') : undefined,
+                  gender: filters.gender || undefined,
+                  province: filters.province || undefined,
+                  vaccinated: filters.vaccinated || undefined,
+                  sterilized: filters.sterilized || undefined,
+                  dewormed: filters.dewormed || undefined,
+                }}
+                height="600px"
+              />
             ) : (
               <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
-                {filteredDogs.map(dog => (
+                {dogs.map(dog => (
                   <DogCard key={dog.id} dog={dog} />
                 ))}
               </div>
             )}
 
-            {filteredDogs.length === 0 && (
+            {dogs.length === 0 && (
               <div className="text-center py-12">
                 <p className="text-gray-600 text-lg">No se encontraron perros con los filtros seleccionados</p>
               </div>
             )}
+
+            {nextCursor && (
+              <div className="text-center mt-8">
+                <button
+                  onClick={loadMoreDogs}
+                  disabled={loadingMore}
+                  className="px-6 py-2 bg-primary-600 text-white rounded-md hover:bg-primary-700 disabled:opacity-50"
+                >
+                  {loadingMore ? 'Cargando...' : 'Cargar más perros'}
+                </button>
+              </div>
+            )}
           </>
         )}
       </div>
@@ -4,7 +4,7 @@ import { useEffect, useState } from 'react';
 import { useParams, useRouter } from 'next/navigation';
 import Image from 'next/image';
 import Link from 'next/link';
-import { Dog } from '@/types';
+import { Dog, DogLiveEvent } from '@/types';
 import { dogsApi } from '@/lib/api';
 import { supabase } from '@/lib/supabase';
 import { formatAge, formatDate, formatPhoneForWhatsApp, generateWhatsAppMessage } from '@/lib/utils';
@@ -29,6 +29,33 @@ export default function DogDetailPage() {
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [params.id]);
 
+  // Live status and listing changes while the page is open
+  useEffect(() => {
+    if (!params.id || typeof EventSource === 'undefined') return;
+
+    const source = new EventSource(dogsApi.liveUrl({ dog_id: [params.id as string] }));
+    const applyChange = (event: MessageEvent) => {
+      const change: DogLiveEvent = JSON.parse(event.data);
+      if (change.dog_id !== params.id) return;
+      if (change.kind === 'deleted') {
+        router.push('/perros');
+      } else if (change.dog) {
+        setDog(change.dog);
+      }
+    };
+    ['updated', 'status_changed', 'deleted'].forEach((kind) => source.addEventListener(kind, applyChange));
+    // EventSource reconnects by itself (including after an overflow event, when the
+    // server drops a client that fell behind); reload whatever was missed meanwhile
+    let connected = false;
+    source.onopen = () => {
+      if (connected) checkUserAndLoadDog();
+      connected = true;
+    };
+
+    return () => source.close();
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [params.id]);
+
   const checkUserAndLoadDog = async () => {
     try {
       setLoading(true);
@@ -5,8 +5,7 @@ import { useRouter } from 'next/navigation';
 import Image from 'next/image';
 import dynamic from 'next/dynamic';
 import { supabase } from '@/lib/supabase';
-import api, { usersApi } from '@/lib/api';
-import { uploadDogPhoto, deletePhotos } from '@/lib/supabase';
+import api, { dogsApi, usersApi } from '@/lib/api';
 import { Camera, MapPin, Save, X } from 'lucide-react';
 
 const LocationPicker = dynamic(() => import('@/components/LocationPicker'), {
@@ -134,21 +133,13 @@ export default function PublicarPage() {
     setSubmitting(true);
 
     let dogData = null;
+    let newDog = null;
 
     try {
-      // Upload photos first
-      let uploadedPhotoUrls: string[] = [];
-      if (photoFiles.length > 0) {
-        setUploadingPhotos(true);
-        const uploadPromises = photoFiles.map(file => uploadDogPhoto(file));
-        uploadedPhotoUrls = await Promise.all(uploadPromises);
-        setUploadingPhotos(false);
-      }
-
-      // Create dog with photo URLs and apply contact preferences
+      // Create the dog first and apply contact preferences
       dogData = {
         ...formData,
-        photos: uploadedPhotoUrls,
+        photos: [],
         status: 'disponible',
         contact_phone: contactPreferences.showPhone ? formData.contact_phone : null,
         contact_email: contactPreferences.showEmail ? formData.contact_email : null,
@@ -156,7 +147,16 @@ export default function PublicarPage() {
       };
 
       const response = await api.post('/dogs', dogData);
-      const newDog = response.data;
+      newDog = response.data;
+
+      // Upload photos through the API, which resizes them and strips metadata
+      if (photoFiles.length > 0) {
+        setUploadingPhotos(true);
+        for (const file of photoFiles) {
+          await dogsApi.uploadPhoto(newDog.id, file);
+        }
+        setUploadingPhotos(false);
+      }
 
       // Redirect to the new dog's page
       router.push(`/perros/${newDog.id}`);
@@ -169,14 +169,13 @@ export default function PublicarPage() {
         dogData: dogData
       });
 
-      // Clean up uploaded photos if dog creation failed
-      if (dogData?.photos && dogData.photos.length > 0) {
-        console.log('Cleaning up uploaded photos...');
+      // Remove the half-published dog if a photo upload failed
+      if (newDog?.id) {
+        console.log('Cleaning up dog without photos...');
         try {
-          await deletePhotos(dogData.photos);
-          console.log('Successfully deleted orphaned photos');
+          await dogsApi.deleteDog(newDog.id);
         } catch (deleteError) {
-          console.error('Error deleting photos:', deleteError);
+          console.error('Error deleting dog:', deleteError);
           // Continue with error handling even if cleanup fails
         }
       }
@@ -1,7 +1,15 @@
 import { MetadataRoute } from 'next';
+import { DogChangeFeed } from '@/types';
 
 const API_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000/api';
 
+// Regenerate hourly; each run only fetches what changed since the previous one
+export const revalidate = 3600;
+
+// Available dog id -> last change, and the change feed token it is current to
+const sitemapDogs = new Map<string, string>();
+let sitemapSince: string | null = null;
+
 export default async function sitemap(): Promise<MetadataRoute.Sitemap> {
   const baseUrl = 'https://pura-pata.com';
 
@@ -39,25 +47,42 @@ export default async function sitemap(): Promise<MetadataRoute.Sitemap> {
     },
   ];
 
-  // Fetch all available dogs for dynamic pages
-  let dogPages: MetadataRoute.Sitemap = [];
+  // Available dogs, kept in sync between regenerations with the change feed
   try {
-    const response = await fetch(`${API_URL}/dogs?status=disponible`, {
-      next: { revalidate: 3600 }, // Revalidate every hour
-    });
-
-    if (response.ok) {
-      const dogs = await response.json();
-      dogPages = dogs.map((dog: any) => ({
-        url: `${baseUrl}/perros/${dog.id}`,
-        lastModified: new Date(dog.updated_at || dog.created_at),
-        changeFrequency: 'weekly' as const,
-        priority: 0.8,
-      }));
+    let hasMore = true;
+    while (hasMore) {
+      const params = new URLSearchParams({ view: 'ids', limit: '1000' });
+      if (sitemapSince) params.set('since', sitemapSince);
+      const response = await fetch(`${API_URL}/dogs/changes?${params}`, { cache: 'no-store' });
+      if (response.status === 410) {
+        // Token older than the server keeps deletes: start over
+        sitemapDogs.clear();
+        sitemapSince = null;
+        continue;
+      }
+      if (!response.ok) break;
+
+      const feed: DogChangeFeed = await response.json();
+      for (const change of feed.changes) {
+        if (change.status === 'disponible') {
+          sitemapDogs.set(change.id, change.changed_at);
+        } else {
+          sitemapDogs.delete(change.id);
+        }
+      }
+      sitemapSince = feed.next_since;
+      hasMore = feed.has_more;
     }
   } catch (error) {
     console.error('Error fetching dogs for sitemap:', error);
   }
 
+  const dogPages: MetadataRoute.Sitemap = Array.from(sitemapDogs, ([id, changedAt]) => ({
+    url: `${baseUrl}/perros/${id}`,
+    lastModified: new Date(changedAt),
+    changeFrequency: 'weekly' as const,
+    priority: 0.8,
+  }));
+
   return [...staticPages, ...dogPages];
 }
@@ -3,7 +3,7 @@
 import Image from 'next/image';
 import Link from 'next/link';
 import { Dog } from '@/types';
-import { formatAge } from '@/lib/utils';
+import { formatAge, getPhotoUrl } from '@/lib/utils';
 import { MapPin } from 'lucide-react';
 
 interface DogCardProps {
@@ -28,7 +28,7 @@ export default function DogCard({ dog }: DogCardProps) {
       <div className="bg-white rounded-lg shadow-md overflow-hidden hover:shadow-xl transition-shadow duration-300 cursor-pointer">
         <div className="relative h-48 w-full">
           <Image
-            src={dog.photos[0] || '/placeholder-dog.jpg'}
+            src={getPhotoUrl(dog, 640) || '/placeholder-dog.jpg'}
             alt={dog.name}
             fill
             className="object-cover object-center"
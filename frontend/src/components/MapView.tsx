@@ -3,22 +3,28 @@
 import { useEffect, useRef } from 'react';
 import L from 'leaflet';
 import 'leaflet/dist/leaflet.css';
-import { Dog } from '@/types';
+import { Dog, DogMapTile } from '@/types';
+import { dogsApi } from '@/lib/api';
 
 interface MapViewProps {
-  dogs: Dog[];
+  dogs?: Dog[];
   center?: [number, number];
   zoom?: number;
   height?: string;
   onDogClick?: (dog: Dog) => void;
+  // Fetch server-side clusters for the visible area instead of plotting `dogs`
+  clustered?: boolean;
+  filters?: Record<string, string | boolean | undefined>;
 }
 
 export default function MapView({
-  dogs,
+  dogs = [],
   center = [9.7489, -83.7534], // Costa Rica center
   zoom = 8,
   height = '500px',
-  onDogClick
+  onDogClick,
+  clustered = false,
+  filters,
 }: MapViewProps) {
   const mapRef = useRef<L.Map | null>(null);
   const mapContainerRef = useRef<HTMLDivElement>(null);
@@ -44,50 +50,104 @@ export default function MapView({
     };
   }, [center, zoom]);
 
-  useEffect(() => {
-    if (!mapRef.current) return;
-
-    // Clear existing markers
-    mapRef.current.eachLayer((layer) => {
+  const clearMarkers = () => {
+    mapRef.current?.eachLayer((layer) => {
       if (layer instanceof L.Marker) {
         mapRef.current?.removeLayer(layer);
       }
     });
+  };
+
+  const addDogMarker = (dog: Dog) => {
+    if (!mapRef.current) return;
+
+    const icon = L.divIcon({
+      className: 'dog-marker',
+      html: '🐕',
+      iconSize: [30, 30],
+      iconAnchor: [15, 15],
+    });
+
+    const marker = L.marker([dog.latitude, dog.longitude], { icon })
+      .addTo(mapRef.current);
+
+    marker.bindPopup(`
+      <div class="p-2">
+        <h3 class="font-bold text-lg">${dog.name}</h3>
+        <p class="text-sm">${dog.breed}</p>
+        <p class="text-sm">${dog.size} • ${dog.gender}</p>
+        <a href="/perros/${dog.id}" class="text-primary-600 hover:underline text-sm">Ver detalles</a>
+      </div>
+    `);
+
+    if (onDogClick) {
+      marker.on('click', () => onDogClick(dog));
+    }
+  };
 
-    // Add markers for each dog
-    dogs.forEach((dog) => {
-      if (!mapRef.current) return;
+  const renderTile = (tile: DogMapTile) => {
+    const map = mapRef.current;
+    if (!map) return;
 
+    clearMarkers();
+    tile.points.forEach(addDogMarker);
+    tile.clusters.forEach((cluster) => {
       const icon = L.divIcon({
-        className: 'dog-marker',
-        html: '🐕',
-        iconSize: [30, 30],
-        iconAnchor: [15, 15],
+        className: 'dog-cluster',
+        html: `<div class="flex items-center justify-center rounded-full bg-primary-600 text-white font-bold shadow-md" style="width:40px;height:40px">${cluster.count}</div>`,
+        iconSize: [40, 40],
+        iconAnchor: [20, 20],
       });
+      L.marker([cluster.latitude, cluster.longitude], { icon })
+        .addTo(map)
+        .on('click', () => map.setView([cluster.latitude, cluster.longitude], map.getZoom() + 2));
+    });
+  };
+
+  // Clustered mode: ask the API for the current viewport whenever it changes
+  useEffect(() => {
+    const map = mapRef.current;
+    if (!clustered || !map) return;
+
+    let latest = 0;
+    const loadTile = async () => {
+      const request = ++latest;
+      const bounds = map.getBounds();
+      try {
+        const tile = await dogsApi.getMapTile({
+          min_lat: Math.max(bounds.getSouth(), -90),
+          max_lat: Math.min(bounds.getNorth(), 90),
+          min_lon: Math.max(bounds.getWest(), -180),
+          max_lon: Math.min(bounds.getEast(), 180),
+        }, map.getZoom(), filters);
+        // Ignore responses for viewports the user already moved away from
+        if (request === latest) renderTile(tile);
+      } catch (error) {
+        console.error('Error loading map tile:', error);
+      }
+    };
 
-      const marker = L.marker([dog.latitude, dog.longitude], { icon })
-        .addTo(mapRef.current);
+    loadTile();
+    map.on('moveend', loadTile);
+    return () => {
+      map.off('moveend', loadTile);
+    };
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [clustered, JSON.stringify(filters)]);
 
-      marker.bindPopup(`
-        <div class="p-2">
-          <h3 class="font-bold text-lg">${dog.name}</h3>
-          <p class="text-sm">${dog.breed}</p>
-          <p class="text-sm">${dog.size} • ${dog.gender}</p>
-          <a href="/perros/${dog.id}" class="text-primary-600 hover:underline text-sm">Ver detalles</a>
-        </div>
-      `);
+  useEffect(() => {
+    if (!mapRef.current || clustered) return;
 
-      if (onDogClick) {
-        marker.on('click', () => onDogClick(dog));
-      }
-    });
+    clearMarkers();
+    dogs.forEach(addDogMarker);
 
     // Fit bounds if there are dogs
     if (dogs.length > 0) {
       const bounds = L.latLngBounds(dogs.map(dog => [dog.latitude, dog.longitude]));
       mapRef.current.fitBounds(bounds, { padding: [50, 50] });
     }
-  }, [dogs, onDogClick]);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [dogs, onDogClick, clustered]);
 
   return (
     <div
@@ -1,5 +1,5 @@
 import axios from 'axios';
-import { Dog, DogFormData, DogFilters, User } from '@/types';
+import { Dog, DogChangeFeed, DogFormData, DogFacets, DogFilters, DogMapTile, DogPage, DogView, MapBounds, User } from '@/types';
 import { supabase } from './supabase';
 
 const API_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
@@ -22,9 +22,10 @@ api.interceptors.request.use(async (config) => {
 
 // Dogs API
 export const dogsApi = {
-  // Get all dogs with filters
-  getDogs: async (filters?: DogFilters): Promise<Dog[]> => {
-    const { data } = await api.get('/dogs', { params: filters });
+  // Get a page of dogs with filters; pass next_cursor to fetch the following page
+  // view=summary/map return only the fields cards/markers need
+  getDogs: async (filters?: DogFilters, cursor?: string | null, view: DogView = 'full'): Promise<DogPage> => {
+    const { data } = await api.get('/dogs', { params: { ...filters, cursor: cursor || undefined, view } });
     return data;
   },
 
@@ -46,6 +47,16 @@ export const dogsApi = {
     return data;
   },
 
+  // Upload a photo; the backend stores resized variants and appends it to photos
+  uploadPhoto: async (id: string, file: File): Promise<Dog> => {
+    const form = new FormData();
+    form.append('file', file);
+    const { data } = await api.post(`/dogs/${id}/photos`, form, {
+      headers: { 'Content-Type': 'multipart/form-data' },
+    });
+    return data;
+  },
+
   // Delete dog
   deleteDog: async (id: string): Promise<void> => {
     await api.delete(`/dogs/${id}`);
@@ -57,19 +68,64 @@ export const dogsApi = {
     return data;
   },
 
-  // Get my dogs
+  // Get all my dogs, following next_cursor until the last page
   getMyDogs: async (): Promise<Dog[]> => {
-    const { data } = await api.get('/dogs/me');
-    return data;
+    const dogs: Dog[] = [];
+    let cursor: string | null = null;
+    do {
+      const { data }: { data: DogPage } = await api.get('/dogs/me', {
+        params: { cursor: cursor || undefined },
+      });
+      dogs.push(...data.items);
+      cursor = data.next_cursor;
+    } while (cursor);
+    return dogs;
   },
 
   // Get dogs nearby
-  getNearbyDogs: async (latitude: number, longitude: number, radius: number): Promise<Dog[]> => {
+  getNearbyDogs: async (latitude: number, longitude: number, radius: number, view: DogView = 'full'): Promise<Dog[]> => {
     const { data } = await api.get('/dogs/nearby', {
-      params: { latitude, longitude, radius },
+      params: { latitude, longitude, radius, view },
     });
     return data;
   },
+
+  // Available dogs ranked for the signed-in user (profile location, province/canton, recency)
+  getRecommendedDogs: async (limit = 20, view: DogView = 'full'): Promise<Dog[]> => {
+    const { data } = await api.get('/dogs/recommended', { params: { limit, view } });
+    return data;
+  },
+
+  // Server-side marker clusters (or individual dogs at high zoom) for a map viewport
+  getMapTile: async (
+    bounds: MapBounds,
+    zoom: number,
+    filters?: Record<string, string | boolean | undefined>,
+  ): Promise<DogMapTile> => {
+    const { data } = await api.get('/dogs/map', { params: { ...bounds, zoom, ...filters } });
+    return data;
+  },
+
+  // Dogs changed since a previous call's next_since (everything when omitted); repeat while has_more
+  getChanges: async (since?: string | null, view: DogView | 'ids' = 'full'): Promise<DogChangeFeed> => {
+    const { data } = await api.get('/dogs/changes', { params: { since: since || undefined, view } });
+    return data;
+  },
+
+  // Server-sent events for dog writes; pass the result to new EventSource()
+  liveUrl: (filters: { dog_id?: string[]; province?: string; publisher_id?: string }): string => {
+    const params = new URLSearchParams();
+    filters.dog_id?.forEach((id) => params.append('dog_id', id));
+    if (filters.province) params.set('province', filters.province);
+    if (filters.publisher_id) params.set('publisher_id', filters.publisher_id);
+    return `${API_URL}/api/v1/dogs/live?${params}`;
+  },
+
+  // Counts per filter value (size, gender, province, health flags)
+  getFacets: async (filters?: Record<string, string | boolean | undefined>): Promise<DogFacets> => {
+    const { data } = await api.get('/dogs/facets', { params: filters });
+    return data;
+  },
 };
 
 // Users API
@@ -1,5 +1,6 @@
 import { type ClassValue, clsx } from "clsx";
 import { twMerge } from "tailwind-merge";
+import type { Dog } from "@/types";
 
 export function cn(...inputs: ClassValue[]) {
   return twMerge(clsx(inputs));
@@ -85,3 +86,14 @@ export function validateFileType(file: File): boolean {
   const validTypes = ['image/jpeg', 'image/jpg', 'image/png'];
   return validTypes.includes(file.type);
 }
+
+// Smallest WebP variant of the dog's first photo that is at least minWidth wide
+// (summary lists only carry the server-picked thumbnail_url)
+export function getPhotoUrl(dog: Dog, minWidth: number): string | undefined {
+  const firstPhoto = dog.photos?.[0];
+  const variants = dog.photo_variants?.find(set => set.source === firstPhoto)?.variants;
+  if (!variants || variants.length === 0) return firstPhoto || dog.thumbnail_url || undefined;
+
+  const webp = variants.filter(v => v.format === 'webp').sort((a, b) => a.width - b.width);
+  return (webp.find(v => v.width >= minWidth) || webp[webp.length - 1])?.url || firstPhoto;
+}
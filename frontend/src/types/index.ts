@@ -10,6 +10,18 @@ export interface User {
   created_at: string;
 }
 
+export interface PhotoVariant {
+  url: string;
+  width: number;
+  height: number;
+  format: 'jpg' | 'webp';
+}
+
+export interface PhotoVariantSet {
+  source: string;
+  variants: PhotoVariant[];
+}
+
 export interface Dog {
   id: string;
   name: string;
@@ -31,12 +43,80 @@ export interface Dog {
   contact_email?: string;
   has_whatsapp: boolean;
   photos: string[];
+  photo_variants?: PhotoVariantSet[] | null;
+  thumbnail_url?: string | null; // present in view=summary lists
   status: 'disponible' | 'reservado' | 'adoptado';
   publisher_id: string;
   publisher?: User;
   created_at: string;
   updated_at: string;
   adopted_at?: string;
+  distance_km?: number;
+}
+
+export type DogView = 'summary' | 'map' | 'full';
+
+export interface DogPage {
+  items: Dog[];
+  next_cursor: string | null;
+}
+
+export interface MapCluster {
+  geohash: string;
+  count: number;
+  latitude: number;
+  longitude: number;
+}
+
+export interface DogMapTile {
+  zoom: number;
+  precision: number | null;
+  clusters: MapCluster[];
+  points: Dog[];
+}
+
+export interface MapBounds {
+  min_lat: number;
+  max_lat: number;
+  min_lon: number;
+  max_lon: number;
+}
+
+export interface FacetCount {
+  value: string | boolean | null;
+  count: number;
+}
+
+export interface DogChange {
+  id: string;
+  change: 'created' | 'updated' | 'status_changed' | 'deleted';
+  changed_at: string;
+  status: Dog['status'] | null;
+  dog: Dog | null;
+}
+
+// Message of a GET /dogs/live server-sent event
+export interface DogLiveEvent {
+  kind: DogChange['change'];
+  dog_id: string;
+  status: Dog['status'] | null;
+  dog: Dog | null;
+}
+
+export interface DogChangeFeed {
+  changes: DogChange[];
+  next_since: string;
+  has_more: boolean;
+}
+
+export interface DogFacets {
+  total: number;
+  size: FacetCount[];
+  gender: FacetCount[];
+  province: FacetCount[];
+  vaccinated: FacetCount[];
+  sterilized: FacetCount[];
+  dewormed: FacetCount[];
 }
 
 export interface DogFormData {
@@ -60,6 +140,7 @@ export interface DogFormData {
 }
 
 export interface DogFilters {
+  q?: string;
   size?: string[];
   gender?: string;
   age_min?: number;